@@ -0,0 +1,50 @@
+"""Measure build_classes on chains of allOf inheritance of growing depth.
+
+Each level adds the same number of properties, so the work that has to be
+done grows linearly with the depth; the time per level should stay flat.
+
+    python benchmarks/bench_allof_chain.py --depths 5 10 20 40
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import python_jsonschema_objects as pjo  # noqa: E402
+from schemas import allof_chain  # noqa: E402
+
+
+def measure(schema, repeat):
+    """Return the best build time over `repeat` runs."""
+    best = None
+    for _ in range(repeat):
+        builder = pjo.ObjectBuilder(schema, validate_schema=False)
+        gc.collect()
+        start = time.perf_counter()
+        builder.build_classes()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depths", type=int, nargs="+", default=[5, 10, 20, 40])
+    parser.add_argument("--properties", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print("%6s %10s %14s" % ("depth", "build (s)", "per level (ms)"))
+    for depth in args.depths:
+        elapsed = measure(allof_chain(depth, args.properties), args.repeat)
+        print("%6d %10.4f %14.3f" % (depth, elapsed, elapsed / depth * 1000))
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")
+    main()
@@ -0,0 +1,53 @@
+"""Measure build_classes on inline objects nested far past the recursion limit.
+
+Construction runs from an explicit stack, so the depth is bounded by memory
+rather than by sys.getrecursionlimit(); the time per level should stay
+roughly flat.
+
+    python benchmarks/bench_deep_nesting.py --depths 500 1000 2000 5000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import python_jsonschema_objects as pjo  # noqa: E402
+from schemas import nested_schema  # noqa: E402
+
+
+def measure(schema, repeat):
+    """Return the best build time over `repeat` runs."""
+    best = None
+    for _ in range(repeat):
+        builder = pjo.ObjectBuilder(schema, validate_schema=False)
+        gc.collect()
+        start = time.perf_counter()
+        builder.build_classes()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--depths", type=int, nargs="+", default=[500, 1000, 2000, 5000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print("recursion limit: %d" % sys.getrecursionlimit())
+    print("%6s %10s %14s" % ("depth", "build (s)", "per level (ms)"))
+    for depth in args.depths:
+        elapsed = measure(nested_schema(depth), args.repeat)
+        print("%6d %10.4f %14.3f" % (depth, elapsed, elapsed / depth * 1000))
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")
+    main()
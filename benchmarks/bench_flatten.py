@@ -0,0 +1,61 @@
+"""Compare attribute access on allOf chains built with and without flatten.
+
+For every depth, the last definition of an allOf chain is built both as a
+deep hierarchy (the default) and flattened, and the time to get and set a
+property inherited from the first level, and to check an instance against
+the first level's class, is measured.
+
+    python benchmarks/bench_flatten.py --depths 2 10 40
+"""
+
+import argparse
+import os
+import sys
+import timeit
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import python_jsonschema_objects as pjo  # noqa: E402
+from schemas import allof_chain  # noqa: E402
+
+
+def measure(depth, flatten, number):
+    """Return the best time per get, set and isinstance check, in microseconds."""
+    builder = pjo.ObjectBuilder(allof_chain(depth, properties=5), validate_schema=False)
+    builder.build_classes(flatten=flatten)
+    base = builder.resolver._base_uri + "#/definitions/"
+    first = builder.get_class(base + "level0")
+    last = builder.get_class(base + "level%d" % (depth - 1))
+
+    obj = last(p0_0="value")
+    timings = [
+        timeit.repeat(stmt, number=number, repeat=5)
+        for stmt in (
+            lambda: obj.p0_0,
+            lambda: setattr(obj, "p0_0", "other"),
+            lambda: isinstance(obj, first),
+        )
+    ]
+    return [min(t) / number * 1e6 for t in timings]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depths", type=int, nargs="+", default=[2, 10, 40])
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    print(
+        "%6s %8s %10s %10s %14s"
+        % ("depth", "flatten", "get (us)", "set (us)", "isinstance")
+    )
+    for depth in args.depths:
+        for flatten in (False, True):
+            get, set_, check = measure(depth, flatten, args.number)
+            print("%6d %8s %10.3f %10.3f %14.3f" % (depth, flatten, get, set_, check))
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")
+    main()
@@ -0,0 +1,112 @@
+"""Measure the memory forked workers stop sharing with the parent.
+
+The parent builds the classes for a wide schema, optionally freezes them
+with ObjectBuilder.freeze, and forks workers. Each worker instantiates
+every class and runs a few garbage collections, as a worker would while
+serving requests, and then reports its unique set size: the memory no
+other process shares, read from /proc/self/smaps_rollup (Linux only).
+
+    python benchmarks/bench_fork_memory.py --definitions 1000 --workers 4
+"""
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import python_jsonschema_objects as pjo  # noqa: E402
+from schemas import wide_schema  # noqa: E402
+
+
+def unique_set_size():
+    """Return the private memory of this process, in bytes."""
+    private = 0
+    with open("/proc/self/smaps_rollup") as fin:
+        for line in fin:
+            if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                private += int(line.split()[1]) * 1024
+    return private
+
+
+def work(classes):
+    for cls in classes:
+        cls()
+    for _ in range(3):
+        gc.collect()
+
+
+def measure(definitions, workers, freeze):
+    """Build, fork `workers` workers and return their unique set sizes."""
+    builder = pjo.ObjectBuilder(wide_schema(definitions), validate_schema=False)
+    ns = builder.build_classes()
+    classes = [
+        ns[name] for name in ns if issubclass(ns[name], pjo.classbuilder.ProtocolBase)
+    ]
+    if freeze:
+        builder.freeze()
+    else:
+        builder.release()
+        gc.collect()
+
+    sizes = []
+    for _ in range(workers):
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read)
+            try:
+                work(classes)
+                os.write(write, str(unique_set_size()).encode())
+            finally:
+                os._exit(0)
+        os.close(write)
+        with os.fdopen(read) as fin:
+            sizes.append(int(fin.read()))
+        os.waitpid(pid, 0)
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--definitions", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--mode", choices=["plain", "freeze"], help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.mode is not None:
+        sizes = measure(args.definitions, args.workers, args.mode == "freeze")
+        print(json.dumps(sizes))
+        return 0
+
+    # Each mode runs in a fresh interpreter, so that they don't share a heap.
+    print("{0:>8} {1:>16} {2:>16}".format("mode", "mean USS (MiB)", "max USS (MiB)"))
+    for mode in ("plain", "freeze"):
+        output = subprocess.check_output(
+            [
+                sys.executable,
+                __file__,
+                "--definitions",
+                str(args.definitions),
+                "--workers",
+                str(args.workers),
+                "--mode",
+                mode,
+            ]
+        )
+        sizes = json.loads(output.decode().splitlines()[-1])
+        print(
+            "{0:>8} {1:16.1f} {2:16.1f}".format(
+                mode, sum(sizes) / len(sizes) / 2.0**20, max(sizes) / 2.0**20
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")
+    sys.exit(main())
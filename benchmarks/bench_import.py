@@ -0,0 +1,88 @@
+"""Measure how long `import python_jsonschema_objects` takes.
+
+The package is imported in a fresh interpreter under ``-X importtime`` and
+the cumulative time of the package and of its slowest imports is reported.
+The check fails (with exit status 1) if the import takes longer than
+``--max-ms`` or pulls in one of the modules that should only be imported
+once they are used:
+
+    python benchmarks/bench_import.py --repeat 10 --max-ms 150
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+PACKAGE = "python_jsonschema_objects"
+
+# Needed to build classes or validate schemas, but not to use classes that
+# were already built (from the build cache or generated code, say).
+DEFERRED = (
+    "jsonschema",
+    "referencing",
+    "markdown",
+    "inflection",
+    PACKAGE + "._version",
+)
+
+
+def import_times():
+    """Import the package in a new interpreter; return {module: cumulative us}."""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + PACKAGE],
+        env=env,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        try:
+            times[name.strip()] = int(cumulative)
+        except ValueError:
+            # The header line
+            continue
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument(
+        "--max-ms", type=float, help="fail if the import takes longer than this"
+    )
+    args = parser.parse_args(argv)
+
+    runs = [import_times() for _ in range(args.repeat)]
+    best = min(runs, key=lambda times: times[PACKAGE])
+    total = best[PACKAGE] / 1000.0
+
+    print("{0:>48} {1:>10}".format("module", "cumul (ms)"))
+    slowest = sorted(best.items(), key=lambda item: -item[1])
+    for name, cumulative in slowest[: args.top]:
+        print("{0:>48} {1:10.1f}".format(name, cumulative / 1000.0))
+
+    failed = False
+    loaded = sorted(
+        name
+        for name in best
+        if any(name == m or name.startswith(m + ".") for m in DEFERRED)
+    )
+    if loaded:
+        print("imported eagerly: " + ", ".join(loaded))
+        failed = True
+    if args.max_ms is not None and total > args.max_ms:
+        print("import took {0:.1f} ms, over {1:.1f} ms".format(total, args.max_ms))
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
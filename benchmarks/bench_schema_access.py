@@ -0,0 +1,71 @@
+"""Measure ObjectBuilder construction and build_classes on a large schema.
+
+Reports wall time and peak traced memory for building an ObjectBuilder and
+then its classes, which is dominated by how often the schema is copied and
+how often a resolver is created.
+
+    python benchmarks/bench_schema_access.py --definitions 1000
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import python_jsonschema_objects as pjo  # noqa: E402
+from schemas import wide_schema  # noqa: E402
+
+
+def measure(schema):
+    """Time, then separately trace, building a builder and its classes.
+
+    Tracing slows allocation down considerably, so times and peak memory
+    come from separate runs.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    builder = pjo.ObjectBuilder(schema)
+    init_time = time.perf_counter() - start
+    builder.build_classes()
+    build_time = time.perf_counter() - start - init_time
+
+    del builder
+    gc.collect()
+    tracemalloc.start()
+    builder = pjo.ObjectBuilder(schema)
+    _, init_peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    builder.build_classes()
+    _, build_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return init_time, init_peak, build_time, build_peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--definitions", type=int, default=500)
+    parser.add_argument("--properties", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    schema = wide_schema(args.definitions, args.properties)
+    size = len(json.dumps(schema))
+    print("schema: %d definitions, %.1f MB" % (args.definitions, size / 1e6))
+
+    warnings.simplefilter("ignore")
+    for _ in range(args.repeat):
+        init_time, init_peak, build_time, build_peak = measure(schema)
+        print(
+            "init %.3fs (peak %.1f MB)  build %.3fs (peak %.1f MB)"
+            % (init_time, init_peak / 1e6, build_time, build_peak / 1e6)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""Measure how build_classes scales along several axes of schema size.
+
+For every axis, schemas of growing size are generated (see schemas.py) and
+each is built from scratch, recording the build time, the peak traced
+memory and the number of classes. The results are written as JSON and
+can be compared with a stored baseline:
+
+    python benchmarks/harness.py --output results.json
+    python benchmarks/harness.py --baseline benchmarks/baseline.json
+    python benchmarks/harness.py --full --axes definitions --write-baseline
+
+A comparison fails (with exit status 1) when an axis scales worse than in
+the baseline, i.e. when the exponent of a power law fitted to its build
+times has grown, or when a point got slower or bigger than the rest of the
+run by more than the tolerance. Times are compared relative to the run as
+a whole, so that a uniformly slower machine doesn't count as a regression.
+"""
+
+import argparse
+import collections
+import gc
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import python_jsonschema_objects as pjo  # noqa: E402
+import python_jsonschema_objects.cache  # noqa: E402
+import schemas  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# An axis is a schema factory taking the size of the point to generate.
+# `scaling` axes are expected to grow as a power of their size; the others
+# (cycle density) are only compared point by point.
+Axis = collections.namedtuple("Axis", "sizes full_sizes make scaling description")
+
+AXES = collections.OrderedDict(
+    [
+        (
+            "definitions",
+            Axis(
+                [10, 100, 1000],
+                [10, 100, 1000, 10000],
+                lambda n, tmp: schemas.wide_schema(n, properties=5),
+                True,
+                "number of definitions",
+            ),
+        ),
+        (
+            "properties",
+            Axis(
+                [5, 20, 80],
+                [5, 20, 80, 320],
+                lambda n, tmp: schemas.wide_schema(20, properties=n),
+                True,
+                "properties per object",
+            ),
+        ),
+        (
+            "fanout",
+            Axis(
+                [1, 4, 16],
+                [1, 4, 16, 64],
+                lambda n, tmp: schemas.fanout_schema(200, fanout=n),
+                True,
+                "$ref fan-out of each definition",
+            ),
+        ),
+        (
+            "cycles",
+            Axis(
+                [0, 10, 50, 100],
+                [0, 10, 50, 100],
+                lambda n, tmp: schemas.cyclic_schema(200, density=n / 100.0),
+                False,
+                "percentage of definitions closing a cycle",
+            ),
+        ),
+        (
+            "oneof",
+            Axis(
+                [4, 16, 64],
+                [4, 16, 64, 256],
+                lambda n, tmp: schemas.oneof_schema(n),
+                True,
+                "oneOf width",
+            ),
+        ),
+        (
+            "allof",
+            Axis(
+                [5, 10, 20, 40],
+                [5, 10, 20, 40, 80],
+                lambda n, tmp: schemas.allof_chain(n, properties=10),
+                True,
+                "allOf depth",
+            ),
+        ),
+        (
+            "files",
+            Axis(
+                [1, 10, 100],
+                [1, 10, 100, 1000],
+                lambda n, tmp: schemas.external_files(
+                    tempfile.mkdtemp(dir=tmp), files=n
+                ),
+                True,
+                "external files referenced",
+            ),
+        ),
+    ]
+)
+
+
+def build(schema):
+    """Build the classes for `schema` from scratch; return the builder."""
+    # Documents loaded by an earlier run would otherwise come from the cache.
+    python_jsonschema_objects.cache.documents.clear()
+    builder = pjo.ObjectBuilder(schema, validate_schema=False)
+    builder.build_classes()
+    return builder
+
+
+def measure(schema, repeat):
+    """Return the best build time, the peak traced memory and class count.
+
+    Tracing slows allocation down considerably, so times and peak memory
+    come from separate runs.
+    """
+    seconds = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        builder = build(schema)
+        elapsed = time.perf_counter() - start
+        seconds = elapsed if seconds is None else min(seconds, elapsed)
+    classes = builder.build_stats["classes"]
+    del builder
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        build(schema)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": seconds, "peak_bytes": peak, "classes": classes}
+
+
+def exponent(points):
+    """Fit ``seconds = c * size ** k`` to `points` and return k."""
+    xs = [math.log(p["size"]) for p in points if p["size"] > 0]
+    ys = [math.log(p["seconds"]) for p in points if p["size"] > 0]
+    if len(xs) < 2:
+        return None
+    mx, my = statistics.mean(xs), statistics.mean(ys)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / sum(
+        (x - mx) ** 2 for x in xs
+    )
+
+
+def run(axes, full=False, repeat=3, log=None):
+    """Measure every axis in `axes` and return the results as a dict."""
+    results = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "version": pjo.__version__,
+        "repeat": repeat,
+        "axes": collections.OrderedDict(),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in axes:
+            axis = AXES[name]
+            points = []
+            for size in axis.full_sizes if full else axis.sizes:
+                point = dict(size=size, **measure(axis.make(size, tmp), repeat))
+                points.append(point)
+                if log is not None:
+                    log(
+                        "{0:>12} {size:>6} {seconds:10.4f} "
+                        "{peak_bytes:12d} {classes:8d}".format(name, **point)
+                    )
+            results["axes"][name] = {
+                "description": axis.description,
+                "scaling": axis.scaling,
+                "exponent": exponent(points) if axis.scaling else None,
+                "points": points,
+            }
+    return results
+
+
+def compare(results, baseline, time_tolerance=1.5, exponent_tolerance=0.25):
+    """Return a list of regressions of `results` relative to `baseline`."""
+    matched = []
+    for name, axis in results["axes"].items():
+        base = baseline.get("axes", {}).get(name)
+        if base is None:
+            continue
+        base_points = {p["size"]: p for p in base["points"]}
+        for point in axis["points"]:
+            if point["size"] in base_points:
+                matched.append((name, point, base_points[point["size"]]))
+    if not matched:
+        return []
+
+    # How much slower this run is overall, to leave out of each point.
+    speed = statistics.median(p["seconds"] / b["seconds"] for _, p, b in matched)
+
+    regressions = []
+    for name, axis in results["axes"].items():
+        base = baseline.get("axes", {}).get(name)
+        if base is None or axis["exponent"] is None or base["exponent"] is None:
+            continue
+        if axis["exponent"] > base["exponent"] + exponent_tolerance:
+            regressions.append(
+                "{0}: build time grows as size ** {1:.2f}, was ** {2:.2f}".format(
+                    name, axis["exponent"], base["exponent"]
+                )
+            )
+    for name, point, base in matched:
+        ratio = point["seconds"] / base["seconds"] / speed
+        if ratio > time_tolerance:
+            regressions.append(
+                "{0}={1}: {2:.2f}x slower than the baseline".format(
+                    name, point["size"], ratio
+                )
+            )
+        ratio = point["peak_bytes"] / float(base["peak_bytes"])
+        if ratio > time_tolerance:
+            regressions.append(
+                "{0}={1}: peak memory {2:.2f}x the baseline".format(
+                    name, point["size"], ratio
+                )
+            )
+        if point["classes"] != base["classes"]:
+            regressions.append(
+                "{0}={1}: {2} classes, the baseline built {3}".format(
+                    name, point["size"], point["classes"], base["classes"]
+                )
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--axes", nargs="+", choices=list(AXES), default=list(AXES), metavar="AXIS"
+    )
+    parser.add_argument(
+        "--full", action="store_true", help="also measure the largest sizes"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="file to write the results to")
+    parser.add_argument(
+        "--baseline", help="results to compare with (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--write-baseline",
+        action="store_true",
+        help="store the results as the baseline instead of comparing",
+    )
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    parser.add_argument("--exponent-tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    print(
+        "{0:>12} {1:>6} {2:>10} {3:>12} {4:>8}".format(
+            "axis", "size", "build (s)", "peak (B)", "classes"
+        )
+    )
+    results = run(args.axes, args.full, args.repeat, log=print)
+    for name, axis in results["axes"].items():
+        if axis["exponent"] is not None:
+            print("{0}: build time ~ size ** {1:.2f}".format(name, axis["exponent"]))
+
+    if args.output:
+        with open(args.output, "w") as fout:
+            json.dump(results, fout, indent=2)
+    if args.write_baseline:
+        with open(args.baseline or BASELINE, "w") as fout:
+            json.dump(results, fout, indent=2)
+        return 0
+
+    baseline_path = args.baseline or BASELINE
+    if not os.path.exists(baseline_path):
+        return 0
+    with open(baseline_path) as fin:
+        regressions = compare(
+            results, json.load(fin), args.tolerance, args.exponent_tolerance
+        )
+    for regression in regressions:
+        print("REGRESSION " + regression)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    warnings.simplefilter("ignore")
+    sys.exit(main())
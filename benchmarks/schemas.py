@@ -0,0 +1,214 @@
+"""Synthetic schemas for the benchmarks in this directory."""
+
+import json
+import os
+
+SCHEMA_URI = "http://json-schema.org/draft-04/schema#"
+
+
+def wide_schema(definitions=100, properties=10, title="Wide"):
+    """A schema with many definitions, each referencing a couple of others.
+
+    Each definition has `properties` string properties, a `$ref` to another
+    definition and an array of inline objects, which is roughly the shape
+    of generated API schemas.
+    """
+    defs = {}
+    for i in range(definitions):
+        props = {
+            "field%d" % j: {"type": "string", "maxLength": 64, "description": "x" * 40}
+            for j in range(properties)
+        }
+        props["parent"] = {"$ref": "#/definitions/def%d" % (i // 2)}
+        props["items"] = {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"id": {"type": "integer"}, "name": {"type": "string"}},
+            },
+        }
+        defs["def%d" % i] = {
+            "title": "Def%d" % i,
+            "type": "object",
+            "properties": props,
+        }
+
+    return {
+        "$schema": SCHEMA_URI,
+        "title": title,
+        "type": "object",
+        "properties": {"root": {"$ref": "#/definitions/def0"}},
+        "definitions": defs,
+    }
+
+
+def allof_chain(depth=20, properties=10, title="Chain"):
+    """A schema whose definitions each extend the previous one with allOf.
+
+    Definition `level<n>` adds `properties` string properties of its own to
+    everything it inherits, so the last one has ``depth * properties``.
+    """
+    defs = {
+        "level0": {
+            "type": "object",
+            "properties": {
+                "p0_%d" % j: {"type": "string", "maxLength": 64}
+                for j in range(properties)
+            },
+        }
+    }
+    for i in range(1, depth):
+        defs["level%d" % i] = {
+            "allOf": [
+                {"$ref": "#/definitions/level%d" % (i - 1)},
+                {
+                    "type": "object",
+                    "properties": {
+                        "p%d_%d" % (i, j): {"type": "string", "maxLength": 64}
+                        for j in range(properties)
+                    },
+                },
+            ]
+        }
+
+    return {
+        "$schema": SCHEMA_URI,
+        "title": title,
+        "type": "object",
+        "properties": {"leaf": {"$ref": "#/definitions/level%d" % (depth - 1)}},
+        "definitions": defs,
+    }
+
+
+def nested_schema(depth=1000, title="Nested"):
+    """A schema of inline objects nested `depth` levels deep.
+
+    Every level has a string property and a `child` object holding the
+    next level, down to a `child` string at the bottom.
+    """
+    node = {"type": "string"}
+    for _ in range(depth):
+        node = {
+            "type": "object",
+            "properties": {"name": {"type": "string"}, "child": node},
+        }
+    node["$schema"] = SCHEMA_URI
+    node["title"] = title
+    return node
+
+
+def fanout_schema(definitions=200, fanout=1, title="Fanout"):
+    """A schema whose definitions each `$ref` `fanout` other definitions.
+
+    Definition ``def<i>`` refers to the `fanout` definitions after it, so
+    the references wrap around and form cycles once `fanout` is at least 1.
+    """
+    defs = {}
+    for i in range(definitions):
+        props = {"name": {"type": "string"}}
+        for k in range(1, fanout + 1):
+            props["ref%d" % k] = {
+                "$ref": "#/definitions/def%d" % ((i + k) % definitions)
+            }
+        defs["def%d" % i] = {"type": "object", "properties": props}
+    return {
+        "$schema": SCHEMA_URI,
+        "title": title,
+        "type": "object",
+        "properties": {"root": {"$ref": "#/definitions/def0"}},
+        "definitions": defs,
+    }
+
+
+def cyclic_schema(definitions=200, density=0.0, title="Cyclic"):
+    """A chain of definitions, a `density` fraction of which refer back.
+
+    Definition ``def<i>`` refers to ``def<i+1>``; with `density` 0 that is
+    acyclic, and every back reference (to ``def<i/2>``) closes a cycle.
+    """
+    step = int(round(1 / density)) if density else 0
+    defs = {}
+    for i in range(definitions):
+        props = {"name": {"type": "string"}}
+        if i + 1 < definitions:
+            props["next"] = {"$ref": "#/definitions/def%d" % (i + 1)}
+        if step and i % step == 0:
+            props["back"] = {"$ref": "#/definitions/def%d" % (i // 2)}
+        defs["def%d" % i] = {"type": "object", "properties": props}
+    return {
+        "$schema": SCHEMA_URI,
+        "title": title,
+        "type": "object",
+        "properties": {"root": {"$ref": "#/definitions/def0"}},
+        "definitions": defs,
+    }
+
+
+def oneof_schema(width=10, title="OneOf"):
+    """A schema with a property that is oneOf `width` alternatives.
+
+    Half of the alternatives are references to definitions and half are
+    inline objects, each with a distinguishing enum property.
+    """
+    defs = {}
+    alternatives = []
+    for i in range(width):
+        alternative = {
+            "type": "object",
+            "properties": {
+                "kind": {"type": "string", "enum": ["kind%d" % i]},
+                "value": {"type": "integer"},
+            },
+        }
+        if i % 2:
+            defs["alt%d" % i] = alternative
+            alternatives.append({"$ref": "#/definitions/alt%d" % i})
+        else:
+            alternatives.append(alternative)
+    return {
+        "$schema": SCHEMA_URI,
+        "title": title,
+        "type": "object",
+        "properties": {
+            "choice": {"oneOf": alternatives},
+            "choices": {"type": "array", "items": {"oneOf": alternatives}},
+        },
+        "definitions": defs,
+    }
+
+
+def external_files(directory, files=10, title="External"):
+    """Write a root schema referring to definitions in `files` other files.
+
+    Returns the path of the root schema, which refers to each file through
+    a ``file:`` reference, as ObjectBuilder resolves them.
+    """
+    properties = {}
+    for i in range(files):
+        name = "part%d.json" % i
+        document = {
+            "$schema": SCHEMA_URI,
+            "definitions": {
+                "thing": {
+                    "type": "object",
+                    "properties": {
+                        "name": {"type": "string"},
+                        "size": {"type": "integer"},
+                    },
+                }
+            },
+        }
+        with open(os.path.join(directory, name), "w") as fout:
+            json.dump(document, fout)
+        properties["part%d" % i] = {"$ref": "file:///%s#/definitions/thing" % name}
+
+    root = {
+        "$schema": SCHEMA_URI,
+        "title": title,
+        "type": "object",
+        "properties": properties,
+    }
+    path = os.path.join(directory, "root.json")
+    with open(path, "w") as fout:
+        json.dump(root, fout)
+    return path
@@ -1,23 +1,24 @@
 __all__ = ["ObjectBuilder", "markdown_support", "ValidationError"]
 
 import codecs
-import copy
+import collections
+import functools
+import gc
+import importlib
 import json
 import logging
 import os.path
+import threading
 import warnings
 from typing import Optional
 import typing
 
-import inflection
-import jsonschema
-import referencing.jsonschema
-import referencing.retrieval
-import referencing._core
-from referencing import Registry, Resource
+if typing.TYPE_CHECKING:
+    import referencing
 
+import python_jsonschema_objects.cache
 import python_jsonschema_objects.classbuilder as classbuilder
-import python_jsonschema_objects.markdown_support
+import python_jsonschema_objects.profiling
 import python_jsonschema_objects.util
 from python_jsonschema_objects.validators import ValidationError
 
@@ -38,33 +39,68 @@ class ObjectBuilder(object):
         self,
         schema_uri: typing.Union[typing.AnyStr, typing.Mapping],
         resolved: typing.Dict[typing.AnyStr, typing.Mapping] = {},
-        registry: Optional[referencing.Registry] = None,
-        resolver: Optional[referencing.typing.Retrieve] = None,
+        registry: Optional["referencing.Registry"] = None,
+        resolver: Optional["referencing.typing.Retrieve"] = None,
         specification_uri: Optional[str] = None,
+        cache: typing.Union[
+            None, str, "python_jsonschema_objects.cache.BuildCache"
+        ] = None,
+        validate_schema: typing.Union[bool, typing.Literal["cache"]] = True,
+        class_pool: Optional["python_jsonschema_objects.cache.ClassPool"] = None,
     ):
+        from referencing import Registry, Resource
+
+        if validate_schema not in (True, False, "cache"):
+            raise ValueError(
+                "validate_schema must be True, False or 'cache', not {0!r}".format(
+                    validate_schema
+                )
+            )
+        self._schema_view = None
+        self._validator = None
+        self.profiler = None
+        self._resolver = None
+        if isinstance(cache, str):
+            cache = python_jsonschema_objects.cache.BuildCache(cache)
+        self.cache = cache
+        self.class_pool = class_pool
+        self._memory_documents = dict(resolved)
+        self._file_dependencies = set()
+        self._file_uris = {}
+        self._root_path = None
+        self._own_registry = registry is None
+        self._specification_override = specification_uri
+        self._validate_mode = validate_schema
+        self._builder = None
+        self._build_options = None
+        self._roots = None
+
         if isinstance(schema_uri, str):
             uri = os.path.normpath(schema_uri)
             self.basedir = os.path.dirname(uri)
+            self._root_path = os.path.abspath(uri)
             with codecs.open(uri, "r", "utf-8") as fin:
                 self.schema = json.loads(fin.read())
         else:
-            self.schema = schema_uri
+            # Builds share this document with the registry rather than
+            # copying it, so take our own copy of the caller's.
+            self.schema = python_jsonschema_objects.util.copy_schema(schema_uri)
             uri = os.path.normpath(FILE)
             self.basedir = os.path.dirname(uri)
 
         if (
-            "$schema" in self.schema
-            and self.schema["$schema"].rstrip("#") not in SUPPORTED_VERSIONS
+            "$schema" in self._schema
+            and self._schema["$schema"].rstrip("#") not in SUPPORTED_VERSIONS
         ):
             warnings.warn(
                 "Schema version {} not recognized. Some "
                 "keywords and features may not be supported.".format(
-                    self.schema["$schema"]
+                    self._schema["$schema"]
                 )
             )
 
         if registry is not None:
-            if not isinstance(registry, referencing.Registry):
+            if not isinstance(registry, Registry):
                 raise TypeError("registry must be a Registry instance")
 
             if resolver is not None:
@@ -77,6 +113,7 @@ class ObjectBuilder(object):
             if resolver is not None:
 
                 def file_and_memory_handler(uri):
+                    self._record_retrieval()
                     if uri.startswith("file:"):
                         return Resource.from_contents(self.relative_file_resolver(uri))
                     return resolver(uri)
@@ -85,6 +122,7 @@ class ObjectBuilder(object):
             else:
 
                 def file_and_memory_handler(uri):
+                    self._record_retrieval()
                     if uri.startswith("file:"):
                         return Resource.from_contents(self.relative_file_resolver(uri))
                     raise RuntimeError(
@@ -95,27 +133,7 @@ class ObjectBuilder(object):
 
                 self.registry = Registry(retrieve=file_and_memory_handler)
 
-        if "$schema" not in self.schema:
-            warnings.warn(
-                "Schema version not specified. Defaulting to {}".format(
-                    specification_uri or "http://json-schema.org/draft-04/schema"
-                )
-            )
-            updated = {
-                "$schema": specification_uri or "http://json-schema.org/draft-04/schema"
-            }
-            updated.update(self.schema)
-            self.schema = updated
-
-        schema = Resource.from_contents(self.schema)
-        if schema.id() is None:
-            warnings.warn("Schema id not specified. Defaulting to 'self'")
-            updated = {"$id": "self", "id": "self"}
-            updated.update(self.schema)
-            self.schema = updated
-            schema = Resource.from_contents(self.schema)
-
-        self.registry = self.registry.with_resource("", schema)
+        self._register_root(specification_uri)
 
         if len(resolved) > 0:
             warnings.warn(
@@ -127,40 +145,134 @@ class ObjectBuilder(object):
             from referencing.jsonschema import specification_with
 
             specification = specification_with(
-                specification_uri or self.schema["$schema"]
+                specification_uri or self._schema["$schema"]
             )
             self.registry = self.registry.with_resource(
                 "memory:" + uri,
-                referencing.Resource.from_contents(contents, specification),
+                Resource.from_contents(contents, specification),
             )
 
-        validatorClass = jsonschema.validators.validator_for(
-            {"$schema": specification_uri or self.schema["$schema"]}
-        )
-
-        meta_validator = validatorClass(
-            validatorClass.META_SCHEMA, registry=self.registry
-        )
-        meta_validator.validate(self.schema)
-        self.validator = validatorClass(self.schema, registry=self.registry)
+        self._validate_root()
 
         self._classes = None
         self._resolved = None
+        self._lazy_builder = None
+        # Held while constructing in lazy mode, which warm_up may be doing
+        # on another thread.
+        self._build_lock = threading.RLock()
+        self._released = False
+
+    def _register_root(self, specification_uri):
+        """Fill in defaults for the root schema and add it to the registry."""
+        from referencing import Resource
+
+        if "$schema" not in self._schema:
+            warnings.warn(
+                "Schema version not specified. Defaulting to {}".format(
+                    specification_uri or "http://json-schema.org/draft-04/schema"
+                )
+            )
+            updated = {
+                "$schema": specification_uri or "http://json-schema.org/draft-04/schema"
+            }
+            updated.update(self._schema)
+            self.schema = updated
+
+        schema = Resource.from_contents(self._schema)
+        if schema.id() is None:
+            warnings.warn("Schema id not specified. Defaulting to 'self'")
+            updated = {"$id": "self", "id": "self"}
+            updated.update(self._schema)
+            self.schema = updated
+            schema = Resource.from_contents(self._schema)
+
+        self.registry = self.registry.with_resource("", schema)
+        self._specification_uri = specification_uri or self._schema["$schema"]
 
     @property
-    def resolver(self) -> referencing._core.Resolver:
-        return self.registry.resolver()
+    def resolver(self) -> "referencing.Resolver":
+        registry = self.registry
+        if self._resolver is None or self._resolver[0] is not registry:
+            self._resolver = (registry, registry.resolver())
+        return self._resolver[1]
 
     @property
     def schema(self):
-        try:
-            return copy.deepcopy(self._schema)
-        except AttributeError:
-            raise ValidationError("No schema provided")
+        """A read-only view of the schema.
+
+        Use `copy.deepcopy` on the view to get a mutable copy.
+        """
+        if self._schema_view is None:
+            try:
+                schema = self._schema
+            except AttributeError:
+                raise ValidationError("No schema provided")
+            self._schema_view = python_jsonschema_objects.util.read_only_view(schema)
+        return self._schema_view
 
     @schema.setter
     def schema(self, val):
         setattr(self, "_schema", val)
+        self._schema_view = None
+
+    @property
+    def validator(self):
+        """The jsonschema validator for the schema, created on first use."""
+        self._check_released()
+        if self._validator is None:
+            self._validator = self._validator_class(
+                self._schema, registry=self.registry
+            )
+        return self._validator
+
+    @validator.setter
+    def validator(self, val):
+        self._validator = val
+
+    @property
+    def _validator_class(self):
+        import jsonschema.validators
+
+        return jsonschema.validators.validator_for({"$schema": self._specification_uri})
+
+    def validate_schema(self):
+        """Validate the schema against its meta-schema.
+
+        Raises:
+            jsonschema.ValidationError: if the schema is invalid
+        """
+        validator_class = self._validator_class
+        meta_validator = validator_class(
+            validator_class.META_SCHEMA, registry=self.registry
+        )
+        meta_validator.validate(self._schema)
+
+    def _validate_root(self):
+        if self._validate_mode == "cache":
+            self._validate_schema_cached()
+        elif self._validate_mode:
+            self.validate_schema()
+
+    def _validate_schema_cached(self):
+        """Validate the schema unless a schema with the same digest passed.
+
+        Successful validations are remembered in this process and, if the
+        builder has a build cache, on disk.
+        """
+        digest = python_jsonschema_objects.util.schema_digest(
+            self._schema, self._specification_uri
+        )
+        validated = python_jsonschema_objects.cache.validated_schemas
+        if digest in validated:
+            return
+        if self.cache is not None and self.cache.is_validated(digest):
+            validated.add(digest)
+            return
+
+        self.validate_schema()
+        validated.add(digest)
+        if self.cache is not None:
+            self.cache.mark_validated(digest)
 
     @property
     def classes(self):
@@ -169,17 +281,222 @@ class ObjectBuilder(object):
         return self._classes
 
     def get_class(self, uri):
+        self._check_released()
         if self._resolved is None:
             self._classes = self.build_classes()
+        if uri not in self._resolved and self._lazy_builder is not None:
+            with self._build_lock:
+                if uri not in self._resolved:
+                    self._construct_on_demand(uri)
         return self._resolved.get(uri, None)
 
+    def release(self):
+        """Drop the state kept for looking up, validating and rebuilding.
+
+        Builders keep the registry, the documents it loaded and a table of
+        every class built (including anonymous ones) so that they can look
+        classes up, validate and rebuild. Services that only need the
+        classes can release the builder once they are built; the classes
+        then no longer refer to the builder's state, and are garbage
+        collected once the namespace is dropped.
+
+        The builder cannot be used after this; keep the namespace that
+        `build_classes` returned.
+        """
+        if self._lazy_builder is not None:
+            raise RuntimeError("Classes built with lazy=True cannot be released")
+        if self._builder is not None:
+            self._builder.release()
+        self._released = True
+        self._builder = self._resolved = self._build_options = None
+        self._validator = self._schema_view = self._resolver = None
+        self.profiler = None
+        self.registry = None
+        self._memory_documents = {}
+        self._file_dependencies = set()
+        self._file_uris = {}
+
+    def freeze(self):
+        """Prepare the built classes to be shared with forked processes.
+
+        Pre-fork servers build the classes once and fork their workers
+        afterwards. The workers share the memory holding the classes until
+        something writes to it, and the garbage collector writes to every
+        object it examines. Freezing releases the builder (see `release`)
+        and makes the metadata of every class read-only: the sets of
+        required and defaulted properties become frozensets, and the
+        property tables (`__propinfo__`, `__prop_names__` and the `info` of
+        each property descriptor) become read-only copies, made once for
+        dicts that classes share. It then moves every object allocated so
+        far out of the collector's reach with `gc.freeze`, so that the
+        workers keep sharing the classes.
+
+        Call this in the parent right before forking; `gc.unfreeze` undoes
+        the last step.
+
+        Returns:
+            The number of classes that were frozen
+        """
+        from python_jsonschema_objects import descriptors
+
+        if self._lazy_builder is not None:
+            raise RuntimeError("Classes built with lazy=True cannot be frozen")
+        self._check_released()
+        if self._resolved is None:
+            raise RuntimeError("Build the classes before freezing them")
+
+        classes = {id(k): k for k in self._resolved.values() if isinstance(k, type)}
+        self.release()
+        views = {}
+        for cls in classes.values():
+            for attr, value in list(vars(cls).items()):
+                if attr in ("__required__", "__has_default__"):
+                    if isinstance(value, set):
+                        setattr(cls, attr, frozenset(value))
+                elif attr in ("__propinfo__", "__prop_names__"):
+                    if isinstance(value, dict):
+                        setattr(
+                            cls,
+                            attr,
+                            python_jsonschema_objects.util.read_only_view(value, views),
+                        )
+                elif isinstance(value, descriptors.AttributeDescriptor):
+                    value.info = python_jsonschema_objects.util.read_only_view(
+                        value.info, views
+                    )
+
+        gc.collect()
+        gc.freeze()
+        return len(classes)
+
+    def _check_released(self):
+        if self._released:
+            raise RuntimeError("This builder has been released")
+
+    def warm_up(self, **kwargs):
+        """Build the classes on a background thread.
+
+        The classes are built lazily (see `build_classes`), and a thread
+        then builds every one of them. Classes requested in the meantime,
+        through the namespace or `get_class`, are built straight away,
+        waiting at most for the definition the thread is building.
+
+        Args:
+            kwargs: Passed to `build_classes`
+
+        Returns:
+            A concurrent.futures.Future for the namespace, which resolves
+            once every class is built. Use `asyncio.wrap_future` to await
+            it.
+        """
+        namespace = self.build_classes(lazy=True, **kwargs)
+
+        def build_all():
+            for name in namespace:
+                namespace[name]
+            with self._build_lock:
+                self._lazy_builder.link()
+            return namespace
+
+        import concurrent.futures
+
+        executor = concurrent.futures.ThreadPoolExecutor(
+            1, thread_name_prefix="pjo-warm-up"
+        )
+        try:
+            return executor.submit(build_all)
+        finally:
+            executor.shutdown(wait=False)
+
+    @property
+    def schema_digest(self):
+        """A digest of the schema and any in-memory documents it references."""
+        return python_jsonschema_objects.util.schema_digest(
+            self._schema, sorted(self._memory_documents.items())
+        )
+
+    def invalidate_cache(self):
+        """Drop any cached builds of this schema from the build cache."""
+        if self.cache is not None:
+            self.cache.invalidate(self.schema_digest)
+
     def relative_file_resolver(self, uri):
         path = os.path.join(self.basedir, uri[8:])
-        with codecs.open(path, "r", "utf-8") as fin:
-            result = json.loads(fin.read())
-        return result
+        self._file_dependencies.add(os.path.abspath(path))
+        self._file_uris[os.path.abspath(path)] = uri
+        return python_jsonschema_objects.cache.documents.load(path)
+
+    def prefetch(self, max_workers=8):
+        """Retrieve the documents the schema references ahead of the build.
+
+        References to other documents are otherwise retrieved one at a
+        time, as the build reaches them. This follows them transitively
+        from the root schema and retrieves each round of new documents in
+        parallel, through the registry's retrieval function (the `resolver`
+        passed to the builder, for instance), then adds them to the
+        registry so that the build does not retrieve anything. Reusing
+        connections is up to that function.
+
+        Args:
+            max_workers: (int) The number of documents retrieved at once
+
+        Returns:
+            The URIs of the documents that were retrieved
+        """
+        import concurrent.futures
+
+        registry = self.registry
+        seen = set()
+        retrieved = []
+        pending = [("", self._schema)]
+        with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+            while pending:
+                wanted = []
+                for base, schema in pending:
+                    for uri in python_jsonschema_objects.util.external_documents(
+                        base, schema
+                    ):
+                        if uri not in seen and uri not in registry:
+                            wanted.append(uri)
+                        seen.add(uri)
+
+                resources = list(
+                    executor.map(
+                        lambda uri: registry.get_or_retrieve(uri).value, wanted
+                    )
+                )
+                retrieved.extend(wanted)
+                registry = registry.with_resources(zip(wanted, resources))
+                pending = [
+                    (uri, resource.contents) for uri, resource in zip(wanted, resources)
+                ]
+
+        self.registry = registry
+        self._validator = None
+        return retrieved
+
+    def _retrieved_documents(self):
+        """Return the documents the last build used that are not files.
+
+        In-memory documents are part of the schema digest. The build cache
+        can only tell whether files have changed, so builds that used
+        documents retrieved through the `resolver` are not cached.
+        """
+        documents = set()
+        for uri in self._resolved:
+            if python_jsonschema_objects.util.is_absolute_uri(uri):
+                document = uri.partition("#")[0]
+                if not document.startswith(("file:", "memory:")):
+                    documents.add(document)
+        return documents
+
+    def _record_retrieval(self):
+        if self.profiler is not None:
+            self.profiler.record_retrieval()
 
     def validate(self, obj):
+        import jsonschema
+
         try:
             return self.validator.validate(obj)
         except jsonschema.ValidationError as e:
@@ -191,6 +508,11 @@ class ObjectBuilder(object):
         named_only=False,
         standardize_names=True,
         any_of: typing.Optional[typing.Literal["use-first"]] = None,
+        lazy=False,
+        profile=False,
+        roots=None,
+        dedupe=False,
+        flatten=False,
     ):
         """
         Build all of the classes named in the JSONSchema.
@@ -212,47 +534,381 @@ class ObjectBuilder(object):
             any_of: (literal) If not set to None, defines the way anyOf clauses are resolved:
                 - 'use-first': Generate to the first matching schema in the list under the anyOf
                 - None: default behavior, anyOf is not supported in the schema
+            lazy: (bool) If true, classes are only built when they are first
+                looked up in the namespace or through get_class, along with
+                whatever they reference. The namespace then lists the
+                definitions (by title, or by name if untitled) and the root
+                schema; anonymous classes are only available through get_class.
+            profile: (bool) If true, record how long each URI took to build,
+                along with the references, retrievals and anonymous classes
+                involved. The results are available from `profiler` once the
+                build finishes; the build cache is not used.
+            roots: (iterable) If given, only build these top level entries
+                and the classes they reference. Entries are named by
+                definition name (e.g. "address"), by URI (e.g.
+                "#/definitions/address"), or by the root schema's name.
+            dedupe: (bool) If true, anonymous sub-schemas (inline objects,
+                array items and literal properties) that are structurally
+                identical share a single class. `build_stats` reports how
+                many classes this saved.
+            flatten: (bool) If true, classes composed with allOf derive from
+                ProtocolBase alone rather than from the classes of their
+                allOf schemas, and carry the properties they would inherit
+                themselves. isinstance and issubclass still treat them as
+                subclasses of those classes.
+
+        If the builder was given a `cache` and `lazy` is false, classes are
+        restored from it when an entry for the same schema, directory,
+        options and referenced files exists, and stored in it otherwise.
+        Builds that use documents retrieved through a `resolver` are not
+        stored, and builders given a `registry` do not use the cache.
 
         Returns:
             A namespace containing all the generated classes
 
         """
-        opts = {"strict": strict, "any_of": any_of}
-        builder = classbuilder.ClassBuilder(self.resolver, opts)
-        for nm, defn in self.schema.get("definitions", {}).items():
+        self._check_released()
+        opts = {
+            "strict": strict,
+            "any_of": any_of,
+            "dedupe": dedupe,
+            "flatten": flatten,
+        }
+        self._roots = None if roots is None else sorted(set(roots))
+        self.profiler = (
+            python_jsonschema_objects.profiling.BuildProfiler() if profile else None
+        )
+        if lazy:
+            self._build_options = self._builder = None
+            return self._build_classes_lazily(opts, named_only, standardize_names)
+
+        self._lazy_builder = None
+        self._build_options = (opts, named_only, standardize_names)
+        if self.cache is not None and self._own_registry and not profile:
+            cache_opts = dict(
+                opts,
+                named_only=named_only,
+                standardize_names=standardize_names,
+                roots=self._roots,
+                # Relative file references resolve against this directory
+                basedir=os.path.abspath(self.basedir),
+            )
+            digest = self.schema_digest
+            cached = self.cache.load(digest, cache_opts)
+            if cached is not None:
+                classes, self._resolved = cached
+                self._builder = None
+                return python_jsonschema_objects.util.Namespace.from_mapping(classes)
+
+            self._file_dependencies = set()
+            classes = self._build_classes(opts, named_only, standardize_names)
+            unchecked = self._retrieved_documents()
+            if unchecked:
+                logger.debug(
+                    python_jsonschema_objects.util.lazy_format(
+                        "Not caching a build that retrieved {0}", sorted(unchecked)
+                    )
+                )
+            else:
+                self.cache.store(
+                    digest,
+                    cache_opts,
+                    classes,
+                    self._resolved,
+                    self._file_dependencies,
+                )
+            return classes
+
+        return self._build_classes(opts, named_only, standardize_names)
+
+    def rebuild(self, changed_files):
+        """
+        Rebuild the classes affected by changes to schema files.
+
+        Only classes built from the changed files, and the classes that
+        refer to them (directly or indirectly), are rebuilt; every other
+        class in the returned namespace is the same object as before. If
+        the root schema file changed, it is reloaded and every class built
+        from it is rebuilt.
+
+        The options given to the last call to build_classes are reused.
+
+        Args:
+            changed_files: (iterable) Paths of the files that changed. Files
+                the build never read are ignored.
+
+        Returns:
+            A namespace containing all the generated classes
+        """
+        self._check_released()
+        if self._build_options is None:
+            raise RuntimeError(
+                "rebuild requires a previous call to build_classes without lazy=True"
+            )
+        changed = {os.path.abspath(path) for path in changed_files}
+        for path in changed:
+            python_jsonschema_objects.cache.documents.discard(path)
+
+        if self._root_path in changed:
+            with codecs.open(self._root_path, "r", "utf-8") as fin:
+                self.schema = json.loads(fin.read())
+            self._register_root(self._specification_override)
+            self._validate_root()
+            self._validator = None
+
+        opts, named_only, standardize_names = self._build_options
+        self.profiler = None
+        builder = self._class_builder(opts)
+        if self._builder is not None:
+            previous = self._builder
+            affected = self._affected_uris(previous, changed)
+            builder.resolved.update(
+                (uri, klass)
+                for uri, klass in previous.resolved.items()
+                if uri not in affected
+            )
+            builder.dependencies.update(
+                (uri, set(refs))
+                for uri, refs in previous.dependencies.items()
+                if uri not in affected
+            )
+            # Kept classes are not built again, so their references aren't seen
+            builder.direct_refs.update(previous.direct_refs - affected)
+
+        self._classes = self._build_classes(
+            opts, named_only, standardize_names, builder
+        )
+        return self._classes
+
+    @property
+    def build_stats(self):
+        """Counts describing the classes built by the last build.
+
+        A dict with the number of URIs resolved, the number of distinct
+        classes among them, and the number of classes saved by `dedupe`, or
+        None if no classes have been built (or they came from the build
+        cache).
+        """
+        builder = self._builder or self._lazy_builder
+        if builder is None:
+            return None
+        return {
+            "uris": len(builder.resolved),
+            "classes": len(
+                {id(k) for k in builder.resolved.values() if isinstance(k, type)}
+            ),
+            "classes_saved": builder.stats["classes_saved"],
+        }
+
+    def ref_graph(self):
+        """
+        Return the graph of references found by the last build.
+
+        Nodes are the URIs that were built, and edges point from a URI to
+        the URIs it refers to, including inline sub-schemas. In lazy mode
+        the graph only covers the classes built so far. Classes restored
+        from the build cache have no graph.
+
+        Returns:
+            A python_jsonschema_objects.graph.RefGraph
+        """
+        builder = self._builder or self._lazy_builder
+        if builder is None:
+            raise RuntimeError("ref_graph requires classes built by build_classes")
+        return python_jsonschema_objects.graph.RefGraph(
+            builder.dependencies, builder.resolved
+        )
+
+    def _affected_uris(self, builder, changed):
+        """Return the URIs built from `changed` files, and their dependents."""
+        documents = [
+            self._file_uris[path] for path in changed if path in self._file_uris
+        ]
+        root_changed = self._root_path in changed
+
+        dependents = collections.defaultdict(set)
+        for uri, refs in builder.dependencies.items():
+            for ref in refs:
+                dependents[ref].add(uri)
+
+        affected = set()
+        for uri in set(builder.resolved) | set(builder.dependencies) | set(dependents):
+            if root_changed and not python_jsonschema_objects.util.is_absolute_uri(uri):
+                affected.add(uri)
+            elif any(
+                uri == doc or uri.startswith((doc + "#", doc + "/", doc + "_"))
+                for doc in documents
+            ):
+                affected.add(uri)
+
+        stack = list(affected)
+        while stack:
+            for uri in dependents[stack.pop()]:
+                if uri not in affected:
+                    affected.add(uri)
+                    stack.append(uri)
+        return affected
+
+    def generate_module(self, path=None, **kwargs):
+        """
+        Build the classes for the schema and write them out as Python source.
+
+        The resulting module defines a static class for each generated class,
+        along with `namespace` (equivalent to the return value of
+        build_classes) and `resolved` (equivalent to the URIs used by
+        get_class). Importing it does not parse or resolve the schema.
+
+        Args:
+            path: (str) If given, the file to write the module to
+            **kwargs: Options passed through to build_classes
+
+        Returns:
+            The module source
+        """
+        classes = self.build_classes(**kwargs)
+        title = self._schema.get("title", self._schema.get("$id"))
+        source = python_jsonschema_objects.codegen.generate_module(
+            self._resolved, classes, title=title
+        )
+        if path is not None:
+            with codecs.open(path, "w", "utf-8") as fout:
+                fout.write(source)
+        return source
+
+    def _top_level_entries(self):
+        """Return (uri, schema) pairs for each definition and the root schema."""
+        entries = []
+        for nm in self._schema.get("definitions", {}):
             resolved = self.resolver.lookup("#/definitions/" + nm)
             uri = python_jsonschema_objects.util.resolve_ref_uri(
                 self.resolver._base_uri, "#/definitions/" + nm
             )
-            builder.construct(uri, resolved.contents)
+            entries.append((uri, resolved.contents))
 
-        if standardize_names:
-            name_transform = lambda t: inflection.camelize(
-                inflection.parameterize(str(t), "_")
-            )
-        else:
-            name_transform = lambda t: t
+        import inflection
 
-        nm = self.schema["title"] if "title" in self.schema else self.schema["$id"]
+        nm = self._schema["title"] if "title" in self._schema else self._schema["$id"]
         nm = inflection.parameterize(str(nm), "_")
+        entries.append((nm, self._schema))
+        if self._roots is None:
+            return entries
+
+        by_uri = dict(entries)
+        selected = []
+        for root in self._roots:
+            if root in self._schema.get("definitions", {}):
+                root = python_jsonschema_objects.util.resolve_ref_uri(
+                    self.resolver._base_uri, "#/definitions/" + root
+                )
+            if root not in by_uri:
+                raise ValueError("Unknown root {0!r}".format(root))
+            selected.append((root, by_uri[root]))
+        return selected
 
-        builder.construct(nm, self.schema)
+    @staticmethod
+    def _name_transform(standardize_names):
+        if standardize_names:
+            import inflection
+
+            return lambda t: inflection.camelize(inflection.parameterize(str(t), "_"))
+        return lambda t: t
+
+    def _build_classes(self, opts, named_only, standardize_names, builder=None):
+        if builder is None:
+            builder = self._class_builder(opts)
+        for uri, contents in self._top_level_entries():
+            builder.construct(uri, contents)
+        builder.link()
+        self._builder = builder
         self._resolved = builder.resolved
 
+        name_transform = self._name_transform(standardize_names)
         classes = {}
         for uri, klass in builder.resolved.items():
+            if (
+                python_jsonschema_objects.util.is_absolute_uri(uri)
+                and uri not in builder.direct_refs
+            ):
+                # Classes from other documents are listed if a $ref names
+                # them; their anonymous sub-schemas are not.
+                continue
             title = getattr(klass, "__title__", None)
             if title is not None:
                 classes[name_transform(title)] = klass
             elif not named_only:
-                classes[name_transform(uri.split("/")[-1])] = klass
+                classes[name_transform(uri.rsplit("/", 1)[-1])] = klass
 
         return python_jsonschema_objects.util.Namespace.from_mapping(classes)
 
+    def _class_builder(self, opts):
+        builder = classbuilder.ClassBuilder(
+            self.resolver, opts, self.profiler, self.class_pool
+        )
+        if self._root_path is not None:
+            # The root document can also be reached through a file: reference
+            # to itself; build its classes once, under the root's URIs.
+            name = os.path.relpath(self._root_path, self.basedir)
+            builder.aliases["file:///" + name.replace(os.sep, "/")] = ""
+        return builder
+
+    def _build_classes_lazily(self, opts, named_only, standardize_names):
+        builder = self._class_builder(opts)
+        self._lazy_builder = builder
+        self._lazy_entries = dict(self._top_level_entries())
+        self._resolved = builder.resolved
+
+        name_transform = self._name_transform(standardize_names)
+        loaders = {}
+        for uri, contents in self._lazy_entries.items():
+            title = contents.get("title")
+            if title is not None:
+                name = name_transform(title)
+            elif not named_only:
+                name = name_transform(uri.rsplit("/", 1)[-1])
+            else:
+                continue
+            loaders[name] = functools.partial(self._construct_entry, uri, contents)
+
+        return python_jsonschema_objects.util.LazyNamespace(loaders)
+
+    def _construct_entry(self, uri, contents):
+        with self._build_lock:
+            return self._lazy_builder.construct(uri, contents)
+
+    def _construct_on_demand(self, uri):
+        """Build the top level entry that `uri` belongs to, in lazy mode."""
+        owners = [
+            entry
+            for entry in self._lazy_entries
+            if uri == entry or uri.startswith((entry + "/", entry + "_"))
+        ]
+        if uri not in self._lazy_entries and not owners:
+            try:
+                resolved = self.resolver.lookup(uri)
+            except Exception:
+                return
+            self._lazy_builder.construct(uri, resolved.contents)
+            return
+
+        owner = max(owners, key=len)
+        self._lazy_builder.construct(owner, self._lazy_entries[owner])
+
 
 if __name__ == "__main__":
     validator = ObjectBuilder("../../protocol/json/schema.json")
 
-from . import _version
+# Submodules that are only needed by some users, and so only imported once
+# they are first used, as `python_jsonschema_objects.codegen` for instance.
+_LAZY_SUBMODULES = frozenset(["codegen", "graph", "markdown_support"])
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    if name == "__version__":
+        # Working out the version may run git, so it waits until asked for.
+        from . import _version
 
-__version__ = _version.get_versions()["version"]
+        version = globals()["__version__"] = _version.get_versions()["version"]
+        return version
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
@@ -0,0 +1,179 @@
+"""Bundle a schema and the documents it references into a single document.
+
+Every `$ref` into another document (``file:``, ``https:``, ...) is replaced
+by a reference to a copy of its target under the root's ``definitions``,
+so that the bundle can be built without retrieving anything::
+
+    python -m python_jsonschema_objects.bundle schema.json -o bundle.json
+"""
+
+__all__ = ["bundle_schema", "main"]
+
+import argparse
+import copy
+import json
+import os
+import posixpath
+import sys
+import urllib.parse
+
+import python_jsonschema_objects
+import python_jsonschema_objects.cache
+from python_jsonschema_objects import util
+
+
+def _split_pointer(pointer):
+    return [
+        part.replace("~1", "/").replace("~0", "~") for part in pointer.split("/")[1:]
+    ]
+
+
+def _escape(part):
+    return part.replace("~", "~0").replace("/", "~1")
+
+
+class _Bundler(object):
+    def __init__(self, builder, document):
+        self.builder = builder
+        # The root as the caller wrote it, without the `$schema` and `id`
+        # defaults the builder fills in
+        self.document = document
+        self.local = {""}
+        if builder._root_path is not None:
+            name = os.path.relpath(builder._root_path, builder.basedir)
+            self.local.add("file:///" + name.replace(os.sep, "/"))
+        # (document, pointer) -> (base uri, contents) for every external target
+        self.targets = {}
+        # (document, pointer) -> definition name for the targets we copy
+        self.names = {}
+
+    def _split(self, base, ref):
+        document, fragment = urllib.parse.urldefrag(util.resolve_ref_uri(base, ref))
+        if fragment and not fragment.startswith("/"):
+            raise ValueError("Cannot bundle reference {0!r}".format(ref))
+        return document, fragment
+
+    def collect(self):
+        pending = [("", self.document)]
+        while pending:
+            base, schema = pending.pop()
+            for node in util.subschemas(schema):
+                ref = node.get("$ref")
+                if not isinstance(ref, str):
+                    continue
+                target = self._split(base, ref)
+                if target[0] in self.local or target in self.targets:
+                    continue
+                resolved = self.builder.resolver.lookup("#".join(target))
+                self.targets[target] = (target[0], resolved.contents)
+                pending.append(self.targets[target])
+
+    def assign_names(self):
+        taken = set(self.document.get("definitions", ()))
+        for document, pointer in sorted(self.targets):
+            if any(
+                (document, prefix) in self.targets for prefix in self._prefixes(pointer)
+            ):
+                # Copied as part of an enclosing target
+                continue
+            stem = posixpath.splitext(
+                posixpath.basename(urllib.parse.urlsplit(document).path)
+            )[0]
+            parts = _split_pointer(pointer)
+            name = parts[-1] if parts else stem
+            if name in taken:
+                name = prefixed = "{0}_{1}".format(stem, name)
+                count = 1
+                while name in taken:
+                    count += 1
+                    name = "{0}_{1}".format(prefixed, count)
+            taken.add(name)
+            self.names[(document, pointer)] = name
+
+    @staticmethod
+    def _prefixes(pointer):
+        """Return the proper prefixes of a JSON pointer, shortest first."""
+        parts = pointer.split("/")
+        return ["/".join(parts[:i]) for i in range(1, len(parts))]
+
+    def rewrite(self, base, schema):
+        schema = copy.deepcopy(schema)
+        for node in util.subschemas(schema):
+            ref = node.get("$ref")
+            if not isinstance(ref, str):
+                continue
+            document, pointer = self._split(base, ref)
+            if document in self.local:
+                node["$ref"] = "#" + pointer
+                continue
+            for prefix in self._prefixes(pointer) + [pointer]:
+                name = self.names.get((document, prefix))
+                if name is not None:
+                    node["$ref"] = (
+                        "#/definitions/" + _escape(name) + pointer[len(prefix) :]
+                    )
+                    break
+        return schema
+
+    def bundle(self):
+        self.collect()
+        self.assign_names()
+        result = self.rewrite("", self.document)
+        definitions = result.setdefault("definitions", {})
+        for target, name in sorted(self.names.items(), key=lambda item: item[1]):
+            definition = self.rewrite(*self.targets[target])
+            if isinstance(definition, dict):
+                # Resolve everything against the bundle, not the original.
+                definition.pop("$schema", None)
+                definition.pop("$id", None)
+                definition.pop("id", None)
+            definitions[name] = definition
+        return result
+
+
+def bundle_schema(schema_uri, **kwargs):
+    """Return `schema_uri` and every document it references as one schema.
+
+    References between documents are rewritten to point into the
+    ``definitions`` of the result, so that building classes from it does
+    not retrieve anything. Definitions copied from other documents keep
+    their name unless it is already taken, in which case it is prefixed
+    with the name of their document.
+
+    Args:
+        schema_uri: (str or Mapping) The root schema, or a path to it
+        kwargs: Passed to ObjectBuilder, to supply a `resolver` for
+            remote documents for instance
+    """
+    kwargs.setdefault("validate_schema", False)
+    builder = python_jsonschema_objects.ObjectBuilder(schema_uri, **kwargs)
+    if isinstance(schema_uri, str):
+        document = python_jsonschema_objects.cache.documents.load(schema_uri)
+    else:
+        document = util.copy_schema(schema_uri)
+    return _Bundler(builder, document).bundle()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m python_jsonschema_objects.bundle",
+        description="Bundle a JSON schema and the documents it references.",
+    )
+    parser.add_argument("schema", help="path to the root schema")
+    parser.add_argument(
+        "-o", "--output", help="file to write the bundle to (default: stdout)"
+    )
+    parser.add_argument("--indent", type=int, default=2, help="JSON indentation")
+    args = parser.parse_args(argv)
+
+    text = json.dumps(bundle_schema(args.schema), indent=args.indent, sort_keys=True)
+    if args.output is None:
+        sys.stdout.write(text + "\n")
+    else:
+        with open(args.output, "w") as fout:
+            fout.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
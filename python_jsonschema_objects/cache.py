@@ -0,0 +1,530 @@
+"""Caches for schema documents and generated classes."""
+
+__all__ = [
+    "BuildCache",
+    "ClassPool",
+    "DigestSet",
+    "DocumentCache",
+    "NamespaceCache",
+    "documents",
+    "validated_schemas",
+]
+
+import codecs
+import collections
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+
+from python_jsonschema_objects import util
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT = 1
+"""Bumped whenever the layout of pickled class graphs changes."""
+
+
+def _new_class(meta, name, bases):
+    return meta(name, bases, {})
+
+
+def _set_class_state(cls, state):
+    for attr, value in state.items():
+        setattr(cls, attr, value)
+    return cls
+
+
+class _ClassGraphPickler(pickle.Pickler):
+    """Pickle generated classes by value rather than by reference.
+
+    A generated class is written as a bare skeleton (metaclass, name and
+    bases) the first time it is seen, and queued. Its attributes are written
+    afterwards in separate batches by `dump_states`, so that references
+    between classes are always memo hits. This keeps the pickler's recursion
+    depth bounded by the nesting of a single class's metadata rather than by
+    the length of the reference chains in the schema.
+    """
+
+    def __init__(self, file):
+        super(_ClassGraphPickler, self).__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.pending = []
+        self.seen = set()
+
+    def reducer_override(self, obj):
+        if isinstance(obj, type) and util.is_generated_class(obj):
+            if id(obj) not in self.seen:
+                self.seen.add(id(obj))
+                self.pending.append(obj)
+            return _new_class, (type(obj), obj.__name__, obj.__bases__)
+        return NotImplemented
+
+    def dump_states(self):
+        while self.pending:
+            batch, self.pending = self.pending, []
+            self.dump([(cls, util.class_state(cls)) for cls in batch])
+        self.dump(None)
+
+
+def dump_class_graph(payload, file):
+    """Write `payload`, and every generated class it references, to `file`."""
+    pickler = _ClassGraphPickler(file)
+    pickler.dump(payload)
+    pickler.dump_states()
+
+
+def load_class_graph(file):
+    """Read a payload written by `dump_class_graph`."""
+    unpickler = pickle.Unpickler(file)
+    payload = unpickler.load()
+    states = []
+    while True:
+        batch = unpickler.load()
+        if batch is None:
+            break
+        states.extend(batch)
+    for cls, state in states:
+        util.register_ancestors(_set_class_state(cls, state))
+    return payload
+
+
+class DigestSet(object):
+    """A bounded, thread-safe set of digests.
+
+    Once `maxsize` digests have been added, the least recently added or
+    checked one is evicted to make room.
+
+    Args:
+        maxsize: (int) The number of digests to remember
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._digests = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, digest):
+        with self._lock:
+            if digest not in self._digests:
+                return False
+            self._digests.move_to_end(digest)
+            return True
+
+    def __len__(self):
+        return len(self._digests)
+
+    def add(self, digest):
+        with self._lock:
+            self._digests[digest] = None
+            self._digests.move_to_end(digest)
+            while len(self._digests) > self.maxsize:
+                self._digests.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._digests.clear()
+
+
+validated_schemas = DigestSet()
+"""Digests of schemas that passed meta-schema validation in this process."""
+
+
+CacheInfo = collections.namedtuple(
+    "CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"]
+)
+
+
+class DocumentCache(object):
+    """A bounded, thread-safe cache of parsed JSON files.
+
+    Documents are keyed by absolute path and are reparsed whenever the
+    file's modification time or size changes. Once `maxsize` documents are
+    cached, the least recently used one is evicted.
+
+    Cached documents are shared between every caller that loads the same
+    file, so they are returned as read-only views.
+
+    Args:
+        maxsize: (int) The number of documents to keep
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+        self._documents = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, path):
+        """Return the parsed contents of the JSON file at `path`."""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._documents.get(path)
+            if entry is not None and entry[0] == key:
+                self._documents.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        with codecs.open(path, "r", "utf-8") as fin:
+            document = util.read_only_view(json.loads(fin.read()))
+
+        with self._lock:
+            self._documents[path] = (key, document)
+            self._documents.move_to_end(path)
+            while len(self._documents) > self.maxsize:
+                self._documents.popitem(last=False)
+                self.evictions += 1
+        return document
+
+    def discard(self, path):
+        """Drop the document for `path`, if it is cached."""
+        with self._lock:
+            self._documents.pop(os.path.abspath(path), None)
+
+    def info(self):
+        """Return hit, miss and eviction counts and the current size."""
+        with self._lock:
+            return CacheInfo(
+                self.hits,
+                self.misses,
+                self.evictions,
+                self.maxsize,
+                len(self._documents),
+            )
+
+    def clear(self):
+        """Drop every cached document and reset the counters."""
+        with self._lock:
+            self._documents.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+documents = DocumentCache()
+"""The documents loaded through `file:` references by every ObjectBuilder."""
+
+
+class ClassPool(object):
+    """A pool of classes built from shared documents, for use by many builders.
+
+    Builders given the same pool build each definition of an external
+    document (one referenced through an absolute URI, such as ``file:`` or
+    ``https:``) once, and share the resulting classes. Entries are keyed by
+    the definition's absolute URI, a digest of the document it is in and
+    the build options. Documents are assumed to be versioned: a document
+    that changes gets new entries, but the classes built for a definition
+    also embed whatever it references in other documents.
+
+    The pool keeps its classes alive until it is cleared.
+    """
+
+    def __init__(self):
+        self.hits = self.misses = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the classes pooled under `key`, keyed by URI, or None."""
+        with self._lock:
+            classes = self._entries.get(key)
+            if classes is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return classes
+
+    def add(self, key, classes):
+        """Pool `classes` (URIs mapped to classes) under `key`.
+
+        If another builder pooled classes under `key` first, those are kept
+        and returned instead.
+        """
+        with self._lock:
+            return self._entries.setdefault(key, dict(classes))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+def estimate_size(classes):
+    """Roughly estimate the memory, in bytes, used by generated classes.
+
+    Counts each class object, its attribute dict and its property metadata.
+    """
+    size = 0
+    for klass in {id(k): k for k in classes}.values():
+        size += sys.getsizeof(klass)
+        if isinstance(klass, type):
+            size += sys.getsizeof(vars(klass))
+            propinfo = vars(klass).get("__propinfo__")
+            if propinfo:
+                size += sys.getsizeof(propinfo)
+                size += sum(sys.getsizeof(v) for v in propinfo.values())
+    return size
+
+
+class NamespaceCache(object):
+    """A bounded, thread-safe cache of built namespaces.
+
+    Namespaces are keyed by the digest of the schema and the options passed
+    to build_classes. The builder itself is not kept. When a namespace is
+    requested while another thread is building it, the caller waits for
+    that build rather than starting its own.
+
+    Once the cache holds more than `maxsize` namespaces, or their combined
+    weight exceeds `max_weight`, the least recently used ones are evicted.
+    The most recently built namespace is never evicted.
+
+    For schemas given as a path, only the root file's content is part of
+    the key; files it references are not checked for changes.
+
+    Args:
+        maxsize: (int) The number of namespaces to keep
+        max_weight: (int) If given, the total weight of the namespaces to
+            keep
+        weigher: (callable) Returns the weight of the classes of a build,
+            given an iterable of them. Defaults to `estimate_size`, so
+            weights are approximate sizes in bytes.
+        **builder_options: Keyword arguments for every ObjectBuilder the
+            cache creates
+    """
+
+    def __init__(self, maxsize=64, max_weight=None, weigher=None, **builder_options):
+        self.maxsize = maxsize
+        self.max_weight = max_weight
+        self.weigher = weigher or estimate_size
+        self.builder_options = builder_options
+        self.hits = self.misses = self.evictions = 0
+        self.weight = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._building = {}
+
+    @staticmethod
+    def _key(schema, build_options):
+        if isinstance(schema, str):
+            with codecs.open(schema, "r", "utf-8") as fin:
+                document = json.loads(fin.read())
+            parts = (os.path.abspath(schema), document)
+        else:
+            parts = (schema,)
+        return util.schema_digest(*parts, sorted(build_options.items()))
+
+    def _hit(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def get(self, schema, **build_options):
+        """Return the namespace for `schema`, building it if needed.
+
+        Args:
+            schema: (str or Mapping) A schema, or a path to one, as taken by
+                ObjectBuilder
+            **build_options: Keyword arguments for build_classes
+        """
+        key = self._key(schema, build_options)
+        with self._lock:
+            namespace = self._hit(key)
+            if namespace is not None:
+                return namespace
+            building = self._building.setdefault(key, threading.Lock())
+
+        with building:
+            with self._lock:
+                namespace = self._hit(key)
+                if namespace is not None:
+                    return namespace
+                self.misses += 1
+
+            try:
+                namespace, weight = self._build(schema, build_options)
+            except Exception:
+                with self._lock:
+                    self._building.pop(key, None)
+                raise
+
+            with self._lock:
+                self._entries[key] = (namespace, weight)
+                self.weight += weight
+                self._building.pop(key, None)
+                self._evict()
+        return namespace
+
+    def _build(self, schema, build_options):
+        from python_jsonschema_objects import ObjectBuilder
+
+        builder = ObjectBuilder(schema, **self.builder_options)
+        namespace = builder.build_classes(**build_options)
+        weight = self.weigher(builder._resolved.values())
+        if not build_options.get("lazy"):
+            # Nothing else refers to the builder; let evicted classes go.
+            builder.release()
+        return namespace, weight
+
+    def _evict(self):
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.maxsize
+            or (self.max_weight is not None and self.weight > self.max_weight)
+        ):
+            _, (_, weight) = self._entries.popitem(last=False)
+            self.weight -= weight
+            self.evictions += 1
+
+    def info(self):
+        """Return hit, miss and eviction counts and the current size."""
+        with self._lock:
+            return CacheInfo(
+                self.hits,
+                self.misses,
+                self.evictions,
+                self.maxsize,
+                len(self._entries),
+            )
+
+    def clear(self):
+        """Drop every namespace and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.weight = 0
+            self.hits = self.misses = self.evictions = 0
+
+
+def _file_digest(path):
+    hasher = hashlib.sha256()
+    with open(path, "rb") as fin:
+        for chunk in iter(lambda: fin.read(1 << 16), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class BuildCache(object):
+    """A content-addressed, on-disk cache of built class graphs.
+
+    Entries are stored under ``<directory>/<schema digest>/<options digest>``.
+    The schema digest covers the root schema and any in-memory documents;
+    the options digest covers the build options, including the directory
+    that relative `file:` references resolve against. Files retrieved
+    through `file:` references while building are recorded alongside the
+    entry with their content hash, and an entry whose files have changed
+    is treated as a miss. Documents from anywhere else cannot be checked,
+    so builds that use them are not stored.
+
+    Schemas that passed meta-schema validation are recorded as empty marker
+    files under ``<directory>/validated``, so that builders created with
+    ``validate_schema="cache"`` can skip the check in later processes.
+
+    Writes go to a temporary file that is atomically renamed into place, so
+    several processes may populate the same cache concurrently.
+
+    Entries are pickles, so the directory must only be writable by
+    trusted users. Pickling is recursive, so builds of schemas nested
+    deeper than about the interpreter's recursion limit are not stored;
+    the build itself still succeeds.
+
+    Args:
+        directory: (str) Where to store cache entries. Created if needed.
+    """
+
+    def __init__(self, directory):
+        self.directory = os.path.abspath(directory)
+
+    def _entry_path(self, digest, options):
+        from python_jsonschema_objects import __version__
+
+        options_digest = util.schema_digest(
+            sorted(options.items()), CACHE_FORMAT, __version__, sys.version
+        )
+        return os.path.join(self.directory, digest, options_digest + ".pickle")
+
+    def load(self, digest, options):
+        """Return the cached ``(classes, resolved)`` pair, or None on a miss.
+
+        Args:
+            digest: (str) The schema digest of the builder
+            options: (dict) The options the classes were built with
+        """
+        path = self._entry_path(digest, options)
+        try:
+            with open(path, "rb") as fin:
+                dependencies = pickle.load(fin)
+                for dep_path, dep_digest in dependencies.items():
+                    if _file_digest(dep_path) != dep_digest:
+                        logger.debug(util.lazy_format("Cache entry {0} is stale", path))
+                        return None
+                classes, resolved = load_class_graph(fin)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Ignoring unreadable cache entry %s: %s", path, e)
+            return None
+
+        logger.debug(util.lazy_format("Loaded classes from {0}", path))
+        return classes, resolved
+
+    def store(self, digest, options, classes, resolved, dependencies=()):
+        """Store a built class graph.
+
+        Args:
+            digest: (str) The schema digest of the builder
+            options: (dict) The options the classes were built with
+            classes: (dict) The generated namespace
+            resolved: (dict) The URI to class mapping from the build
+            dependencies: (iterable) Paths of files the build read
+        """
+        path = self._entry_path(digest, options)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fout:
+                pickle.dump(
+                    {dep: _file_digest(dep) for dep in dependencies},
+                    fout,
+                    pickle.HIGHEST_PROTOCOL,
+                )
+                dump_class_graph(({k: classes[k] for k in classes}, resolved), fout)
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.warning("Unable to cache classes in %s: %s", path, e)
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+
+    def _validated_path(self, digest):
+        return os.path.join(self.directory, "validated", digest)
+
+    def is_validated(self, digest):
+        """Return True if a schema with `digest` was marked as validated."""
+        return os.path.exists(self._validated_path(digest))
+
+    def mark_validated(self, digest):
+        """Record that the schema with `digest` passed validation."""
+        path = self._validated_path(digest)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a"):
+                pass
+        except OSError as e:
+            logger.warning("Unable to record validation in %s: %s", path, e)
+
+    def invalidate(self, digest=None):
+        """Remove the entries for one schema digest, or every entry."""
+        target = (
+            self.directory if digest is None else os.path.join(self.directory, digest)
+        )
+        shutil.rmtree(target, ignore_errors=True)
@@ -1,3 +1,4 @@
+import collections
 import collections.abc
 import typing
 import copy
@@ -5,8 +6,8 @@ import itertools
 import logging
 import sys
 
-import jsonschema.exceptions
-import referencing._core
+if typing.TYPE_CHECKING:
+    import referencing
 
 from python_jsonschema_objects import (
     pattern_properties,
@@ -192,6 +193,8 @@ class ProtocolBase(collections.abc.MutableMapping):
                     try:
                         default_value = self.__propinfo__[name]["const"]
                     except KeyError:
+                        import jsonschema.exceptions
+
                         raise jsonschema.exceptions.SchemaError(
                             "Schema parsing error. Expected {0} to have default or const value".format(
                                 name
@@ -455,25 +458,218 @@ class TypeProxy(object):
 class ClassBuilderOptions(typing.TypedDict):
     strict: bool
     any_of: str
+    dedupe: bool
+    flatten: bool
 
 
 class ClassBuilder(object):
     def __init__(
-        self, resolver: referencing._core.Resolver, options: ClassBuilderOptions
+        self,
+        resolver: "referencing.Resolver",
+        options: ClassBuilderOptions,
+        profiler=None,
+        pool=None,
     ):
         self.resolver = resolver
         self.resolved = {}
+        # Document URIs mapped to the URI classes from them are keyed under
+        self.aliases = {}
         self.under_construction = set()
         self.options = options
+        self.profiler = profiler
+        self.pool = pool
+        self._document_digests = {}
+        # The URIs each URI referred to while it was built, and the URIs
+        # currently being built, innermost last
+        self.dependencies = collections.defaultdict(set)
+        self.constructing = []
+        # The absolute URIs named by a $ref, as opposed to sub-schemas of
+        # other documents
+        self.direct_refs = set()
+        # With the dedupe option, the URI of the first anonymous sub-schema
+        # built for each shape, and the shape keys of the schema nodes seen
+        self.shapes = {}
+        self._shape_keys = {}
+        self.stats = collections.Counter()
+        # Classes built by _build_object
+        self._built_ids = set()
+        # TypeRefs handed out for cyclic references
+        self._type_refs = []
+
+    def for_resolver(self, resolver):
+        """Return a builder for documents reached through another resolver.
+
+        The new builder shares this one's state (resolved classes, classes
+        under construction, dependencies and statistics), so every document
+        in a build is constructed once, into a single table keyed by
+        absolute URI.
+        """
+        builder = copy.copy(self)
+        builder.resolver = resolver
+        return builder
+
+    def release(self):
+        """Detach the built classes from this builder.
+
+        TypeRefs look their class up in the table of every URI resolved
+        during the build, which would keep all of those classes alive for
+        as long as any class holding a TypeRef. Bind them to their classes
+        instead and forget the builder's state.
+        """
+        for ref in self._type_refs:
+            if ref.ref_class is not None:
+                ref._resolved = None
+        self._type_refs = []
+        self.resolved = {}
+        self.dependencies = collections.defaultdict(set)
+        self.direct_refs = set()
+        self.shapes = {}
+        self._shape_keys = {}
+        self._built_ids = set()
+        self._document_digests = {}
+
+    def link(self):
+        """Replace the TypeRefs handed out during the build with their classes.
+
+        Cyclic references are built with TypeRefs, which look their class
+        up whenever they are used. Once the build is complete the classes
+        all exist, so the descriptors, array validators and proxies holding
+        a TypeRef (and URIs resolved to one) can refer to the class
+        directly. TypeRefs to classes that were never built are kept.
+
+        Returns:
+            The number of references replaced
+        """
+        if not self._type_refs:
+            return 0
+        from . import descriptors
+
+        replaced = 0
+
+        def target(value):
+            nonlocal replaced
+            cls = value
+            while isinstance(cls, TypeRef) and cls.ref_class is not None:
+                cls = cls.ref_class
+            if isinstance(cls, TypeRef):
+                return value
+            if cls is not value:
+                replaced += 1
+            return cls
+
+        def linked(value):
+            # Values without TypeRefs are returned as they are, so that
+            # frozen classes reached from this build are left alone.
+            if isinstance(value, (list, tuple)):
+                targets = [target(v) for v in value]
+                if all(t is v for t, v in zip(targets, value)):
+                    return value
+                if isinstance(value, tuple):
+                    return tuple(targets)
+                value[:] = targets
+                return value
+            return target(value)
+
+        for uri, value in self.resolved.items():
+            if isinstance(value, TypeRef):
+                self.resolved[uri] = target(value)
+
+        seen = set()
+        stack = list(self.resolved.values())
+        while stack:
+            obj = stack.pop()
+            if id(obj) in seen:
+                continue
+            seen.add(id(obj))
+
+            # Plain MRO checks: ProtocolBase and ArrayWrapper are ABCs, whose
+            # negative subclass checks walk every class ever generated.
+            mro = obj.__mro__ if isinstance(obj, type) else ()
+            if isinstance(obj, TypeProxy):
+                obj._types = linked(obj._types)
+                stack.extend(obj._types)
+            elif wrapper_types.ArrayWrapper in mro:
+                if "__itemtype__" in obj.__dict__:
+                    obj.__itemtype__ = linked(obj.__itemtype__)
+                    item_types = obj.__itemtype__
+                    if isinstance(item_types, (list, tuple)):
+                        stack.extend(item_types)
+                    else:
+                        stack.append(item_types)
+            elif ProtocolBase in mro:
+                for attr in list(obj.__dict__.values()):
+                    if not isinstance(attr, descriptors.AttributeDescriptor):
+                        continue
+                    info = attr.info
+                    typ = linked(info["type"])
+                    if typ is not info["type"]:
+                        info["type"] = typ
+                    if isinstance(info["type"], (list, tuple)):
+                        stack.extend(info["type"])
+                    else:
+                        stack.append(info["type"])
+                    if "validator" in info:
+                        stack.append(info["validator"])
+                for detail in obj.__dict__.get("__propinfo__", {}).values():
+                    if isinstance(detail, dict) and "type" in detail:
+                        typ = linked(detail["type"])
+                        if typ is not detail["type"]:
+                            detail["type"] = typ
+        return replaced
+
+    def canonical_uri(self, uri):
+        """Return the URI that classes for an absolute `uri` are keyed by."""
+        document, sep, fragment = uri.partition("#")
+        if document in self.aliases:
+            return self.aliases[document] + sep + fragment
+        return uri
+
+    def _record_dependency(self, uri):
+        if self.constructing:
+            self.dependencies[self.constructing[-1]].add(uri)
+
+    @staticmethod
+    def _run(steps):
+        """Run a construction generator to completion, and return its value.
+
+        Construction follows the nesting of the schema, which can be deeper
+        than Python's recursion limit. So rather than calling each other,
+        the construction methods are generators that yield the generator
+        for any construction they need done (and receive its result), and
+        this runs them all from one explicit stack.
+        """
+        stack = [steps]
+        value = error = None
+        while stack:
+            try:
+                if error is None:
+                    request = stack[-1].send(value)
+                else:
+                    request = stack[-1].throw(error)
+            except StopIteration as stop:
+                stack.pop()
+                value, error = stop.value, None
+            except BaseException as exc:
+                stack.pop()
+                if not stack:
+                    raise
+                value, error = None, exc
+            else:
+                stack.append(request)
+                value = error = None
+        return value
 
     def expand_references(self, source_uri, iterable):
         """Give an iterable of jsonschema descriptors, expands any
         of them that are $ref objects, and otherwise leaves them alone.
         """
+        return self._run(self._expand_references_steps(source_uri, iterable))
+
+    def _expand_references_steps(self, source_uri, iterable):
         pp = []
         for elem in iterable:
             if "$ref" in elem:
-                pp.append(self.resolve_type(elem["$ref"], source_uri))
+                pp.append((yield self._resolve_type_steps(elem["$ref"], source_uri)))
             else:
                 pp.append(elem)
 
@@ -481,7 +677,16 @@ class ClassBuilder(object):
 
     def resolve_type(self, ref, source):
         """Return a resolved type for a URI, potentially constructing one if necessary"""
-        uri = util.resolve_ref_uri(self.resolver._base_uri, ref)
+        return self._run(self._resolve_type_steps(ref, source))
+
+    def _resolve_type_steps(self, ref, source):
+        absolute = util.resolve_ref_uri(self.resolver._base_uri, ref)
+        uri = self.canonical_uri(absolute)
+        self._record_dependency(uri)
+        if util.is_absolute_uri(uri):
+            self.direct_refs.add(uri)
+        if self.profiler is not None:
+            self.profiler.record_ref()
         if uri in self.resolved:
             return self.resolved[uri]
 
@@ -493,41 +698,121 @@ class ClassBuilder(object):
                     source,
                 )
             )
-            return TypeRef(uri, self.resolved)
+            ref = TypeRef(uri, self.resolved)
+            self._type_refs.append(ref)
+            return ref
         else:
             logger.debug(
                 util.lazy_format(
                     "Resolving direct reference object {0} -> {1}", source, uri
                 )
             )
-            resolved = self.resolver.lookup(uri)
+            resolved = self.resolver.lookup(absolute)
+            builder = self
             if resolved.resolver != self.resolver:
-                sub_cb = ClassBuilder(resolved.resolver, self.options)
-                self.resolved[uri] = sub_cb.construct(
-                    uri, resolved.contents, (ProtocolBase,)
-                )
-            else:
-                self.resolved[uri] = self.construct(
-                    uri, resolved.contents, (ProtocolBase,)
-                )
+                builder = self.for_resolver(resolved.resolver)
+            if self.pool is not None and util.is_absolute_uri(uri):
+                return (yield builder._construct_pooled(uri, resolved))
+            self.resolved[uri] = yield builder._construct_steps(
+                uri, resolved.contents, (ProtocolBase,)
+            )
 
             return self.resolved[uri]
 
+    def _construct_pooled(self, uri, resolved):
+        """Take the classes for `uri` from the pool, or build and pool them."""
+        document = uri.partition("#")[0]
+        digest = self._document_digests.get(document)
+        if digest is None:
+            digest = util.schema_digest(self.resolver.lookup(document).contents)
+            self._document_digests[document] = digest
+        key = (uri, digest, tuple(sorted(self.options.items())))
+
+        pooled = self.pool.get(key)
+        if pooled is None:
+            self.resolved[uri] = yield self._construct_steps(
+                uri, resolved.contents, (ProtocolBase,)
+            )
+            # Pool the classes of the external documents this one needed,
+            # so that a builder using the pooled class can look them up too.
+            related = [uri]
+            seen = {uri}
+            while related:
+                for ref in self.dependencies.get(related.pop(), ()):
+                    if ref not in seen and util.is_absolute_uri(ref):
+                        seen.add(ref)
+                        related.append(ref)
+            pooled = self.pool.add(
+                key, {u: self.resolved[u] for u in seen if u in self.resolved}
+            )
+
+        for related_uri, klass in pooled.items():
+            self.resolved.setdefault(related_uri, klass)
+        return self.resolved[uri]
+
     def construct(
         self, uri: str, clsdata: typing.Mapping[str, any], parent=(ProtocolBase,)
     ):
         """Wrapper to debug things"""
+        return self._run(self._construct_steps(uri, clsdata, parent))
+
+    def _construct_steps(self, uri, clsdata, parent=(ProtocolBase,)):
         logger.debug(util.lazy_format("Constructing {0}", uri))
+        self._record_dependency(uri)
         if uri in self.resolved:
             logger.debug(util.lazy_format("Using existing {0}", uri))
             assert self.resolved[uri] is not None
             return self.resolved[uri]
-        else:
-            ret = self._construct(uri, clsdata, parent=parent)
+
+        self.constructing.append(uri)
+        if self.profiler is not None:
+            self.profiler.start(uri)
+        try:
+            ret = yield self._construct(uri, clsdata, parent=parent)
+        finally:
+            self.constructing.pop()
+            if self.profiler is not None:
+                self.profiler.stop()
         logger.debug(util.lazy_format("Constructed {0}", ret))
 
         return ret
 
+    def construct_inline(
+        self, uri: str, clsdata: typing.Mapping[str, any], parent=(ProtocolBase,)
+    ):
+        """Construct an anonymous (inline) sub-schema.
+
+        With the `dedupe` option, sub-schemas with the same shape and parents
+        share the class built for the first of them.
+        """
+        return self._run(self._construct_inline_steps(uri, clsdata, parent))
+
+    def _construct_inline_steps(self, uri, clsdata, parent=(ProtocolBase,)):
+        if not self.options.get("dedupe") or uri in self.resolved:
+            return (yield self._construct_steps(uri, clsdata, parent))
+
+        # Relative references in the shape depend on the document it is in.
+        # Only the name _build_object gave this property is left out, a
+        # nested property may well be called raw_name.
+        shape = {k: v for k, v in clsdata.items() if k != "raw_name"}
+        key = (
+            self.resolver._base_uri,
+            util.shape_key(shape, self._shape_keys),
+            tuple(parent),
+        )
+        canonical = self.shapes.get(key)
+        if canonical is None:
+            klass = yield self._construct_steps(uri, clsdata, parent)
+            self.shapes[key] = uri
+            return klass
+
+        logger.debug(util.lazy_format("Reusing {0} for {1}", canonical, uri))
+        self._record_dependency(uri)
+        self.dependencies[uri].add(canonical)
+        self.resolved[uri] = self.resolved[canonical]
+        self.stats["classes_saved"] += 1
+        return self.resolved[uri]
+
     def _construct(
         self, uri: str, clsdata: typing.Mapping[str, any], parent=(ProtocolBase,)
     ):
@@ -537,11 +822,12 @@ class ClassBuilder(object):
                     "anyOf is not supported as bare property (workarounds available by setting any_of flag)"
                 )
             if self.options["any_of"] == "use-first":
-                # Patch so the first anyOf becomes a single oneOf
+                # Patch (a copy of the schema) so the first anyOf becomes a
+                # single oneOf
+                clsdata = dict(clsdata)
                 clsdata["oneOf"] = [
-                    clsdata["anyOf"].pop(0),
+                    clsdata.pop("anyOf")[0],
                 ]
-                del clsdata["anyOf"]
             else:
                 raise NotImplementedError(
                     f"anyOf workaround is not a recognized type (any_of = {self.options['any_of']})"
@@ -551,7 +837,7 @@ class ClassBuilder(object):
             """If this object itself has a 'oneOf' designation,
             then construct a TypeProxy.
             """
-            klasses = self.construct_objects(clsdata["oneOf"], uri)
+            klasses = yield self._construct_objects_steps(clsdata["oneOf"], uri)
 
             logger.debug(
                 util.lazy_format("Designating {0} as TypeProxy for {1}", uri, klasses)
@@ -560,8 +846,11 @@ class ClassBuilder(object):
             return self.resolved[uri]
 
         elif "allOf" in clsdata:
-            potential_parents = self.expand_references(uri, clsdata["allOf"])
+            potential_parents = yield self._expand_references_steps(
+                uri, clsdata["allOf"]
+            )
             parents = []
+            clsdata = dict(clsdata)
             for p in potential_parents:
                 if isinstance(p, dict):
                     # This is additional constraints
@@ -569,7 +858,7 @@ class ClassBuilder(object):
                 elif util.safe_issubclass(p, ProtocolBase):
                     parents.append(p)
 
-            self.resolved[uri] = self._build_object(uri, clsdata, parents)
+            self.resolved[uri] = yield self._build_object(uri, clsdata, parents)
             return self.resolved[uri]
 
         elif "$ref" in clsdata:
@@ -592,7 +881,7 @@ class ClassBuilder(object):
                 )
             else:
                 ref = clsdata["$ref"]
-                typ = self.resolve_type(ref, uri)
+                typ = yield self._resolve_type_steps(ref, uri)
                 self.resolved[uri] = typ
 
             return self.resolved[uri]
@@ -600,9 +889,31 @@ class ClassBuilder(object):
         elif clsdata.get("type") == "array" and "items" in clsdata:
             clsdata_copy = {}
             clsdata_copy.update(clsdata)
+            items = clsdata_copy.pop("items")
+            # Build the classes ArrayWrapper.create would build for the items
+            # here, so that nested arrays don't nest constructions.
+            if isinstance(items, dict) and "$ref" in items:
+                items = yield self._resolve_type_steps(items["$ref"], uri)
+            elif (
+                isinstance(items, dict)
+                and items.get("type") == "object"
+                and "oneOf" not in items
+            ):
+                items = yield self._construct_steps(
+                    "{0}_{1}".format(uri, "<anonymous_list_type>"), items
+                )
+            elif (
+                isinstance(items, dict)
+                and items.get("type") == "array"
+                and "items" in items
+            ):
+                # The item array is not listed among the classes of the build
+                sub_uri = uri + "#sub"
+                items = yield self._construct_steps(sub_uri, items)
+                del self.resolved[sub_uri]
             self.resolved[uri] = wrapper_types.ArrayWrapper.create(
                 uri,
-                item_constraint=clsdata_copy.pop("items"),
+                item_constraint=items,
                 classbuilder=self,
                 **clsdata_copy,
             )
@@ -623,7 +934,7 @@ class ClassBuilder(object):
             or clsdata.get("properties", None) is not None
             or clsdata.get("additionalProperties", False)
         ):
-            self.resolved[uri] = self._build_object(uri, clsdata, parent)
+            self.resolved[uri] = yield self._build_object(uri, clsdata, parent)
             return self.resolved[uri]
         elif clsdata.get("type") in ("integer", "number", "string", "boolean", "null"):
             self.resolved[uri] = self._build_literal(uri, clsdata)
@@ -685,19 +996,47 @@ class ClassBuilder(object):
         props = {}
         defaults = set()
 
-        properties = {}
-        for p in parents:
-            properties = util.propmerge(properties, p.__propinfo__)
-
+        sources = [p.__propinfo__ for p in parents]
         if "properties" in clsdata:
-            properties = util.propmerge(properties, clsdata["properties"])
-
-        name_translation = {}
+            sources.append(clsdata["properties"])
+        properties = util.merge_properties(*sources)
+
+        # A parent built here has already handled its own properties: those
+        # that nothing else changes keep the parent's details, and the class
+        # inherits the parent's descriptors for them. If the first parent was
+        # built here, only the properties of the other sources need a look.
+        built = [p for p in parents if id(p) in self._built_ids]
+        if parents and built and built[0] is parents[0]:
+            base = parents[0].__propinfo__
+            pending = {}
+            for source in sources[1:]:
+                pending.update(dict.fromkeys(source))
+            name_translation = dict(parents[0].__prop_names__)
+            defaults.update(parents[0].__has_default__)
+        else:
+            base = {}
+            pending = properties
+            name_translation = {}
+        inherited = {
+            id(detail)
+            for p in built
+            if p is not parents[0]
+            for detail in p.__propinfo__.values()
+        }
+
+        for prop in pending:
+            detail = properties[prop]
+            name_translation[prop] = prop.replace("@", "")
+            if base.get(prop) is detail:
+                continue
+            if id(detail) in inherited:
+                if "default" in detail or "const" in detail:
+                    defaults.add(name_translation[prop])
+                continue
 
-        for prop, detail in properties.items():
             logger.debug(util.lazy_format("Handling property {0}.{1}", nm, prop))
+            detail = properties[prop] = dict(detail)
             properties[prop]["raw_name"] = prop
-            name_translation[prop] = prop.replace("@", "")
             prop = name_translation[prop]
 
             # Set default value, even if None
@@ -725,7 +1064,9 @@ class ClassBuilder(object):
 
             if detail.get("type", None) == "object":
                 uri = "{0}/{1}_{2}".format(nm, prop, "<anonymous>")
-                self.resolved[uri] = self.construct(uri, detail, (ProtocolBase,))
+                self.resolved[uri] = yield self._construct_inline_steps(
+                    uri, detail, (ProtocolBase,)
+                )
 
                 props[prop] = make_property(
                     prop, {"type": self.resolved[uri]}, self.resolved[uri].__doc__
@@ -734,14 +1075,14 @@ class ClassBuilder(object):
 
             elif "type" not in detail and "$ref" in detail:
                 ref = detail["$ref"]
-                typ = self.resolve_type(ref, ".".join([nm, prop]))
+                typ = yield self._resolve_type_steps(ref, ".".join([nm, prop]))
 
                 props[prop] = make_property(prop, {"type": typ}, typ.__doc__)
                 properties[prop]["$ref"] = ref
                 properties[prop]["type"] = typ
 
             elif "oneOf" in detail:
-                potential = self.expand_references(nm, detail["oneOf"])
+                potential = yield self._expand_references_steps(nm, detail["oneOf"])
                 logger.debug(
                     util.lazy_format("Designating {0} as oneOf {1}", prop, potential)
                 )
@@ -751,7 +1092,9 @@ class ClassBuilder(object):
             elif "type" in detail and detail["type"] == "array":
                 if "items" in detail and isinstance(detail["items"], dict):
                     if "$ref" in detail["items"]:
-                        typ = self.resolve_type(detail["items"]["$ref"], nm)
+                        typ = yield self._resolve_type_steps(
+                            detail["items"]["$ref"], nm
+                        )
                         constraints = copy.copy(detail)
                         constraints["strict"] = self.options.get("strict")
                         propdata = {
@@ -767,12 +1110,16 @@ class ClassBuilder(object):
                             # NOTE: Currently anyOf workaround is applied on import, not here for serialization
                             if "oneOf" in detail["items"]:
                                 typ = TypeProxy(
-                                    self.construct_objects(
-                                        detail["items"]["oneOf"], uri
+                                    (
+                                        yield self._construct_objects_steps(
+                                            detail["items"]["oneOf"], uri
+                                        )
                                     )
                                 )
                             else:
-                                typ = self.construct(uri, detail["items"])
+                                typ = yield self._construct_inline_steps(
+                                    uri, detail["items"]
+                                )
 
                             constraints = copy.copy(detail)
                             constraints["strict"] = self.options.get("strict")
@@ -799,7 +1146,7 @@ class ClassBuilder(object):
                     typs = []
                     for i, elem in enumerate(detail["items"]):
                         uri = "{0}/{1}/<anonymous_{2}>".format(nm, prop, i)
-                        typ = self.construct(uri, elem)
+                        typ = yield self._construct_inline_steps(uri, elem)
                         typs.append(typ)
 
                     props[prop] = make_property(prop, {"type": typs})
@@ -807,7 +1154,7 @@ class ClassBuilder(object):
             else:
                 desc = detail["description"] if "description" in detail else ""
                 uri = "{0}/{1}".format(nm, prop)
-                typ = self.construct(uri, detail)
+                typ = yield self._construct_inline_steps(uri, detail)
 
                 props[prop] = make_property(prop, {"type": typ}, desc)
 
@@ -818,7 +1165,7 @@ class ClassBuilder(object):
         props["__prop_names__"] = name_translation
 
         props["__propinfo__"] = properties
-        required = set.union(*[p.__required__ for p in parents])
+        required = set.union(*[set(p.__required__) for p in parents])
 
         if "required" in clsdata:
             for prop in clsdata["required"]:
@@ -837,20 +1184,59 @@ class ClassBuilder(object):
             props["__strict__"] = True
 
         props["__title__"] = clsdata.get("title")
-        cls = type(str(nm.split("/")[-1]), tuple(parents), props)
+        bases = tuple(parents)
+        if self.options.get("flatten") and bases != (ProtocolBase,):
+            bases = self._flatten(props, parents)
+        cls = type(str(nm.rsplit("/", 1)[-1]), bases, props)
+        util.register_ancestors(cls)
+        self._built_ids.add(id(cls))
         self.under_construction.remove(nm)
 
         return cls
 
+    @staticmethod
+    def _flatten(props, parents):
+        """Give a class the descriptors it would inherit from `parents`.
+
+        The class then derives from ProtocolBase alone, so that attribute
+        lookups don't walk a deep hierarchy; the generated classes it would
+        have derived from are listed in its `__ancestors__`, and it is
+        registered as a virtual subclass of each of them.
+
+        Returns:
+            The bases of the flattened class
+        """
+        from . import descriptors
+
+        ancestors = []
+        for parent in parents:
+            for klass in parent.__mro__:
+                if klass is ProtocolBase:
+                    break
+                for name, attr in vars(klass).items():
+                    if isinstance(attr, descriptors.AttributeDescriptor):
+                        props.setdefault(name, attr)
+                ancestors.append(klass)
+                ancestors.extend(vars(klass).get("__ancestors__", ()))
+        props["__ancestors__"] = tuple(
+            {id(klass): klass for klass in ancestors}.values()
+        )
+        return (ProtocolBase,)
+
     def construct_objects(self, oneOfList, uri):
-        return [
-            (
-                self.construct(uri + "_%s" % i, item_detail)
-                if "$ref" not in item_detail
-                else self.resolve_type(item_detail["$ref"], uri + "_%s" % i)
-            )
-            for i, item_detail in enumerate(oneOfList)
-        ]
+        return self._run(self._construct_objects_steps(oneOfList, uri))
+
+    def _construct_objects_steps(self, oneOfList, uri):
+        klasses = []
+        for i, item_detail in enumerate(oneOfList):
+            if "$ref" not in item_detail:
+                klass = yield self._construct_inline_steps(uri + "_%s" % i, item_detail)
+            else:
+                klass = yield self._resolve_type_steps(
+                    item_detail["$ref"], uri + "_%s" % i
+                )
+            klasses.append(klass)
+        return klasses
 
 
 def make_property(prop, info, desc=""):
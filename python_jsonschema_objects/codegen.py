@@ -0,0 +1,289 @@
+"""Ahead-of-time generation of schema classes as Python source.
+
+The generated module recreates the classes that the ClassBuilder would have
+built at runtime, with the same descriptors, property metadata and
+validators. Importing it does not require parsing or resolving the schema.
+"""
+
+__all__ = ["generate_module"]
+
+import builtins
+import collections
+import keyword
+import re
+import types
+
+from python_jsonschema_objects import util
+
+HEADER = '''"""Classes generated by python_jsonschema_objects from {title!r}.
+
+Do not edit this file; regenerate it from the schema instead.
+"""
+'''
+
+_RESERVED = {"re", "resolved", "namespace"}
+_PRIMITIVES = (type(None), bool, int, float, str)
+_CONTAINERS = (dict, list, tuple, set, frozenset)
+
+
+def _is_namedtuple(obj):
+    return isinstance(obj, tuple) and hasattr(type(obj), "_fields")
+
+
+def _is_static(obj):
+    """Return True for objects that the module can import rather than define."""
+    if isinstance(obj, type):
+        return not util.is_generated_class(obj)
+    return isinstance(obj, (types.FunctionType, types.BuiltinFunctionType))
+
+
+def _is_plain_attr(name):
+    return name.isidentifier() and not (
+        name.startswith("__") and not name.endswith("__")
+    )
+
+
+class _ModuleWriter(object):
+    """Turns a graph of generated classes into module source.
+
+    Generated classes and the helper objects hanging off them (descriptors,
+    TypeProxy, TypeRef, ...) may refer to each other in cycles, so the
+    module is written in phases: class statements and empty instances
+    first, then containers shared between several objects, and finally the
+    attributes that link everything together.
+    """
+
+    def __init__(self):
+        self.names = {}
+        self.keepalive = []
+        self.classes = []
+        self.instances = []
+        self.shared = []
+        self.imports = set()
+        self._used_names = set(_RESERVED)
+        self._uses_names = False
+
+    def _identifier(self, name):
+        ident = re.sub(r"\W", "_", name) or "_"
+        if ident[0].isdigit() or keyword.iskeyword(ident):
+            ident = "_" + ident
+        candidate, n = ident, 1
+        while candidate in self._used_names:
+            n += 1
+            candidate = "{0}_{1}".format(ident, n)
+        self._used_names.add(candidate)
+        return candidate
+
+    def _children(self, obj):
+        if isinstance(obj, dict):
+            return list(obj.keys()) + list(obj.values())
+        if isinstance(obj, _CONTAINERS):
+            return list(obj)
+        if isinstance(obj, type) and util.is_generated_class(obj):
+            return list(obj.__bases__) + list(self._class_attrs(obj).values())
+        if isinstance(obj, (_PRIMITIVES, re.Pattern)) or _is_static(obj):
+            return []
+        return list(vars(obj).values())
+
+    @staticmethod
+    def _class_attrs(cls):
+        state = util.class_state(cls)
+        state.pop("__module__", None)
+        if state.get("__doc__") is None:
+            state.pop("__doc__", None)
+        return state
+
+    def scan(self, roots, named=()):
+        """Find every object reachable from `roots` and assign names.
+
+        Containers in `named` are always written as module-level variables,
+        under the given names.
+        """
+        named = dict(named)
+        counts = collections.Counter()
+        visited = set()
+        stack = list(roots)
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, _CONTAINERS) and not _is_namedtuple(obj):
+                counts[id(obj)] += 1
+            if id(obj) in visited:
+                continue
+            visited.add(id(obj))
+            self.keepalive.append(obj)
+
+            if isinstance(obj, type) and util.is_generated_class(obj):
+                self.classes.append(obj)
+            elif not isinstance(
+                obj, _PRIMITIVES + _CONTAINERS + (re.Pattern,)
+            ) and not _is_static(obj):
+                self.instances.append(obj)
+            stack.extend(self._children(obj))
+
+        self.classes.sort(key=lambda c: len(c.__mro__))
+        for cls in self.classes:
+            self.names[id(cls)] = self._identifier(cls.__name__)
+        for obj in self.instances:
+            self.names[id(obj)] = self._identifier("_" + type(obj).__name__.lower())
+
+        shared = {
+            id(obj): obj
+            for obj in self.keepalive
+            if id(obj) in named or (counts[id(obj)] > 1 and id(obj) not in self.names)
+        }
+        for obj in shared.values():
+            self.names[id(obj)] = named.get(id(obj)) or self._identifier(
+                "_" + type(obj).__name__
+            )
+
+        # Shared containers must be written after the ones they contain.
+        done = set()
+        for root in shared.values():
+            stack = [(root, False)]
+            while stack:
+                obj, expanded = stack.pop()
+                if id(obj) in done:
+                    continue
+                if expanded:
+                    done.add(id(obj))
+                    if id(obj) in shared:
+                        self.shared.append(obj)
+                    continue
+                stack.append((obj, True))
+                if isinstance(obj, _CONTAINERS):
+                    stack.extend((c, False) for c in self._children(obj))
+
+    def _static_ref(self, obj):
+        if obj is type(None):
+            return "type(None)"
+        module, qualname = obj.__module__, obj.__qualname__
+        if module == "builtins":
+            if getattr(builtins, qualname, None) is not obj:
+                raise TypeError("Cannot reference {0!r} from source".format(obj))
+            return qualname
+        self.imports.add(module)
+        return "{0}.{1}".format(module, qualname)
+
+    def render(self, obj, top=False):
+        """Return a source expression for `obj`."""
+        if not top and id(obj) in self.names:
+            self._uses_names = True
+            return self.names[id(obj)]
+
+        if obj is None or isinstance(obj, (bool, int, str)):
+            return repr(obj)
+        if isinstance(obj, float):
+            if obj != obj or obj in (float("inf"), float("-inf")):
+                return "float({0!r})".format(repr(obj))
+            return repr(obj)
+        if _is_namedtuple(obj):
+            return "{0}({1})".format(
+                self._static_ref(type(obj)), ", ".join(self.render(v) for v in obj)
+            )
+        if isinstance(obj, dict):
+            return "{{{0}}}".format(
+                ", ".join(
+                    "{0}: {1}".format(self.render(k), self.render(v))
+                    for k, v in obj.items()
+                )
+            )
+        if isinstance(obj, list):
+            return "[{0}]".format(", ".join(self.render(v) for v in obj))
+        if isinstance(obj, tuple):
+            items = [self.render(v) for v in obj]
+            return "({0}{1})".format(", ".join(items), "," if len(items) == 1 else "")
+        if isinstance(obj, (set, frozenset)):
+            items = sorted(self.render(v) for v in obj)
+            body = "{{{0}}}".format(", ".join(items)) if items else ""
+            if isinstance(obj, frozenset) or not items:
+                return "{0}({1})".format(type(obj).__name__, body)
+            return body
+        if isinstance(obj, re.Pattern):
+            return "re.compile({0!r}, {1!r})".format(obj.pattern, obj.flags)
+        if _is_static(obj):
+            return self._static_ref(obj)
+
+        raise TypeError("Cannot generate source for {0!r}".format(obj))
+
+    def _render_tracked(self, obj, top=False):
+        self._uses_names = False
+        source = self.render(obj, top=top)
+        return source, self._uses_names
+
+    def write(self, resolved, classes, title):
+        self.scan([resolved, classes], named={id(resolved): "resolved"})
+
+        body = []
+        links = []
+        for cls in self.classes:
+            name = self.names[id(cls)]
+            bases = ", ".join(self.render(b) for b in cls.__bases__)
+            lines = []
+            for attr, value in self._class_attrs(cls).items():
+                source, linked = self._render_tracked(value)
+                if not _is_plain_attr(attr):
+                    links.append("setattr({0}, {1!r}, {2})".format(name, attr, source))
+                elif linked:
+                    links.append("{0}.{1} = {2}".format(name, attr, source))
+                else:
+                    lines.append("    {0} = {1}".format(attr, source))
+            body.append("")
+            body.append("")
+            body.append("class {0}({1}):".format(name, bases))
+            body.extend(lines or ["    pass"])
+            if name != cls.__name__:
+                links.append(
+                    "{0}.__name__ = {0}.__qualname__ = {1!r}".format(name, cls.__name__)
+                )
+
+        shells = [
+            "{0} = {1}.__new__({1})".format(self.names[id(obj)], self.render(type(obj)))
+            for obj in self.instances
+        ]
+        shared = [
+            "{0} = {1}".format(self.names[id(obj)], self.render(obj, top=True))
+            for obj in self.shared
+        ]
+        states = [
+            "{0}.__dict__.update({1})".format(
+                self.names[id(obj)], self.render(vars(obj), top=True)
+            )
+            for obj in self.instances
+        ]
+        footer = [
+            "python_jsonschema_objects.util.register_ancestors({0})".format(
+                self.names[id(cls)]
+            )
+            for cls in self.classes
+            if "__ancestors__" in vars(cls)
+        ]
+        footer.append(
+            "namespace = python_jsonschema_objects.util.Namespace({0})".format(
+                self.render(classes, top=True)
+            )
+        )
+        self.imports.add("python_jsonschema_objects.util")
+
+        out = [HEADER.format(title=title).rstrip("\n"), "", "import re"]
+        out.extend("import {0}".format(m) for m in sorted(self.imports))
+        out.extend(body)
+        for section in (shells, shared, links, states, footer):
+            out.append("")
+            out.extend(section)
+        return "\n".join(out) + "\n"
+
+
+def generate_module(resolved, classes, title="schema"):
+    """Return the source of a module recreating a set of built classes.
+
+    The module defines one class statement per generated class, plus
+    `resolved` (the URI to class mapping) and `namespace` (a Namespace
+    equivalent to the one returned by ObjectBuilder.build_classes).
+
+    Args:
+        resolved: (dict) URIs mapped to the classes built for them
+        classes: (Mapping) The namespace returned by build_classes
+        title: (str) A description of the source schema for the module
+            docstring
+    """
+    return _ModuleWriter().write(resolved, {k: classes[k] for k in classes}, title)
@@ -0,0 +1,130 @@
+"""The graph of references between the URIs in a schema."""
+
+__all__ = ["RefGraph"]
+
+import collections
+
+
+class RefGraph(object):
+    """A directed graph of the references found while building classes.
+
+    Nodes are URIs. There is an edge from one URI to another when the
+    first refers to the second, either through `$ref` or by containing it
+    as an inline (anonymous) sub-schema.
+
+    Args:
+        edges: (Mapping) URIs mapped to the URIs they refer to
+        nodes: (iterable) Additional URIs with no references
+    """
+
+    def __init__(self, edges, nodes=()):
+        self._edges = collections.defaultdict(set)
+        self._nodes = set(nodes)
+        for uri, refs in edges.items():
+            self._nodes.add(uri)
+            self._nodes.update(refs)
+            self._edges[uri].update(refs)
+
+    @property
+    def nodes(self):
+        return frozenset(self._nodes)
+
+    @property
+    def edges(self):
+        """All (source, target) pairs, sorted."""
+        return sorted((uri, ref) for uri, refs in self._edges.items() for ref in refs)
+
+    def __contains__(self, uri):
+        return uri in self._nodes
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def successors(self, uri):
+        """Return the URIs that `uri` refers to."""
+        return frozenset(self._edges.get(uri, ()))
+
+    def predecessors(self, uri):
+        """Return the URIs that refer to `uri`."""
+        return frozenset(source for source, refs in self._edges.items() if uri in refs)
+
+    def reachable(self, roots):
+        """Return every URI reachable from `roots`, including the roots."""
+        seen = set()
+        stack = list(roots)
+        while stack:
+            uri = stack.pop()
+            if uri in seen:
+                continue
+            seen.add(uri)
+            stack.extend(self._edges.get(uri, ()))
+        return seen
+
+    def strongly_connected_components(self):
+        """Return the strongly connected components of the graph.
+
+        Components are frozensets of URIs, listed so that every component
+        comes after the components it refers to.
+        """
+        # Tarjan's algorithm, with an explicit stack so that long
+        # reference chains don't hit the recursion limit.
+        index = {}
+        lowlink = {}
+        on_stack = set()
+        stack = []
+        components = []
+
+        for start in sorted(self._nodes):
+            if start in index:
+                continue
+            work = [(start, iter(sorted(self._edges.get(start, ()))))]
+            index[start] = lowlink[start] = len(index)
+            stack.append(start)
+            on_stack.add(start)
+            while work:
+                uri, refs = work[-1]
+                for ref in refs:
+                    if ref not in index:
+                        index[ref] = lowlink[ref] = len(index)
+                        stack.append(ref)
+                        on_stack.add(ref)
+                        work.append((ref, iter(sorted(self._edges.get(ref, ())))))
+                        break
+                    if ref in on_stack:
+                        lowlink[uri] = min(lowlink[uri], index[ref])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[uri])
+                    if lowlink[uri] == index[uri]:
+                        component = set()
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.add(member)
+                            if member == uri:
+                                break
+                        components.append(frozenset(component))
+        return components
+
+    def cycles(self):
+        """Return the components that contain a reference cycle.
+
+        These are the references that the ClassBuilder resolves through
+        TypeRef, because the classes involved refer to each other.
+        """
+        cycles = []
+        for component in self.strongly_connected_components():
+            uri = next(iter(component))
+            if len(component) > 1 or uri in self._edges.get(uri, ()):
+                cycles.append(component)
+        return cycles
+
+    def subgraph(self, uris):
+        """Return the graph restricted to `uris`."""
+        uris = set(uris)
+        return RefGraph(
+            {uri: self._edges[uri] & uris for uri in uris if uri in self._edges},
+            uris & self._nodes,
+        )
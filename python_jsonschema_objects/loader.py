@@ -0,0 +1,190 @@
+"""Build the classes for many schema files at once."""
+
+__all__ = ["SchemaLoader"]
+
+import glob
+import os
+
+import referencing.jsonschema
+from referencing import Registry, Resource
+
+import python_jsonschema_objects
+import python_jsonschema_objects.cache
+from python_jsonschema_objects import classbuilder, util
+
+DEFAULT_SPECIFICATION = "http://json-schema.org/draft-04/schema"
+
+# Keywords that don't make a document a schema of its own, so that files
+# holding nothing but definitions don't get a class.
+_CONTAINER_KEYWORDS = frozenset(
+    ["$schema", "$id", "id", "definitions", "title", "description", "$comment"]
+)
+
+
+class SchemaLoader(object):
+    """Builds the classes for a set of schema files in one pass.
+
+    Every file is registered in a single registry, under ``file:///`` and
+    its path relative to the directory (the URIs ObjectBuilder resolves
+    ``file:`` references with) and under its ``$id`` if that is absolute.
+    All the classes are then built by one ClassBuilder, so a schema that
+    many files refer to is built once and shared by all of them.
+
+    Args:
+        paths: (str or iterable) A directory to search for schema files,
+            or the schema files themselves
+        pattern: (str) The glob pattern for schema files in a directory
+        resolver: (referencing.typing.Retrieve) Retrieves the remote
+            documents the files refer to
+        specification_uri: (str) The specification of files that don't
+            declare a `$schema`
+    """
+
+    def __init__(
+        self, paths, pattern="**/*.json", resolver=None, specification_uri=None
+    ):
+        if isinstance(paths, str):
+            self.basedir = os.path.abspath(paths)
+            files = glob.glob(os.path.join(self.basedir, pattern), recursive=True)
+        else:
+            files = [os.path.abspath(path) for path in paths]
+            if not files:
+                raise ValueError("No schema files given")
+            self.basedir = os.path.commonpath([os.path.dirname(f) for f in files])
+
+        self._remote_resolver = resolver
+        self._specification = referencing.jsonschema.specification_with(
+            specification_uri or DEFAULT_SPECIFICATION
+        )
+        self._builder = None
+
+        # Relative paths mapped to the URI each file is registered under,
+        # and absolute ids mapped to the URI of their file
+        self.uris = {}
+        self.ids = {}
+        resources = []
+        for path in sorted(files):
+            name = os.path.relpath(path, self.basedir).replace(os.sep, "/")
+            uri = "file:///" + name
+            resource = Resource.from_contents(
+                python_jsonschema_objects.cache.documents.load(path),
+                self._specification,
+            )
+            self.uris[name] = uri
+            resources.append((uri, resource))
+
+            schema_id = (resource.id() or "").rstrip("#")
+            if util.is_absolute_uri(schema_id):
+                if schema_id in self.ids:
+                    raise ValueError(
+                        "{0} and {1} have the same id {2!r}".format(
+                            self.ids[schema_id], uri, schema_id
+                        )
+                    )
+                self.ids[schema_id] = uri
+                resources.append((schema_id, resource))
+
+        self.registry = Registry(retrieve=self._retrieve).with_resources(resources)
+
+    def _retrieve(self, uri):
+        if uri.startswith("file:"):
+            path = os.path.join(self.basedir, uri[8:])
+            return Resource.from_contents(
+                python_jsonschema_objects.cache.documents.load(path),
+                self._specification,
+            )
+        if self._remote_resolver is not None:
+            return self._remote_resolver(uri)
+        raise RuntimeError(
+            "No remote resource resolver provided. Cannot resolve {}".format(uri)
+        )
+
+    def build_classes(
+        self,
+        merge=False,
+        strict=False,
+        named_only=False,
+        standardize_names=True,
+        any_of=None,
+        dedupe=False,
+        flatten=False,
+    ):
+        """Build the classes for every file.
+
+        Args:
+            merge: (bool) Return a single namespace holding the classes of
+                every file, rather than a namespace per file
+            strict, named_only, standardize_names, any_of, dedupe, flatten:
+                As for ObjectBuilder.build_classes
+
+        Returns:
+            A Namespace, or a dict of relative paths to Namespaces. The
+            classes of a file are named after their title, or the last
+            part of their URI; an untitled root schema is named after its
+            file.
+        """
+        opts = {
+            "strict": strict,
+            "any_of": any_of,
+            "dedupe": dedupe,
+            "flatten": flatten,
+        }
+        builder = classbuilder.ClassBuilder(self.registry.resolver(), opts)
+        # Key the classes of files reached through their id by file URI too.
+        builder.aliases.update(self.ids)
+        for uri in self.uris.values():
+            resolved = builder.resolver.lookup(uri)
+            file_builder = builder.for_resolver(resolved.resolver)
+            for nm in resolved.contents.get("definitions", {}):
+                definition = uri + "#/definitions/" + nm
+                file_builder.construct(
+                    definition, resolved.resolver.lookup(definition).contents
+                )
+            if set(resolved.contents) - _CONTAINER_KEYWORDS:
+                file_builder.construct(uri, resolved.contents)
+        builder.link()
+        self._builder = builder
+
+        name_transform = python_jsonschema_objects.ObjectBuilder._name_transform(
+            standardize_names
+        )
+        namespaces = {}
+        for name, uri in self.uris.items():
+            classes = {}
+            for class_uri, klass in builder.resolved.items():
+                if class_uri != uri and not class_uri.startswith(
+                    (uri + "#", uri + "/")
+                ):
+                    continue
+                title = getattr(klass, "__title__", None)
+                if title is not None:
+                    classes[name_transform(title)] = klass
+                elif class_uri == uri:
+                    classes[name_transform(os.path.splitext(name)[0])] = klass
+                elif not named_only:
+                    classes[name_transform(class_uri.rsplit("/", 1)[-1])] = klass
+            namespaces[name] = classes
+
+        if merge:
+            merged = {}
+            for classes in namespaces.values():
+                merged.update(classes)
+            return util.Namespace.from_mapping(merged)
+        return {
+            name: util.Namespace.from_mapping(classes)
+            for name, classes in namespaces.items()
+        }
+
+    @property
+    def build_stats(self):
+        """Counts from the last build, as for ObjectBuilder.build_stats."""
+        builder = self._builder
+        if builder is None:
+            return None
+        return {
+            "uris": len(builder.resolved),
+            "classes": len(
+                {id(k) for k in builder.resolved.values() if isinstance(k, type)}
+            ),
+            "classes_saved": builder.stats["classes_saved"],
+        }
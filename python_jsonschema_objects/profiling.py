@@ -0,0 +1,115 @@
+"""Per-definition profiling of class construction."""
+
+__all__ = ["BuildProfiler", "DefinitionProfile"]
+
+import time
+
+
+class DefinitionProfile(object):
+    """Build statistics for a single URI.
+
+    Attributes:
+        uri: (str) The URI that was constructed
+        total_time: (float) Seconds spent constructing it, including the
+            classes it referenced that had not been built yet
+        self_time: (float) `total_time` minus the time spent constructing
+            other URIs
+        refs: (int) `$ref` resolutions performed while constructing it
+        retrievals: (int) Documents retrieved while constructing it
+        anonymous: (int) Anonymous classes created for its properties
+        depth: (int) How deeply construction was nested when it was built;
+            top level definitions have depth 1
+    """
+
+    FIELDS = (
+        "uri",
+        "total_time",
+        "self_time",
+        "refs",
+        "retrievals",
+        "anonymous",
+        "depth",
+    )
+
+    def __init__(self, uri, depth):
+        self.uri = uri
+        self.depth = depth
+        self.total_time = self.self_time = 0.0
+        self.refs = self.retrievals = self.anonymous = 0
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __repr__(self):
+        return "<DefinitionProfile {0} {1:.6f}s>".format(self.uri, self.total_time)
+
+
+class BuildProfiler(object):
+    """Collects a `DefinitionProfile` for every URI a ClassBuilder builds.
+
+    Pass an instance to ClassBuilder (or use
+    ``ObjectBuilder.build_classes(profile=True)``) and read the report once
+    the build finishes.
+    """
+
+    def __init__(self):
+        self.profiles = {}
+        self._stack = []
+
+    def start(self, uri):
+        """Record that construction of `uri` has started."""
+        profile = DefinitionProfile(uri, len(self._stack) + 1)
+        self.profiles[uri] = profile
+        if self._stack and "<anonymous" in uri:
+            self._stack[-1][0].anonymous += 1
+        self._stack.append((profile, time.perf_counter(), 0.0))
+
+    def stop(self):
+        """Record that the innermost construction has finished."""
+        profile, started, nested = self._stack.pop()
+        elapsed = time.perf_counter() - started
+        profile.total_time += elapsed
+        profile.self_time += elapsed - nested
+        if self._stack:
+            outer, outer_started, outer_nested = self._stack[-1]
+            self._stack[-1] = (outer, outer_started, outer_nested + elapsed)
+
+    def record_ref(self):
+        """Count a `$ref` resolution against the URI being constructed."""
+        if self._stack:
+            self._stack[-1][0].refs += 1
+
+    def record_retrieval(self):
+        """Count a document retrieval against the URI being constructed."""
+        if self._stack:
+            self._stack[-1][0].retrievals += 1
+
+    def report(self, sort="self_time", limit=None):
+        """Return the profiles as a list of dicts, largest first.
+
+        Args:
+            sort: (str) The DefinitionProfile field to sort by
+            limit: (int) If given, only return this many rows
+        """
+        if sort not in DefinitionProfile.FIELDS:
+            raise ValueError("Cannot sort by {0!r}".format(sort))
+        rows = sorted(
+            (p.as_dict() for p in self.profiles.values()),
+            key=lambda row: row[sort],
+            reverse=sort != "uri",
+        )
+        return rows[:limit]
+
+    def format_report(self, sort="self_time", limit=20):
+        """Return the report as a text table."""
+        lines = [
+            "{0:>10} {1:>10} {2:>5} {3:>5} {4:>5} {5:>5}  {6}".format(
+                "self (s)", "total (s)", "refs", "files", "anon", "depth", "uri"
+            )
+        ]
+        for row in self.report(sort, limit):
+            lines.append(
+                "{self_time:10.6f} {total_time:10.6f} {refs:5d} {retrievals:5d} "
+                "{anonymous:5d} {depth:5d}  {uri}".format(**row)
+            )
+        return "\n".join(lines)
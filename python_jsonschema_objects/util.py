@@ -1,9 +1,13 @@
 """Utility and namespace module."""
 
-__all__ = ["Namespace", "as_namespace"]
+__all__ = ["Namespace", "LazyNamespace", "as_namespace"]
 
 import copy
+import hashlib
 import json
+import re
+import sys
+import urllib.parse
 from collections.abc import Mapping, Sequence
 
 
@@ -34,6 +38,138 @@ def safe_issubclass(x, y):
         return False
 
 
+def is_generated_class(cls):
+    """Return True if `cls` was created at runtime rather than defined in a module.
+
+    Classes built by the ClassBuilder (and ArrayWrapper.create) are made with
+    type(), so they cannot be found again by importing their module and
+    looking up their name.
+    """
+    if not isinstance(cls, type):
+        return False
+    module = sys.modules.get(cls.__module__)
+    return getattr(module, cls.__qualname__, None) is not cls
+
+
+_CLASS_STATE_EXCLUDES = frozenset(
+    ("__dict__", "__weakref__", "__abstractmethods__", "_abc_impl")
+)
+
+
+def class_state(cls):
+    """Return the attributes defined directly on a generated class.
+
+    Interpreter-managed entries (the instance ``__dict__`` and ``__weakref__``
+    slots and the ABC bookkeeping) are left out, since they are recreated
+    when the class is.
+    """
+    return {k: v for k, v in vars(cls).items() if k not in _CLASS_STATE_EXCLUDES}
+
+
+def register_ancestors(cls):
+    """Make a flattened class a virtual subclass of the classes it replaces.
+
+    Classes built with the flatten option derive from ProtocolBase alone and
+    list the generated classes they stand in for in `__ancestors__`; each of
+    those is told to treat the class as a subclass.
+    """
+    for ancestor in vars(cls).get("__ancestors__", ()):
+        ancestor.register(cls)
+    return cls
+
+
+def _json_pieces(doc):
+    """Yield the text `schema_digest` hashes for `doc`, piece by piece.
+
+    Produces the same text as `json.dumps` with sorted keys, compact
+    separators and `repr` for anything that is not JSON, but with an
+    explicit stack, for documents nested too deeply for `json.dumps`.
+    """
+    # ("value", node), ("text", text) or ("close", (text, id of container))
+    stack = [("value", doc)]
+    open_containers = set()
+    while stack:
+        kind, node = stack.pop()
+        if kind == "text":
+            yield node
+        elif kind == "close":
+            open_containers.discard(node[1])
+            yield node[0]
+        elif node is None or isinstance(node, (str, int, float)):
+            yield json.dumps(node)
+        elif isinstance(node, (dict, list, tuple)):
+            if id(node) in open_containers:
+                raise ValueError("Circular reference detected")
+            open_containers.add(id(node))
+            if isinstance(node, dict):
+                yield "{"
+                stack.append(("close", ("}", id(node))))
+                items = sorted(node.items(), key=lambda item: item[0])
+                for i, (key, value) in reversed(list(enumerate(items))):
+                    if not isinstance(key, str):
+                        key = json.dumps(key)
+                    stack.append(("value", value))
+                    stack.append(("text", ("," if i else "") + json.dumps(key) + ":"))
+            else:
+                yield "["
+                stack.append(("close", ("]", id(node))))
+                for i, value in reversed(list(enumerate(node))):
+                    stack.append(("value", value))
+                    if i:
+                        stack.append(("text", ","))
+        else:
+            yield json.dumps(repr(node))
+
+
+def schema_digest(*documents):
+    """Return a stable SHA-256 hex digest of one or more JSON documents."""
+    hasher = hashlib.sha256()
+    for doc in documents:
+        try:
+            text = json.dumps(doc, sort_keys=True, separators=(",", ":"), default=repr)
+        except RecursionError:
+            text = "".join(_json_pieces(doc))
+        hasher.update(text.encode("utf-8"))
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def copy_schema(schema):
+    """Return a deep copy of a schema, however deeply it is nested.
+
+    Dicts and lists are copied with an explicit stack rather than by
+    recursion; anything else is copied with `copy.deepcopy`. Like
+    `copy.deepcopy`, objects that appear several times are copied once.
+    """
+    memo = {}
+
+    def copy_node(node):
+        if id(node) in memo:
+            return memo[id(node)], False
+        if type(node) is dict:
+            memo[id(node)] = {}
+        elif type(node) is list:
+            memo[id(node)] = []
+        else:
+            return copy.deepcopy(node, memo), False
+        return memo[id(node)], True
+
+    root, pending = copy_node(schema)
+    stack = [(schema, root)] if pending else []
+    while stack:
+        node, target = stack.pop()
+        items = node.items() if type(node) is dict else enumerate(node)
+        for key, value in items:
+            value_copy, pending = copy_node(value)
+            if type(target) is dict:
+                target[key] = value_copy
+            else:
+                target.append(value_copy)
+            if pending:
+                stack.append((value, value_copy))
+    return root
+
+
 class ProtocolJSONEncoder(json.JSONEncoder):
     def default(self, obj):
         from python_jsonschema_objects import classbuilder, wrapper_types
@@ -51,48 +187,269 @@ class ProtocolJSONEncoder(json.JSONEncoder):
             return json.JSONEncoder.default(self, obj)
 
 
+def _leaf_key(obj):
+    if obj is None or isinstance(obj, (bool, int, float, str)):
+        return (type(obj).__name__, obj)
+    return ("id", id(obj))
+
+
+def shape_key(obj, memo=None):
+    """Return a hashable key that is equal for structurally equal documents.
+
+    Values that are not JSON (such as classes already attached to a schema)
+    are compared by identity. Objects and arrays are keyed by a digest of
+    the keys of their members, computed with an explicit stack, so that
+    documents may be nested arbitrarily deeply and keys stay small.
+
+    Args:
+        obj: The document to key
+        memo: (dict) If given, the keys of the objects and arrays in `obj`
+            are kept here and reused by later calls given the same memo.
+            They must not change while the memo is in use.
+    """
+    if not isinstance(obj, (dict, list)):
+        return _leaf_key(obj)
+    if memo is None:
+        memo = {}
+
+    # (container, whether the keys of its members are in the memo)
+    stack = [(obj, False)]
+    while stack:
+        node, ready = stack.pop()
+        if id(node) in memo:
+            continue
+        if isinstance(node, dict):
+            members = sorted(node.items(), key=lambda item: item[0])
+        else:
+            members = list(enumerate(node))
+        if not ready:
+            stack.append((node, True))
+            stack.extend(
+                (value, False)
+                for _, value in members
+                if isinstance(value, (dict, list)) and id(value) not in memo
+            )
+            continue
+
+        hasher = hashlib.sha256()
+        for name, value in members:
+            if isinstance(value, (dict, list)):
+                key = memo[id(value)][1]
+            else:
+                key = _leaf_key(value)
+            hasher.update(repr((name, key)).encode("utf-8"))
+            hasher.update(b"\0")
+        kind = "object" if isinstance(node, dict) else "array"
+        # The container is kept so that its id is not reused
+        memo[id(node)] = (node, (kind, hasher.hexdigest()))
+    return memo[id(obj)][1]
+
+
+def _merge_property(merged, propval):
+    """Merge the requirements in `propval` into the property dict `merged`."""
+    for subprop, spval in propval.items():
+        if subprop not in merged:
+            merged[subprop] = spval
+
+        elif subprop == "enum":
+            merged[subprop] = set(spval) & set(merged[subprop])
+
+        elif subprop == "type":
+            if spval != merged[subprop]:
+                raise TypeError("Type cannot conflict in allOf'")
+
+        elif subprop in ("minLength", "minimum"):
+            merged[subprop] = merged[subprop] if merged[subprop] > spval else spval
+        elif subprop in ("maxLength", "maximum"):
+            merged[subprop] = merged[subprop] if merged[subprop] < spval else spval
+        elif subprop == "multipleOf":
+            if merged[subprop] % spval == 0:
+                merged[subprop] = spval
+            else:
+                raise AttributeError("Cannot set conflicting multipleOf values")
+        else:
+            merged[subprop] = spval
+
+
+def merge_properties(*sources):
+    """Merge several JSON schema `properties` mappings, in order.
+
+    A property that only one source defines (or that several sources share
+    as the same object) is not copied: the result holds the source's own
+    dict. Properties defined differently by several sources are merged into
+    a new dict. Callers must copy a property before modifying it.
+    """
+    merged = dict(sources[0]) if sources else {}
+    owned = set()
+    for source in sources[1:]:
+        for prop, propval in source.items():
+            if prop not in merged:
+                merged[prop] = propval
+            elif merged[prop] is not propval:
+                if prop not in owned:
+                    merged[prop] = dict(merged[prop])
+                    owned.add(prop)
+                _merge_property(merged[prop], propval)
+    return merged
+
+
 def propmerge(into, data_from):
     """Merge JSON schema requirements into a dictionary"""
-    newprops = copy.deepcopy(into)
+    merged = merge_properties(into, data_from)
+    # Copied so that the caller can annotate the result without modifying
+    # the schemas it came from.
+    return {prop: dict(propval) for prop, propval in merged.items()}
 
-    for prop, propval in data_from.items():
-        if prop not in newprops:
-            newprops[prop] = propval
-            continue
 
-        new_sp = newprops[prop]
-        for subprop, spval in propval.items():
-            if subprop not in new_sp:
-                new_sp[subprop] = spval
-
-            elif subprop == "enum":
-                new_sp[subprop] = set(spval) & set(new_sp[subprop])
-
-            elif subprop == "type":
-                if spval != new_sp[subprop]:
-                    raise TypeError("Type cannot conflict in allOf'")
-
-            elif subprop in ("minLength", "minimum"):
-                new_sp[subprop] = new_sp[subprop] if new_sp[subprop] > spval else spval
-            elif subprop in ("maxLength", "maximum"):
-                new_sp[subprop] = new_sp[subprop] if new_sp[subprop] < spval else spval
-            elif subprop == "multipleOf":
-                if new_sp[subprop] % spval == 0:
-                    new_sp[subprop] = spval
-                else:
-                    raise AttributeError("Cannot set conflicting multipleOf values")
+def _read_only(*args, **kwargs):
+    raise TypeError("Schema views are read-only")
+
+
+class ReadOnlyDict(dict):
+    """A dict that cannot be modified. Copies of it are ordinary dicts."""
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {copy.deepcopy(k, memo): copy.deepcopy(v, memo) for k, v in self.items()}
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class ReadOnlyList(list):
+    """A list that cannot be modified. Copies of it are ordinary lists."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return [copy.deepcopy(v, memo) for v in self]
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def _empty_view(node):
+    if isinstance(node, dict):
+        return ReadOnlyDict()
+    if isinstance(node, list):
+        return ReadOnlyList()
+    return node
+
+
+def read_only_view(obj, memo=None):
+    """Return a read-only copy of a JSON document, however deeply it is nested.
+
+    The views are filled in through the dict and list methods they block,
+    with an explicit stack rather than by recursion.
+
+    Args:
+        obj: The document
+        memo: (dict) If given, dicts and lists seen by an earlier call with
+            the same memo get the view made then, so that documents which
+            share nodes keep sharing them.
+    """
+    if memo is None:
+        memo = {}
+
+    def view_of(node):
+        if id(node) in memo:
+            return memo[id(node)][1], False
+        view = _empty_view(node)
+        if view is node:
+            return node, False
+        # The node is kept so that its id is not reused
+        memo[id(node)] = (node, view)
+        return view, True
+
+    root, pending = view_of(obj)
+    stack = [(obj, root)] if pending else []
+    while stack:
+        node, view = stack.pop()
+        items = node.items() if isinstance(node, dict) else enumerate(node)
+        for key, value in items:
+            child, pending = view_of(value)
+            if isinstance(view, dict):
+                dict.__setitem__(view, key, child)
             else:
-                new_sp[subprop] = spval
+                list.append(view, child)
+            if pending:
+                stack.append((value, child))
+    return root
 
-        newprops[prop] = new_sp
 
-    return newprops
+_URI_SCHEME = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*:")
+
+
+def is_absolute_uri(uri):
+    """Return True if `uri` has a scheme, i.e. names a document of its own.
+
+    URIs of classes built from the root schema have no scheme.
+    """
+    return _URI_SCHEME.match(uri) is not None
+
+
+# Keywords whose values are data rather than schemas.
+_DATA_KEYWORDS = frozenset(["enum", "const", "default", "examples"])
+
+# Keywords whose values map names to schemas. The names are not keywords,
+# so a property called "default" is a schema like any other.
+_SCHEMA_MAP_KEYWORDS = frozenset(
+    ["properties", "patternProperties", "definitions", "$defs", "dependencies"]
+)
+
+
+def subschemas(schema):
+    """Yield every dict in `schema` that may hold a `$ref`."""
+    # (node, whether node maps names to schemas rather than being one)
+    stack = [(schema, False)]
+    while stack:
+        node, is_map = stack.pop()
+        if isinstance(node, list):
+            stack.extend((item, False) for item in node)
+        elif not isinstance(node, dict):
+            continue
+        elif is_map:
+            stack.extend((value, False) for value in node.values())
+        else:
+            yield node
+            for key, value in node.items():
+                if key in _SCHEMA_MAP_KEYWORDS:
+                    stack.append((value, True))
+                elif key not in _DATA_KEYWORDS:
+                    stack.append((value, False))
+
+
+def external_documents(base, schema):
+    """Yield the URIs of the other documents that `schema` refers to.
+
+    Args:
+        base: (str) The URI of the document `schema` is in
+        schema: (Mapping) The schema to search
+    """
+    for node in subschemas(schema):
+        ref = node.get("$ref")
+        if isinstance(ref, str):
+            uri = resolve_ref_uri(base, ref).partition("#")[0]
+            if is_absolute_uri(uri) and uri != base:
+                yield uri
 
 
 def resolve_ref_uri(base, ref):
     if ref[0] == "#":
         # Local ref
         uri = base.rsplit("#", 1)[0] + ref
+    elif base:
+        # Relative to the document the reference is in
+        uri = urllib.parse.urljoin(base, ref)
     else:
         uri = ref
 
@@ -183,6 +540,59 @@ class Namespace(dict):
         return object.__delattr__(ns, name)
 
 
+class LazyNamespace(Namespace):
+    """A Namespace whose values are computed the first time they are read.
+
+    Values may be read from several threads. Threads that race for the
+    same value may both call its loader, so loaders should return the same
+    value every time.
+
+    Args:
+        loaders: (Mapping) names mapped to zero-argument callables that
+            produce the value for that name
+    """
+
+    def __init__(self, loaders):
+        Namespace.__init__(self)
+        Namespace.setattr(self, "_loaders", dict(loaders))
+
+    def __missing__(self, name):
+        loader = Namespace.getattr(self, "_loaders").get(name)
+        if loader is None:
+            # Another thread may have just loaded it
+            if dict.__contains__(self, name):
+                return dict.__getitem__(self, name)
+            raise KeyError(name)
+        value = loader()
+        dict.__setitem__(self, name, value)
+        Namespace.getattr(self, "_loaders").pop(name, None)
+        return value
+
+    def __contains__(self, name):
+        return dict.__contains__(self, name) or name in Namespace.getattr(
+            self, "_loaders"
+        )
+
+    def __iter__(self):
+        # Values move from the loaders to the dict as they are loaded, so
+        # look at the loaders first and skip those that have since moved.
+        pending = list(Namespace.getattr(self, "_loaders"))
+        loaded = list(dict.__iter__(self))
+        yield from loaded
+        loaded = set(loaded)
+        yield from (name for name in pending if name not in loaded)
+
+    def __len__(self):
+        return dict.__len__(self) + len(Namespace.getattr(self, "_loaders"))
+
+    def __repr__(self):
+        return "%s(%s, pending=%s)" % (
+            type(self).__name__,
+            dict.__repr__(self),
+            sorted(Namespace.getattr(self, "_loaders")),
+        )
+
+
 def as_namespace(obj, names=None):
     # functions
     if isinstance(obj, type(as_namespace)):
@@ -109,18 +109,20 @@ def pattern(param, value, _):
         raise ValidationError("{0} does not match {1}".format(value, param))
 
 
-try:
-    from jsonschema import FormatChecker
-except ImportError:
-    pass
-else:
+_format_checker = None
 
-    @registry.register()
-    def format(param, value, _):
-        if not FormatChecker().conforms(value, param):
-            raise ValidationError(
-                "'{0}' is not formatted as a {1}".format(value, param)
-            )
+
+@registry.register()
+def format(param, value, _):
+    # jsonschema's format checks take a while to import, so they are only
+    # loaded when a schema first uses "format".
+    global _format_checker
+    if _format_checker is None:
+        from jsonschema import FormatChecker
+
+        _format_checker = FormatChecker()
+    if not _format_checker.conforms(value, param):
+        raise ValidationError("'{0}' is not formatted as a {1}".format(value, param))
 
 
 type_registry = ValidatorRegistry()
@@ -238,11 +238,13 @@ class ArrayWrapper(collections.abc.MutableSequence):
         addl_constraints is expected to be key-value pairs of any of the other
         constraints permitted by JSON Schema v4.
         """
+        # The constraints are not formatted whole: their items may be nested
+        # too deeply for repr.
         logger.debug(
             fmt(
-                "Constructing ArrayValidator with {} and {}",
-                item_constraint,
-                addl_constraints,
+                "Constructing ArrayValidator {} with {}",
+                name,
+                sorted(addl_constraints),
             )
         )
         from python_jsonschema_objects import classbuilder
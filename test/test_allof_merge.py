@@ -0,0 +1,86 @@
+import pytest
+
+import python_jsonschema_objects as pjo
+from python_jsonschema_objects import util
+
+
+@pytest.fixture
+def ns():
+    schema = {
+        "$schema": "http://json-schema.org/draft-04/schema#",
+        "id": "chain",
+        "title": "Chain",
+        "type": "object",
+        "properties": {"leaf": {"$ref": "#/definitions/level2"}},
+        "definitions": {
+            "level0": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string", "maxLength": 10},
+                    "@kind": {"type": "string"},
+                    "mode": {"type": "string", "default": "base"},
+                    "tags": {"type": "array", "items": {"type": "string"}},
+                },
+                "required": ["name"],
+            },
+            "level1": {
+                "allOf": [
+                    {"$ref": "#/definitions/level0"},
+                    {
+                        "properties": {
+                            "name": {"type": "string", "maxLength": 5},
+                            "size": {"type": "integer", "minimum": 0},
+                        }
+                    },
+                ]
+            },
+            "level2": {
+                "allOf": [
+                    {"$ref": "#/definitions/level1"},
+                    {"properties": {"color": {"enum": ["red", "blue"]}}},
+                ]
+            },
+        },
+    }
+    return pjo.ObjectBuilder(schema).build_classes()
+
+
+def test_chain_inherits_and_narrows(ns):
+    leaf = ns.Level2(name="abc", size=1, color="red", tags=["x"])
+    assert leaf.mode == "base"
+    assert leaf.tags[0] == "x"
+    assert isinstance(leaf, ns.Level1) and isinstance(leaf, ns.Level0)
+    assert ns.Level2.__required__ == {"name"}
+    assert ns.Level2.__prop_names__["@kind"] == "kind"
+
+    with pytest.raises(pjo.ValidationError):
+        ns.Level2(name="toolong")
+    with pytest.raises(pjo.ValidationError):
+        ns.Level2(name="abc", size=-1)
+    with pytest.raises(pjo.ValidationError):
+        ns.Level2(name="abc", color="green")
+    assert ns.Level0(name="longername").name == "longername"
+
+
+def test_unchanged_properties_are_shared(ns):
+    level0, level1, level2 = ns.Level0, ns.Level1, ns.Level2
+    assert level2.__propinfo__["tags"] is level0.__propinfo__["tags"]
+    assert level2.__propinfo__["name"] is level1.__propinfo__["name"]
+    assert level1.__propinfo__["name"] is not level0.__propinfo__["name"]
+    assert level1.__propinfo__["name"]["maxLength"] == 5
+    assert level0.__propinfo__["name"]["maxLength"] == 10
+    assert "tags" not in vars(level2)
+
+
+def test_merge_properties_copies_only_merged_properties():
+    a = {"x": {"type": "string", "maxLength": 5}, "y": {"type": "integer"}}
+    b = {"x": {"maxLength": 3, "minLength": 1}, "z": {"type": "boolean"}}
+    merged = util.merge_properties(a, b)
+
+    assert merged["y"] is a["y"] and merged["z"] is b["z"]
+    assert merged["x"] == {"type": "string", "maxLength": 3, "minLength": 1}
+    assert a["x"] == {"type": "string", "maxLength": 5}
+    assert util.merge_properties(a, a)["x"] is a["x"]
+
+    copied = util.propmerge(a, b)
+    assert copied == merged and copied["y"] is not a["y"]
@@ -0,0 +1,196 @@
+import json
+
+import pytest
+
+import python_jsonschema_objects as pjo
+from python_jsonschema_objects.cache import BuildCache
+
+
+@pytest.fixture
+def schema():
+    return {
+        "$schema": "http://json-schema.org/draft-04/schema#",
+        "title": "Cached",
+        "type": "object",
+        "properties": {
+            "name": {"type": "string", "maxLength": 5},
+            "child": {"$ref": "#/definitions/node"},
+            "tags": {"type": "array", "items": {"type": "string"}},
+        },
+        "required": ["name"],
+        "definitions": {
+            "node": {
+                "type": "object",
+                "properties": {
+                    "value": {"type": "integer"},
+                    "next": {"$ref": "#/definitions/node"},
+                },
+            }
+        },
+    }
+
+
+def test_cache_restores_equivalent_classes(tmp_path, schema):
+    first = pjo.ObjectBuilder(schema, cache=str(tmp_path)).build_classes()
+    assert list(tmp_path.rglob("*.pickle"))
+
+    ns = pjo.ObjectBuilder(schema, cache=str(tmp_path)).build_classes()
+    assert ns.Cached is not first.Cached
+    assert sorted(ns) == sorted(first)
+
+    obj = ns.Cached(name="foo", child={"value": 1, "next": {"value": 2}})
+    obj.tags = ["a", "b"]
+    assert obj.child.next.value == 2
+    assert isinstance(obj.child.next, ns.Node)
+    assert json.loads(obj.serialize()) == {
+        "name": "foo",
+        "child": {"value": 1, "next": {"value": 2}},
+        "tags": ["a", "b"],
+    }
+
+    with pytest.raises(pjo.ValidationError):
+        ns.Cached(name="toolong")
+    with pytest.raises(pjo.ValidationError):
+        ns.Cached(name="foo", child={"value": "x"})
+    with pytest.raises(pjo.ValidationError):
+        ns.Cached().validate()
+
+
+def test_cache_is_keyed_on_options(tmp_path, schema):
+    builder = pjo.ObjectBuilder(schema, cache=str(tmp_path))
+    builder.build_classes()
+    builder.build_classes(strict=True)
+    assert len(list(tmp_path.rglob("*.pickle"))) == 2
+
+    ns = pjo.ObjectBuilder(schema, cache=str(tmp_path)).build_classes(strict=True)
+    with pytest.raises(pjo.ValidationError):
+        ns.Cached()
+
+
+def test_cache_invalidation(tmp_path, schema):
+    builder = pjo.ObjectBuilder(schema, cache=BuildCache(str(tmp_path)))
+    builder.build_classes()
+    assert list(tmp_path.rglob("*.pickle"))
+
+    builder.invalidate_cache()
+    assert not list(tmp_path.rglob("*.pickle"))
+
+
+def test_cache_detects_changed_referenced_files(tmp_path):
+    schema_dir = tmp_path / "schemas"
+    schema_dir.mkdir()
+    (schema_dir / "common.json").write_text(
+        json.dumps(
+            {"$schema": "http://json-schema.org/draft-04/schema#", "type": "string"}
+        )
+    )
+    (schema_dir / "root.json").write_text(
+        json.dumps(
+            {
+                "$schema": "http://json-schema.org/draft-04/schema#",
+                "title": "Root",
+                "type": "object",
+                "properties": {"common": {"$ref": "file:///common.json"}},
+            }
+        )
+    )
+    cache_dir = str(tmp_path / "cache")
+
+    ns = pjo.ObjectBuilder(
+        str(schema_dir / "root.json"), cache=cache_dir
+    ).build_classes()
+    ns.Root(common="text")
+
+    (schema_dir / "common.json").write_text(
+        json.dumps(
+            {"$schema": "http://json-schema.org/draft-04/schema#", "type": "integer"}
+        )
+    )
+    ns = pjo.ObjectBuilder(
+        str(schema_dir / "root.json"), cache=cache_dir
+    ).build_classes()
+    ns.Root(common=1)
+    with pytest.raises(pjo.ValidationError):
+        ns.Root(common="text")
+
+
+def _write_layout(directory, common_type):
+    directory.mkdir()
+    (directory / "common.json").write_text(
+        json.dumps(
+            {"$schema": "http://json-schema.org/draft-04/schema#", "type": common_type}
+        )
+    )
+    (directory / "root.json").write_text(
+        json.dumps(
+            {
+                "$schema": "http://json-schema.org/draft-04/schema#",
+                "title": "Root",
+                "type": "object",
+                "properties": {"common": {"$ref": "file:///common.json"}},
+            }
+        )
+    )
+    return str(directory / "root.json")
+
+
+def test_cache_is_keyed_on_the_schema_directory(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    strings = _write_layout(tmp_path / "strings", "string")
+    integers = _write_layout(tmp_path / "integers", "integer")
+
+    pjo.ObjectBuilder(strings, cache=cache_dir).build_classes()
+    ns = pjo.ObjectBuilder(integers, cache=cache_dir).build_classes()
+    ns.Root(common=1)
+    with pytest.raises(pjo.ValidationError):
+        ns.Root(common="text")
+
+    ns = pjo.ObjectBuilder(strings, cache=cache_dir).build_classes()
+    ns.Root(common="text")
+
+
+def test_cache_skips_builds_using_retrieved_documents(tmp_path):
+    from referencing import Resource
+
+    schema = {
+        "$schema": "http://json-schema.org/draft-04/schema#",
+        "title": "Remote",
+        "type": "object",
+        "properties": {"value": {"$ref": "https://example.com/value.json"}},
+    }
+
+    def resolver(value_type):
+        def retrieve(uri):
+            return Resource.from_contents(
+                {
+                    "$schema": "http://json-schema.org/draft-04/schema#",
+                    "type": value_type,
+                }
+            )
+
+        return retrieve
+
+    cache_dir = str(tmp_path)
+    pjo.ObjectBuilder(
+        schema, resolver=resolver("string"), cache=cache_dir
+    ).build_classes()
+    assert not list(tmp_path.rglob("*.pickle"))
+
+    ns = pjo.ObjectBuilder(
+        schema, resolver=resolver("integer"), cache=cache_dir
+    ).build_classes()
+    ns.Remote(value=1)
+    with pytest.raises(pjo.ValidationError):
+        ns.Remote(value="text")
+
+
+def test_cache_is_not_used_with_a_registry(tmp_path, schema):
+    from referencing import Registry
+
+    pjo.ObjectBuilder(schema, cache=str(tmp_path)).build_classes()
+    assert list(tmp_path.rglob("*.pickle"))
+
+    builder = pjo.ObjectBuilder(schema, registry=Registry(), cache=str(tmp_path))
+    ns = builder.build_classes()
+    assert builder._builder is not None
+    assert ns.Cached(name="foo").name == "foo"
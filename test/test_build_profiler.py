@@ -0,0 +1,114 @@
+import json
+
+import pytest
+
+import python_jsonschema_objects as pjo
+from python_jsonschema_objects.profiling import BuildProfiler
+
+
+@pytest.fixture
+def schema_path(tmp_path):
+    (tmp_path / "common.json").write_text(
+        json.dumps(
+            {"$schema": "http://json-schema.org/draft-04/schema#", "type": "string"}
+        )
+    )
+    path = tmp_path / "root.json"
+    path.write_text(
+        json.dumps(
+            {
+                "$schema": "http://json-schema.org/draft-04/schema#",
+                "title": "Root",
+                "type": "object",
+                "properties": {
+                    "left": {"$ref": "#/definitions/node"},
+                    "right": {"$ref": "#/definitions/node"},
+                    "inline": {
+                        "type": "object",
+                        "properties": {"name": {"type": "string"}},
+                    },
+                },
+                "definitions": {
+                    "node": {
+                        "type": "object",
+                        "properties": {
+                            "label": {"$ref": "file:///common.json"},
+                            "next": {"$ref": "#/definitions/node"},
+                        },
+                    }
+                },
+            }
+        )
+    )
+    return str(path)
+
+
+def test_profile_records_each_uri(schema_path):
+    builder = pjo.ObjectBuilder(schema_path)
+    ns = builder.build_classes(profile=True)
+    assert ns.Root(left={"label": "a"}).left.label == "a"
+
+    profiles = builder.profiler.profiles
+    node = profiles["#/definitions/node"]
+    assert node.depth == 1
+    assert node.refs == 2
+    assert node.retrievals == 1
+    assert profiles["file:///common.json"].depth == 2
+
+    root = profiles["root"]
+    assert root.refs == 2
+    assert root.anonymous == 1
+    assert root.retrievals == 0
+    assert profiles["root/inline_<anonymous>"].depth == 2
+
+    for profile in profiles.values():
+        assert 0 <= profile.self_time <= profile.total_time
+
+
+def test_report_is_sorted(schema_path):
+    builder = pjo.ObjectBuilder(schema_path)
+    builder.build_classes(profile=True)
+
+    rows = builder.profiler.report(sort="refs")
+    assert [row["refs"] for row in rows] == sorted(
+        (row["refs"] for row in rows), reverse=True
+    )
+    assert len(builder.profiler.report(limit=2)) == 2
+    assert set(rows[0]) == {
+        "uri",
+        "total_time",
+        "self_time",
+        "refs",
+        "retrievals",
+        "anonymous",
+        "depth",
+    }
+
+    text = builder.profiler.format_report(sort="uri")
+    assert text.splitlines()[0].split()[-1] == "uri"
+    assert "#/definitions/node" in text
+
+    with pytest.raises(ValueError):
+        builder.profiler.report(sort="bogus")
+
+
+def test_profiling_is_off_by_default(schema_path):
+    builder = pjo.ObjectBuilder(schema_path)
+    builder.build_classes()
+    assert builder.profiler is None
+
+
+def test_profiler_nesting():
+    profiler = BuildProfiler()
+    profiler.start("outer")
+    profiler.record_ref()
+    profiler.start("outer/x_<anonymous>")
+    profiler.record_retrieval()
+    profiler.stop()
+    profiler.stop()
+
+    outer = profiler.profiles["outer"]
+    inner = profiler.profiles["outer/x_<anonymous>"]
+    assert (outer.refs, outer.retrievals, outer.anonymous) == (1, 0, 1)
+    assert (inner.refs, inner.retrievals, inner.depth) == (0, 1, 2)
+    assert outer.total_time >= inner.total_time
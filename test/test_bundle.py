@@ -0,0 +1,148 @@
+import json
+
+import pytest
+
+import python_jsonschema_objects as pjo
+from python_jsonschema_objects import bundle
+
+DRAFT4 = "http://json-schema.org/draft-04/schema#"
+
+
+@pytest.fixture
+def schema_dir(tmp_path):
+    documents = {
+        "common.json": {
+            "$schema": DRAFT4,
+            "id": "common",
+            "definitions": {
+                "address": {
+                    "type": "object",
+                    "properties": {
+                        "city": {"type": "string"},
+                        "country": {"$ref": "#/definitions/country"},
+                        "location": {"$ref": "file:///geo.json"},
+                    },
+                },
+                "country": {"type": "string", "enum": ["FR", "DE"]},
+            },
+        },
+        "geo.json": {
+            "$schema": DRAFT4,
+            "title": "Geo",
+            "type": "object",
+            "properties": {"lat": {"type": "number"}, "lon": {"type": "number"}},
+        },
+        "person.json": {
+            "$schema": DRAFT4,
+            "title": "Person",
+            "type": "object",
+            "properties": {
+                "home": {"$ref": "file:///common.json#/definitions/address"},
+                "town": {
+                    "$ref": "file:///common.json#/definitions/address/properties/city"
+                },
+                "self": {"$ref": "file:///person.json"},
+                "nickname": {"$ref": "#/definitions/name"},
+            },
+            "definitions": {"name": {"type": "string", "maxLength": 8}},
+        },
+    }
+    for name, document in documents.items():
+        (tmp_path / name).write_text(json.dumps(document))
+    return tmp_path
+
+
+def _describe(namespace):
+    return {
+        name: sorted(getattr(namespace[name], "__propinfo__", {})) for name in namespace
+    }
+
+
+def test_bundle_has_no_external_references(schema_dir):
+    bundled = bundle.bundle_schema(str(schema_dir / "person.json"))
+
+    definitions = bundled["definitions"]
+    assert sorted(definitions) == ["address", "country", "geo", "name"]
+    assert bundled["properties"]["home"] == {"$ref": "#/definitions/address"}
+    assert bundled["properties"]["town"] == {
+        "$ref": "#/definitions/address/properties/city"
+    }
+    assert bundled["properties"]["self"] == {"$ref": "#"}
+    assert definitions["address"]["properties"]["country"] == {
+        "$ref": "#/definitions/country"
+    }
+    assert "id" not in definitions["address"]
+
+
+def test_colliding_definitions_are_renamed(schema_dir):
+    person = json.loads((schema_dir / "person.json").read_text())
+    person["definitions"]["country"] = {"type": "integer"}
+    (schema_dir / "person.json").write_text(json.dumps(person))
+
+    bundled = bundle.bundle_schema(str(schema_dir / "person.json"))
+
+    assert bundled["definitions"]["country"] == {"type": "integer"}
+    assert bundled["definitions"]["common_country"]["enum"] == ["FR", "DE"]
+    assert bundled["definitions"]["address"]["properties"]["country"] == {
+        "$ref": "#/definitions/common_country"
+    }
+
+
+def test_bundle_builds_the_same_classes_without_io(schema_dir, tmp_path_factory):
+    original = pjo.ObjectBuilder(str(schema_dir / "person.json")).build_classes()
+
+    path = tmp_path_factory.mktemp("elsewhere") / "bundle.json"
+    assert bundle.main([str(schema_dir / "person.json"), "-o", str(path)]) == 0
+    builder = pjo.ObjectBuilder(str(path))
+    ns = builder.build_classes()
+
+    assert builder._file_dependencies == set()
+    # The bundle's definitions are part of the root document, so their
+    # sub-schemas are listed too
+    described = _describe(ns)
+    for name, props in _describe(original).items():
+        assert described[name] == props
+    person = ns.Person(
+        home={"city": "Paris", "country": "FR", "location": {"lat": 1, "lon": 2}},
+        nickname="bob",
+    )
+    assert person.home.location.lat == 1
+    with pytest.raises(pjo.ValidationError):
+        person.home.country = "XX"
+    with pytest.raises(pjo.ValidationError):
+        person.nickname = "much too long"
+
+
+def test_properties_named_like_data_keywords_are_bundled(schema_dir):
+    (schema_dir / "price.json").write_text(
+        json.dumps(
+            {
+                "$schema": DRAFT4,
+                "title": "Price",
+                "type": "object",
+                "properties": {
+                    "default": {"$ref": "file:///common.json#/definitions/country"},
+                    "enum": {"type": "string", "default": {"$ref": "not a ref"}},
+                },
+            }
+        )
+    )
+
+    result = bundle.bundle_schema(str(schema_dir / "price.json"))
+
+    assert result["properties"]["default"] == {"$ref": "#/definitions/country"}
+    assert result["definitions"]["country"]["enum"] == ["FR", "DE"]
+    # Data stays data, even when it looks like a reference.
+    assert result["properties"]["enum"]["default"] == {"$ref": "not a ref"}
+
+
+def test_bundle_keeps_the_original_root(schema_dir):
+    document = json.loads((schema_dir / "person.json").read_text())
+
+    result = bundle.bundle_schema(str(schema_dir / "person.json"))
+    assert "id" not in result and "$id" not in result
+    assert sorted(result) == sorted(document)
+    assert result["title"] == document["title"]
+
+    document = {"title": "Plain", "type": "object"}
+    assert bundle.bundle_schema(document) == dict(document, definitions={})
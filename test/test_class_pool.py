@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+import python_jsonschema_objects as pjo
+from python_jsonschema_objects.cache import ClassPool
+
+DRAFT4 = "http://json-schema.org/draft-04/schema#"
+
+
+def _tenant(title):
+    return {
+        "$schema": DRAFT4,
+        "title": title,
+        "type": "object",
+        "properties": {
+            "address": {"$ref": "file:///common.json#/definitions/address"},
+            "note": {"type": "string"},
+        },
+    }
+
+
+@pytest.fixture
+def schema_dir(tmp_path):
+    common = {
+        "$schema": DRAFT4,
+        "definitions": {
+            "address": {
+                "type": "object",
+                "properties": {
+                    "city": {"type": "string"},
+                    "country": {"$ref": "#/definitions/country"},
+                },
+            },
+            "country": {"type": "string", "enum": ["FR", "DE"]},
+        },
+    }
+    (tmp_path / "common.json").write_text(json.dumps(common))
+    for title in ("TenantA", "TenantB"):
+        (tmp_path / (title + ".json")).write_text(json.dumps(_tenant(title)))
+    return tmp_path
+
+
+def _build(schema_dir, title, **kwargs):
+    builder = pjo.ObjectBuilder(str(schema_dir / (title + ".json")), **kwargs)
+    return builder, builder.build_classes()
+
+
+def test_builders_share_pooled_classes(schema_dir):
+    pool = ClassPool()
+    builder_a, a = _build(schema_dir, "TenantA", class_pool=pool)
+    builder_b, b = _build(schema_dir, "TenantB", class_pool=pool)
+
+    address = "file:///common.json#/definitions/address"
+    country = "file:///common.json#/definitions/country"
+    assert builder_b.get_class(address) is builder_a.get_class(address)
+    assert builder_b.get_class(country) is builder_a.get_class(country)
+    assert a.Tenanta is not b.Tenantb
+    assert pool.hits == 1
+
+    tenant = b.Tenantb(address={"city": "Paris", "country": "FR"})
+    assert isinstance(tenant.address, builder_a.get_class(address))
+    with pytest.raises(pjo.ValidationError):
+        tenant.address.country = "XX"
+
+
+def test_pool_is_keyed_on_content_and_options(schema_dir):
+    pool = ClassPool()
+    builder_a, _ = _build(schema_dir, "TenantA", class_pool=pool)
+    builder_b = pjo.ObjectBuilder(str(schema_dir / "TenantB.json"), class_pool=pool)
+    builder_b.build_classes(strict=True)
+
+    address = "file:///common.json#/definitions/address"
+    assert builder_b.get_class(address) is not builder_a.get_class(address)
+
+    common = json.loads((schema_dir / "common.json").read_text())
+    common["definitions"]["country"]["enum"].append("IT")
+    (schema_dir / "common.json").write_text(json.dumps(common))
+    builder_c, _ = _build(schema_dir, "TenantB", class_pool=pool)
+    assert builder_c.get_class(address) is not builder_a.get_class(address)
+    assert len(pool) == 6
+
+
+def test_builders_without_a_pool_build_their_own(schema_dir):
+    builder_a, _ = _build(schema_dir, "TenantA")
+    builder_b, _ = _build(schema_dir, "TenantB")
+
+    address = "file:///common.json#/definitions/address"
+    assert builder_b.get_class(address) is not builder_a.get_class(address)
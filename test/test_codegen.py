@@ -0,0 +1,141 @@
+import importlib.util
+import json
+
+import pytest
+
+import python_jsonschema_objects as pjo
+
+SCHEMA = {
+    "$schema": "http://json-schema.org/draft-04/schema#",
+    "title": "Order",
+    "type": "object",
+    "properties": {
+        "id": {"type": "string", "pattern": "^[A-Z]+$"},
+        "quantity": {"type": "integer", "minimum": 1, "default": 1},
+        "note": {"type": ["string", "null"]},
+        "status": {"enum": ["open", "closed"]},
+        "lines": {
+            "type": "array",
+            "items": {"$ref": "#/definitions/line"},
+            "minItems": 1,
+        },
+        "tags": {"type": "array", "items": {"type": "string"}, "uniqueItems": True},
+        "payment": {
+            "oneOf": [{"$ref": "#/definitions/card"}, {"$ref": "#/definitions/cash"}]
+        },
+        "address": {
+            "type": "object",
+            "properties": {"city": {"type": "string", "maxLength": 10}},
+            "required": ["city"],
+        },
+    },
+    "required": ["id"],
+    "additionalProperties": {"type": "integer"},
+    "patternProperties": {"^x-": {"type": "string"}},
+    "definitions": {
+        "line": {
+            "type": "object",
+            "properties": {
+                "sku": {"type": "string"},
+                "parent": {"$ref": "#/definitions/line"},
+            },
+            "required": ["sku"],
+        },
+        "card": {
+            "type": "object",
+            "properties": {"number": {"type": "string", "minLength": 4}},
+            "required": ["number"],
+            "additionalProperties": False,
+        },
+        "cash": {
+            "type": "object",
+            "properties": {"amount": {"type": "number"}},
+            "required": ["amount"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+CASES = [
+    {"id": "ABC"},
+    {"id": "abc"},
+    {"id": "ABC", "quantity": 0},
+    {"id": "ABC", "note": None, "status": "open"},
+    {"id": "ABC", "status": "pending"},
+    {"id": "ABC", "lines": [{"sku": "a", "parent": {"sku": "b"}}]},
+    {"id": "ABC", "lines": [{"parent": {"sku": "b"}}]},
+    {"id": "ABC", "lines": []},
+    {"id": "ABC", "tags": ["a", "a"]},
+    {"id": "ABC", "payment": {"number": "1234"}},
+    {"id": "ABC", "payment": {"amount": 3.5}},
+    {"id": "ABC", "payment": {"number": "1"}},
+    {"id": "ABC", "address": {"city": "Springfield"}},
+    {"id": "ABC", "address": {}},
+    {"id": "ABC", "extra": 1},
+    {"id": "ABC", "extra": "one"},
+    {"id": "ABC", "x-trace": "t"},
+    {"quantity": 2},
+]
+
+
+def _import(path):
+    spec = importlib.util.spec_from_file_location(path.stem, str(path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _outcome(cls, data):
+    try:
+        obj = cls(**data)
+        obj.validate()
+    except (pjo.ValidationError, TypeError) as e:
+        return type(e).__name__
+    return json.loads(obj.serialize(sort_keys=True))
+
+
+@pytest.fixture
+def generated(tmp_path):
+    dynamic = pjo.ObjectBuilder(SCHEMA).build_classes()
+    builder = pjo.ObjectBuilder(SCHEMA)
+    path = tmp_path / "order_classes.py"
+    builder.generate_module(str(path))
+    return dynamic, builder, _import(path)
+
+
+def test_generated_module_defines_static_classes(generated):
+    dynamic, builder, module = generated
+
+    assert sorted(module.namespace) == sorted(dynamic)
+    assert set(module.resolved) == set(builder._resolved)
+    for name in dynamic:
+        assert type(module.namespace[name]) is type(dynamic[name])
+        if isinstance(dynamic[name], type):
+            assert module.namespace[name].__name__ == dynamic[name].__name__
+    assert module.namespace.Order.__module__ == module.__name__
+
+
+@pytest.mark.parametrize("data", CASES)
+def test_generated_classes_validate_identically(generated, data):
+    dynamic, _, module = generated
+
+    assert _outcome(module.namespace.Order, data) == _outcome(dynamic.Order, data)
+
+
+def test_generated_module_for_examples(tmp_path, markdown_examples):
+    schema = markdown_examples["Example Schema"]
+    dynamic = pjo.ObjectBuilder(schema, resolved=markdown_examples).build_classes()
+    builder = pjo.ObjectBuilder(schema, resolved=markdown_examples)
+    path = tmp_path / "example_classes.py"
+    builder.generate_module(str(path))
+    module = _import(path)
+
+    person = module.namespace.ExampleSchema(
+        firstName="James", lastName="Bond", dogs=["Lassie"]
+    )
+    expected = dynamic.ExampleSchema(
+        firstName="James", lastName="Bond", dogs=["Lassie"]
+    )
+    assert person.serialize(sort_keys=True) == expected.serialize(sort_keys=True)
+    with pytest.raises(pjo.ValidationError):
+        module.namespace.ExampleSchema(age=-1)
@@ -0,0 +1,108 @@
+import pytest
+
+import python_jsonschema_objects as pjo
+from python_jsonschema_objects.util import shape_key
+
+POINT = {
+    "type": "object",
+    "properties": {"x": {"type": "integer"}, "y": {"type": "integer"}},
+}
+
+
+@pytest.fixture
+def schema():
+    return {
+        "$schema": "http://json-schema.org/draft-04/schema#",
+        "id": "shapes",
+        "title": "Shapes",
+        "type": "object",
+        "properties": {
+            "start": dict(POINT),
+            "end": dict(POINT),
+            "path": {"type": "array", "items": dict(POINT)},
+            "label": {"type": "string", "maxLength": 3},
+        },
+        "definitions": {
+            "box": {
+                "type": "object",
+                "properties": {
+                    "corner": dict(POINT),
+                    "label": {"type": "string", "maxLength": 3},
+                    "other": {"type": "string", "maxLength": 4},
+                },
+            }
+        },
+    }
+
+
+def test_identical_inline_shapes_share_a_class(schema):
+    builder = pjo.ObjectBuilder(schema)
+    ns = builder.build_classes(dedupe=True)
+
+    start = builder.get_class("shapes/start_<anonymous>")
+    assert builder.get_class("shapes/end_<anonymous>") is start
+    assert builder.get_class("#/definitions/box/corner_<anonymous>") is start
+    assert builder.get_class("shapes/label") is builder.get_class(
+        "#/definitions/box/label"
+    )
+    assert builder.get_class("#/definitions/box/other") is not builder.get_class(
+        "#/definitions/box/label"
+    )
+    assert builder.build_stats["classes_saved"] > 0
+
+    shapes = ns.Shapes(start={"x": 1, "y": 2}, path=[{"x": 3, "y": 4}])
+    assert shapes.path[0].y == 4
+    with pytest.raises(pjo.ValidationError):
+        shapes.end = {"x": "one"}
+    with pytest.raises(pjo.ValidationError):
+        ns.Box(label="long")
+    assert ns.Box(other="long").other == "long"
+
+
+def test_dedupe_is_off_by_default(schema):
+    builder = pjo.ObjectBuilder(schema)
+    builder.build_classes()
+
+    assert builder.get_class("shapes/start_<anonymous>") is not builder.get_class(
+        "shapes/end_<anonymous>"
+    )
+    assert builder.build_stats["classes_saved"] == 0
+
+
+def test_shape_key():
+    assert shape_key({"a": [1, {"b": None}]}) == shape_key({"a": [1, {"b": None}]})
+    assert shape_key({"a": 1}) != shape_key({"a": True})
+    assert shape_key({"a": 1}) != shape_key({"a": 1.0})
+    assert shape_key({"type": int}) != shape_key({"type": str})
+
+
+def test_properties_named_raw_name_are_part_of_the_shape():
+    schema = {
+        "title": "Pair",
+        "type": "object",
+        "properties": {
+            "a": {
+                "type": "object",
+                "properties": {"v": {"type": "integer"}},
+                "additionalProperties": False,
+            },
+            "b": {
+                "type": "object",
+                "properties": {
+                    "v": {"type": "integer"},
+                    "raw_name": {"type": "string"},
+                },
+                "additionalProperties": False,
+            },
+        },
+    }
+    builder = pjo.ObjectBuilder(schema)
+    ns = builder.build_classes(dedupe=True)
+
+    assert builder.get_class("pair/a_<anonymous>") is not builder.get_class(
+        "pair/b_<anonymous>"
+    )
+    pair = ns.Pair(a={"v": 1}, b={"v": 1, "raw_name": "x"})
+    assert pair.b.raw_name == "x"
+    with pytest.raises(pjo.ValidationError):
+        pair.a = {"v": 1, "raw_name": "x"}
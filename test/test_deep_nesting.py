@@ -0,0 +1,112 @@
+import json
+import sys
+
+import pytest
+
+import python_jsonschema_objects as pjo
+from python_jsonschema_objects import util
+
+
+def _nested(depth):
+    node = {"type": "string"}
+    for _ in range(depth):
+        node = {
+            "type": "object",
+            "properties": {"name": {"type": "string"}, "child": node},
+        }
+    node["$schema"] = "http://json-schema.org/draft-04/schema#"
+    node["title"] = "Nested"
+    return node
+
+
+def test_nesting_deeper_than_the_recursion_limit():
+    depth = 2 * sys.getrecursionlimit()
+    builder = pjo.ObjectBuilder(_nested(depth), validate_schema=False)
+    ns = builder.build_classes()
+
+    uri = "nested" + "/child_<anonymous>" * (depth - 1)
+    assert issubclass(builder.get_class(uri), pjo.classbuilder.ProtocolBase)
+    assert builder.get_class(uri + "/child") is not None
+
+    nested = ns.Nested(name="top", child={"name": "next", "child": {"name": "x"}})
+    assert nested.child.child.name == "x"
+
+
+def test_errors_propagate_through_nested_construction():
+    schema = _nested(3)
+    schema["properties"]["child"]["properties"]["bad"] = {"oneOf": 1}
+    builder = pjo.ObjectBuilder(schema, validate_schema=False)
+
+    with pytest.raises(TypeError):
+        builder.build_classes()
+
+
+def test_copy_schema_handles_depth_and_shared_nodes():
+    shared = {"type": "integer"}
+    schema = {"a": shared, "b": [shared, {"c": shared}]}
+    copied = util.copy_schema(schema)
+
+    assert copied == schema
+    assert copied["a"] is not shared
+    assert copied["b"][0] is copied["a"] is copied["b"][1]["c"]
+
+    deep = _nested(3 * sys.getrecursionlimit())
+    assert util.copy_schema(deep)["title"] == "Nested"
+
+
+def test_nested_arrays_deeper_than_the_recursion_limit():
+    items = {"type": "integer"}
+    for _ in range(2 * sys.getrecursionlimit()):
+        items = {"type": "array", "items": items}
+    schema = {
+        "$schema": "http://json-schema.org/draft-04/schema#",
+        "title": "Grid",
+        "type": "object",
+        "properties": {
+            "cells": items,
+            "rows": {
+                "type": "array",
+                "items": {"type": "array", "items": {"type": "integer"}},
+            },
+        },
+    }
+    ns = pjo.ObjectBuilder(schema, validate_schema=False).build_classes()
+
+    grid = ns.Grid(rows=[[1, 2], [3]])
+    assert grid.serialize() == '{"rows": [[1, 2], [3]]}'
+    with pytest.raises(pjo.ValidationError):
+        ns.Grid(rows=[["x"]]).validate()
+
+
+def test_helpers_handle_depth():
+    depth = 2 * sys.getrecursionlimit()
+    schema = _nested(depth)
+
+    view = util.read_only_view(schema)
+    assert util.schema_digest(view) == util.schema_digest(schema)
+    with pytest.raises(TypeError):
+        view["properties"]["child"]["title"] = "changed"
+    assert util.shape_key(schema) == util.shape_key(util.copy_schema(schema))
+    assert util.shape_key(schema) != util.shape_key(_nested(depth + 1))
+    assert util.schema_digest(schema) != util.schema_digest(_nested(depth + 1))
+
+
+def test_json_pieces_match_json_dumps():
+    document = {"b": [1, 2.5, None, True, "é"], "a": {"x": {}}, "c": int}
+
+    assert "".join(util._json_pieces(document)) == json.dumps(
+        document, sort_keys=True, separators=(",", ":"), default=repr
+    )
+
+
+def test_dedupe_and_cache_handle_depth(tmp_path):
+    schema = _nested(2 * sys.getrecursionlimit())
+
+    builder = pjo.ObjectBuilder(schema, validate_schema=False)
+    ns = builder.build_classes(dedupe=True)
+    assert ns.Nested(child={"name": "x"}).child.name == "x"
+
+    for _ in range(2):
+        builder = pjo.ObjectBuilder(schema, validate_schema=False, cache=str(tmp_path))
+        ns = builder.build_classes()
+        assert ns.Nested(child={"name": "x"}).child.name == "x"
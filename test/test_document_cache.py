@@ -0,0 +1,86 @@
+import json
+import os
+
+import pytest
+
+import python_jsonschema_objects as pjo
+from python_jsonschema_objects.cache import DocumentCache, documents
+
+
+def _write(path, document, mtime_ns=None):
+    path.write_text(json.dumps(document))
+    if mtime_ns is not None:
+        os.utime(str(path), ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def schema_dir(tmp_path):
+    _write(
+        tmp_path / "common.json",
+        {"$schema": "http://json-schema.org/draft-04/schema#", "type": "string"},
+    )
+    for name in ("first", "second"):
+        _write(
+            tmp_path / (name + ".json"),
+            {
+                "$schema": "http://json-schema.org/draft-04/schema#",
+                "title": name,
+                "type": "object",
+                "properties": {"common": {"$ref": "file:///common.json"}},
+            },
+        )
+    documents.clear()
+    yield tmp_path
+    documents.clear()
+
+
+def test_builders_share_parsed_files(schema_dir):
+    for name in ("first", "second"):
+        builder = pjo.ObjectBuilder(str(schema_dir / (name + ".json")))
+        ns = builder.build_classes()
+        assert getattr(ns, name.capitalize())(common="x").common == "x"
+
+    info = documents.info()
+    assert info.misses == 1
+    assert info.hits >= 1
+    assert info.currsize == 1
+
+
+def test_changed_files_are_reparsed(tmp_path):
+    cache = DocumentCache()
+    path = tmp_path / "doc.json"
+    _write(path, {"type": "string"}, mtime_ns=10**18)
+    first = cache.load(str(path))
+    assert cache.load(str(path)) is first
+
+    _write(path, {"type": "number"}, mtime_ns=2 * 10**18)
+    assert cache.load(str(path)) == {"type": "number"}
+    assert cache.info()[:2] == (1, 2)
+
+
+def test_documents_are_read_only(tmp_path):
+    cache = DocumentCache()
+    path = tmp_path / "doc.json"
+    _write(path, {"properties": {"a": {"type": "string"}}})
+
+    document = cache.load(str(path))
+    with pytest.raises(TypeError):
+        document["properties"]["a"]["type"] = "number"
+
+
+def test_least_recently_used_is_evicted(tmp_path):
+    cache = DocumentCache(maxsize=2)
+    paths = []
+    for n in range(3):
+        paths.append(str(tmp_path / "doc{0}.json".format(n)))
+        _write(tmp_path / "doc{0}.json".format(n), {"n": n})
+
+    cache.load(paths[0])
+    cache.load(paths[1])
+    cache.load(paths[0])
+    cache.load(paths[2])
+    assert cache.info().evictions == 1
+
+    cache.load(paths[0])
+    cache.load(paths[1])
+    assert cache.info() == (2, 4, 2, 2, 2)
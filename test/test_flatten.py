@@ -0,0 +1,119 @@
+import importlib.util
+
+import pytest
+
+import python_jsonschema_objects as pjo
+from python_jsonschema_objects.classbuilder import ProtocolBase
+
+
+@pytest.fixture
+def schema():
+    return {
+        "$schema": "http://json-schema.org/draft-04/schema#",
+        "title": "Shapes",
+        "type": "object",
+        "properties": {"item": {"$ref": "#/definitions/labelledCircle"}},
+        "definitions": {
+            "shape": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string", "maxLength": 8},
+                    "visible": {"type": "boolean", "default": True},
+                },
+                "required": ["name"],
+            },
+            "circle": {
+                "allOf": [
+                    {"$ref": "#/definitions/shape"},
+                    {"type": "object", "properties": {"radius": {"type": "number"}}},
+                ]
+            },
+            "label": {
+                "type": "object",
+                "properties": {"text": {"type": "string"}},
+            },
+            "labelledCircle": {
+                "allOf": [
+                    {"$ref": "#/definitions/circle"},
+                    {"$ref": "#/definitions/label"},
+                    {"type": "object", "properties": {"size": {"type": "integer"}}},
+                ]
+            },
+        },
+    }
+
+
+def test_flattened_classes_derive_from_protocol_base(schema):
+    ns = pjo.ObjectBuilder(schema).build_classes(flatten=True)
+
+    assert ns.Labelledcircle.__bases__ == (ProtocolBase,)
+    assert ns.Circle.__bases__ == (ProtocolBase,)
+    assert ns.Shape not in ns.Labelledcircle.__mro__
+    for name in ("name", "visible", "radius", "text", "size"):
+        assert name in vars(ns.Labelledcircle)
+
+
+def test_flattened_classes_are_subclasses_of_their_parents(schema):
+    ns = pjo.ObjectBuilder(schema).build_classes(flatten=True)
+
+    obj = ns.Labelledcircle(name="c", radius=2, text="hi", size=3)
+    for parent in (ns.Shape, ns.Circle, ns.Label, ProtocolBase):
+        assert isinstance(obj, parent)
+        assert issubclass(ns.Labelledcircle, parent)
+    assert not isinstance(ns.Shape(name="s"), ns.Circle)
+    assert not issubclass(ns.Label, ns.Shape)
+    assert not issubclass(ns.Circle, ns.Label)
+
+
+def test_flattened_classes_behave_the_same(schema):
+    for flatten in (False, True):
+        ns = pjo.ObjectBuilder(schema).build_classes(flatten=flatten)
+
+        obj = ns.Labelledcircle(name="c", radius=2, text="hi", size=3)
+        assert obj.visible == True  # noqa: E712
+        assert obj.as_dict() == {
+            "name": "c",
+            "visible": True,
+            "radius": 2,
+            "text": "hi",
+            "size": 3,
+        }
+        assert ns.Labelledcircle.__required__ == {"name"}
+        with pytest.raises(pjo.ValidationError):
+            obj.name = "much too long"
+        with pytest.raises(pjo.ValidationError):
+            ns.Labelledcircle(radius=1).validate()
+
+        shapes = ns.Shapes(item={"name": "x", "size": 1})
+        assert isinstance(shapes.item, ns.Labelledcircle)
+        assert isinstance(shapes.item, ns.Circle)
+
+
+def test_flattening_survives_the_build_cache(tmp_path, schema):
+    pjo.ObjectBuilder(schema, cache=str(tmp_path)).build_classes(flatten=True)
+    ns = pjo.ObjectBuilder(schema, cache=str(tmp_path)).build_classes(flatten=True)
+
+    assert ns.Labelledcircle.__bases__ == (ProtocolBase,)
+    assert issubclass(ns.Labelledcircle, ns.Shape)
+    assert ns.Labelledcircle(name="c", radius=1).radius == 1
+
+
+def test_flattening_survives_code_generation(tmp_path, schema):
+    path = tmp_path / "shapes.py"
+    pjo.ObjectBuilder(schema).generate_module(str(path), flatten=True)
+
+    spec = importlib.util.spec_from_file_location(path.stem, str(path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    ns = module.namespace
+
+    assert ns.Labelledcircle.__bases__ == (ProtocolBase,)
+    assert issubclass(ns.Labelledcircle, ns.Circle)
+    assert isinstance(ns.Labelledcircle(name="c"), ns.Label)
+
+
+def test_nested_classes_are_not_registered(schema):
+    ns = pjo.ObjectBuilder(schema).build_classes()
+
+    assert ns.Circle in ns.Labelledcircle.__mro__
+    assert "__ancestors__" not in vars(ns.Labelledcircle)
@@ -0,0 +1,150 @@
+import gc
+import json
+
+import pytest
+
+import python_jsonschema_objects as pjo
+from python_jsonschema_objects.cache import ClassPool
+
+
+@pytest.fixture(autouse=True)
+def unfreeze():
+    yield
+    gc.unfreeze()
+
+
+@pytest.fixture
+def base_schema():
+    return {
+        "$schema": "http://json-schema.org/draft-04/schema#",
+        "id": "https://example.com/base.json",
+        "title": "Base",
+        "type": "object",
+        "properties": {
+            "name": {"type": "string"},
+            "kind": {"type": "string", "default": "base"},
+        },
+        "required": ["name"],
+    }
+
+
+def test_freeze(base_schema):
+    builder = pjo.ObjectBuilder(base_schema)
+    ns = builder.build_classes()
+
+    assert builder.freeze() >= 1
+    assert gc.get_freeze_count() > 0
+    assert isinstance(ns.Base.__required__, frozenset)
+    assert isinstance(ns.Base.__has_default__, frozenset)
+    with pytest.raises(TypeError):
+        ns.Base.__propinfo__["name"]["type"] = "integer"
+    with pytest.raises(TypeError):
+        ns.Base.__prop_names__["other"] = "other"
+    with pytest.raises(TypeError):
+        ns.Base.__dict__["kind"].info["default"] = "changed"
+
+    # The classes work as before; the builder is released.
+    assert ns.Base(name="x").kind == "base"
+    with pytest.raises(pjo.ValidationError):
+        ns.Base().validate()
+    with pytest.raises(RuntimeError):
+        builder.get_class("base")
+
+
+def test_freeze_needs_built_classes(base_schema):
+    with pytest.raises(RuntimeError):
+        pjo.ObjectBuilder(base_schema).freeze()
+
+    builder = pjo.ObjectBuilder(base_schema)
+    builder.build_classes(lazy=True)
+    with pytest.raises(RuntimeError):
+        builder.freeze()
+
+
+def test_frozen_classes_can_be_extended(base_schema, tmp_path):
+    # Pooled classes are shared with later builds, which may derive from them.
+    (tmp_path / "base.json").write_text(json.dumps(base_schema))
+    for title in ("First", "Second"):
+        derived = {
+            "$schema": "http://json-schema.org/draft-04/schema#",
+            "title": title,
+            "allOf": [
+                {"$ref": "file:///base.json"},
+                {
+                    "type": "object",
+                    "properties": {
+                        "extra": {"type": "integer"},
+                        # Linking this cycle walks the frozen pooled classes
+                        "next": {"$ref": "#"},
+                    },
+                },
+            ],
+        }
+        (tmp_path / (title + ".json")).write_text(json.dumps(derived))
+
+    pool = ClassPool()
+    builder = pjo.ObjectBuilder(str(tmp_path / "First.json"), class_pool=pool)
+    builder.build_classes()
+    builder.freeze()
+    ns = pjo.ObjectBuilder(
+        str(tmp_path / "Second.json"), class_pool=pool
+    ).build_classes()
+
+    assert pool.hits == 1
+    assert ns.Second.__required__ == {"name"}
+    assert ns.Second(name="x", extra=1).kind == "base"
+    assert ns.Second(name="x", next={"name": "y"}).next.name == "y"
+
+
+def test_frozen_metadata_stays_shared_and_usable():
+    schema = {
+        "$schema": "http://json-schema.org/draft-04/schema#",
+        "title": "Node",
+        "type": "object",
+        "properties": {
+            "tags": {"type": "array", "items": {"type": "string"}},
+            "extra": {"type": "object", "default": {"a": [1]}},
+            "next": {"$ref": "#"},
+            "either": {"oneOf": [{"type": "string"}, {"type": "integer"}]},
+        },
+    }
+    builder = pjo.ObjectBuilder(schema)
+    ns = builder.build_classes()
+    builder.freeze()
+
+    node = ns.Node
+    obj = node(tags=["a"], next={"either": 3})
+    assert obj.extra.as_dict() == {"a": [1]}
+    assert obj.next.either == 3
+    assert obj.as_dict()["tags"] == ["a"]
+
+
+def test_freezing_keeps_shared_property_dicts_shared(base_schema):
+    schema = {k: v for k, v in base_schema.items() if k != "required"}
+    schema.update(
+        properties={"base": {"$ref": "#/definitions/base"}},
+        definitions={
+            "base": {"type": "object", "properties": base_schema["properties"]},
+            "derived": {
+                "allOf": [
+                    {"$ref": "#/definitions/base"},
+                    {"type": "object", "properties": {"extra": {"type": "integer"}}},
+                ]
+            },
+        },
+    )
+    builder = pjo.ObjectBuilder(schema)
+    builder.build_classes()
+    uri = builder.resolver._base_uri + "#/definitions/"
+    base, derived = builder.get_class(uri + "base"), builder.get_class(uri + "derived")
+    shared = [
+        name
+        for name, detail in base.__propinfo__.items()
+        if derived.__propinfo__[name] is detail
+    ]
+    assert shared
+    builder.freeze()
+
+    for name in shared:
+        assert derived.__propinfo__[name] is base.__propinfo__[name]
+    assert derived(name="x", extra=1).kind == "base"
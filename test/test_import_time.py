@@ -0,0 +1,44 @@
+import subprocess
+import sys
+
+import pytest
+
+import python_jsonschema_objects as pjo
+
+DEFERRED = ["jsonschema", "referencing", "markdown", "inflection"]
+
+
+def imported_after(code):
+    """Run `code` in a new interpreter; return the modules it has loaded."""
+    script = code + "; import sys; print(' '.join(sys.modules))"
+    output = subprocess.check_output([sys.executable, "-c", script])
+    return output.decode().split()
+
+
+def test_import_defers_heavy_dependencies():
+    modules = imported_after("import python_jsonschema_objects")
+
+    assert "python_jsonschema_objects" in modules
+    for name in DEFERRED + ["python_jsonschema_objects._version"]:
+        assert name not in modules, name
+
+
+def test_deferred_modules_load_when_used():
+    modules = imported_after(
+        "import python_jsonschema_objects as pjo; "
+        "pjo.ObjectBuilder({'title': 'Foo', 'type': 'object'}).build_classes()"
+    )
+    assert "jsonschema" in modules
+    assert "referencing" in modules
+    assert "inflection" in modules
+    assert "markdown" not in modules
+
+
+def test_lazy_attributes():
+    assert pjo.__version__ == pjo._version.get_versions()["version"]
+    assert pjo.markdown_support.extract_code_blocks
+    assert pjo.codegen.generate_module
+    assert pjo.graph.RefGraph
+
+    with pytest.raises(AttributeError):
+        pjo.no_such_module
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+import python_jsonschema_objects as pjo
+
+DRAFT4 = "http://json-schema.org/draft-04/schema#"
+
+
+def _write(path, document):
+    path.write_text(json.dumps(document))
+
+
+def _root(title="Root"):
+    return {
+        "$schema": DRAFT4,
+        "title": title,
+        "type": "object",
+        "properties": {
+            "user": {"$ref": "#/definitions/uses_a"},
+            "other": {"$ref": "file:///b.json"},
+        },
+        "definitions": {
+            "uses_a": {
+                "type": "object",
+                "properties": {"a": {"$ref": "file:///a.json"}},
+            },
+            "plain": {"type": "object", "properties": {"x": {"type": "integer"}}},
+        },
+    }
+
+
+def _leaf(title, typ):
+    return {
+        "$schema": DRAFT4,
+        "title": title,
+        "type": "object",
+        "properties": {"value": {"type": typ}},
+    }
+
+
+@pytest.fixture
+def schema_dir(tmp_path):
+    _write(tmp_path / "root.json", _root())
+    _write(tmp_path / "a.json", _leaf("A", "string"))
+    _write(tmp_path / "b.json", _leaf("B", "string"))
+    return tmp_path
+
+
+def test_rebuild_only_affected_classes(schema_dir):
+    builder = pjo.ObjectBuilder(str(schema_dir / "root.json"))
+    before = builder.build_classes()
+    before.Root(user={"a": {"value": "text"}})
+
+    _write(schema_dir / "a.json", _leaf("A", "integer"))
+    after = builder.rebuild([str(schema_dir / "a.json")])
+
+    assert sorted(after) == sorted(before)
+    for name in ("A", "UsesA", "Root"):
+        assert after[name] is not before[name]
+    for name in ("B", "Plain"):
+        assert after[name] is before[name]
+
+    after.Root(user={"a": {"value": 1}}, other={"value": "text"})
+    with pytest.raises(pjo.ValidationError):
+        after.Root(user={"a": {"value": "text"}})
+    # The old namespace is left as it was
+    before.Root(user={"a": {"value": "text"}})
+
+
+def test_rebuild_root_schema(schema_dir):
+    builder = pjo.ObjectBuilder(str(schema_dir / "root.json"))
+    before = builder.build_classes()
+
+    _write(schema_dir / "root.json", _root("Renamed"))
+    after = builder.rebuild([str(schema_dir / "root.json")])
+
+    assert "Renamed" in after and "Root" not in after
+    assert after.B is before.B
+    assert after.A is before.A
+    assert after.Plain is not before.Plain
+    assert builder.schema["title"] == "Renamed"
+
+
+def test_rebuild_ignores_unrelated_files(schema_dir):
+    builder = pjo.ObjectBuilder(str(schema_dir / "root.json"))
+    before = builder.build_classes(strict=True)
+
+    after = builder.rebuild([str(schema_dir / "unrelated.json")])
+    assert all(after[name] is before[name] for name in before)
+    with pytest.raises(pjo.ValidationError):
+        after.Plain(x="not an integer")
+
+
+def test_rebuild_requires_a_build(schema_dir):
+    builder = pjo.ObjectBuilder(str(schema_dir / "root.json"))
+    with pytest.raises(RuntimeError):
+        builder.rebuild([str(schema_dir / "a.json")])
@@ -0,0 +1,84 @@
+import pytest
+
+import python_jsonschema_objects as pjo
+
+
+@pytest.fixture
+def schema():
+    return {
+        "$schema": "http://json-schema.org/draft-04/schema#",
+        "title": "Root",
+        "type": "object",
+        "properties": {"a": {"$ref": "#/definitions/a"}},
+        "definitions": {
+            "a": {
+                "title": "A",
+                "type": "object",
+                "properties": {
+                    "b": {"$ref": "#/definitions/b"},
+                    "inner": {
+                        "type": "object",
+                        "properties": {"x": {"type": "integer"}},
+                    },
+                },
+            },
+            "b": {
+                "type": "object",
+                "properties": {"a": {"$ref": "#/definitions/a"}},
+            },
+            "unused": {
+                "title": "Unused",
+                "type": "object",
+                "properties": {"name": {"type": "string"}},
+            },
+            "other": {"type": "string"},
+        },
+    }
+
+
+def test_lazy_namespace_builds_on_access(schema):
+    builder = pjo.ObjectBuilder(schema)
+    ns = builder.build_classes(lazy=True)
+
+    assert sorted(ns) == ["A", "B", "Other", "Root", "Unused"]
+    assert builder._resolved == {}
+
+    a = ns.A(b={"a": {"inner": {"x": 1}}})
+    assert a.b.a.inner.x == 1
+    assert "#/definitions/a" in builder._resolved
+    assert "#/definitions/b" in builder._resolved
+    assert "#/definitions/unused" not in builder._resolved
+
+    # Circular references go through TypeRef just as in an eager build.
+    assert isinstance(a.b.a, ns.A)
+    assert ns.B is builder.get_class("#/definitions/b")
+
+
+def test_lazy_get_class(schema):
+    builder = pjo.ObjectBuilder(schema)
+    builder.build_classes(lazy=True)
+
+    unused = builder.get_class("#/definitions/unused")
+    assert unused(name="foo").name == "foo"
+    assert "#/definitions/a" not in builder._resolved
+
+    inner = builder.get_class("#/definitions/a/inner_<anonymous>")
+    assert inner(x=2).x == 2
+    assert builder.get_class("#/definitions/nothing") is None
+
+
+def test_lazy_matches_eager_validation(schema):
+    eager = pjo.ObjectBuilder(schema).build_classes()
+    lazy = pjo.ObjectBuilder(schema).build_classes(lazy=True)
+
+    for ns in (eager, lazy):
+        with pytest.raises(pjo.ValidationError):
+            ns.A(inner={"x": "not a number"})
+        with pytest.raises(pjo.ValidationError):
+            ns.Other(1)
+        assert ns.Root(a={"b": {}}).serialize() == '{"a": {"b": {}}}'
+
+
+def test_lazy_named_only(schema):
+    ns = pjo.ObjectBuilder(schema).build_classes(lazy=True, named_only=True)
+    assert sorted(ns) == ["A", "Root", "Unused"]
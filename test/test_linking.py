@@ -0,0 +1,93 @@
+import pytest
+
+import python_jsonschema_objects as pjo
+from python_jsonschema_objects.classbuilder import TypeRef
+from python_jsonschema_objects.descriptors import AttributeDescriptor
+from python_jsonschema_objects.wrapper_types import ArrayWrapper
+
+
+@pytest.fixture
+def tree_schema():
+    return {
+        "$schema": "http://json-schema.org/draft-04/schema#",
+        "title": "Tree",
+        "type": "object",
+        "properties": {"root": {"$ref": "#/definitions/node"}},
+        "definitions": {
+            "node": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "parent": {"$ref": "#/definitions/node"},
+                    "alias": {"$ref": "#/definitions/alias"},
+                    "children": {
+                        "type": "array",
+                        "items": {"$ref": "#/definitions/node"},
+                    },
+                    "either": {
+                        "oneOf": [
+                            {"$ref": "#/definitions/node"},
+                            {"type": "string"},
+                        ]
+                    },
+                },
+            },
+            "alias": {"$ref": "#/definitions/node"},
+        },
+    }
+
+
+def _reachable(cls):
+    """Yield the types held by the descriptors and validators of `cls`."""
+    for attr in vars(cls).values():
+        if not isinstance(attr, AttributeDescriptor):
+            continue
+        types = attr.info["type"]
+        for typ in types if isinstance(types, list) else [types]:
+            yield typ
+        validator = attr.info.get("validator")
+        if validator is not None:
+            yield validator
+            yield validator.__itemtype__
+
+
+def test_type_refs_are_linked_after_the_build(tree_schema):
+    builder = pjo.ObjectBuilder(tree_schema)
+    ns = builder.build_classes()
+    assert builder._builder._type_refs, "the schema should need TypeRefs"
+
+    node = builder.get_class(builder.resolver._base_uri + "#/definitions/node")
+    reachable = list(_reachable(node))
+    assert not any(isinstance(t, TypeRef) for t in reachable)
+    assert reachable.count(node) >= 3
+    assert not any(isinstance(t, TypeRef) for t in builder._resolved.values())
+    assert ns.Alias is node
+    for detail in node.__propinfo__.values():
+        assert not isinstance(detail.get("type"), TypeRef)
+
+
+def test_linked_classes_behave_the_same(tree_schema):
+    ns = pjo.ObjectBuilder(tree_schema).build_classes()
+
+    child = ns.Node(name="child")
+    tree = ns.Tree(root={"name": "root", "children": [child, {"name": "other"}]})
+    tree.root.parent = {"name": "up"}
+    tree.root.alias = {"name": "again"}
+
+    assert tree.root.children[0] is child
+    assert isinstance(tree.root.children[1], ns.Node)
+    assert isinstance(tree.root.parent, ns.Node)
+    assert isinstance(tree.root.alias, ns.Node)
+    assert tree.as_dict()["root"]["children"][1] == {"name": "other"}
+    with pytest.raises(pjo.ValidationError):
+        tree.root.parent = {"name": 3}
+
+
+def test_warm_up_links_type_refs(tree_schema):
+    builder = pjo.ObjectBuilder(tree_schema)
+    ns = builder.warm_up().result(timeout=10)
+
+    node = builder.get_class(builder.resolver._base_uri + "#/definitions/node")
+    assert not any(isinstance(t, TypeRef) for t in _reachable(node))
+    assert ns.Node is node
+    assert issubclass(vars(node)["children"].info["validator"], ArrayWrapper)
@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+import python_jsonschema_objects as pjo
+from python_jsonschema_objects.loader import SchemaLoader
+
+DRAFT4 = "http://json-schema.org/draft-04/schema#"
+
+
+@pytest.fixture
+def schema_dir(tmp_path):
+    documents = {
+        "common/money.json": {
+            "$schema": DRAFT4,
+            "id": "https://example.com/money.json",
+            "definitions": {
+                "currency": {"type": "string", "enum": ["EUR", "USD"]},
+                "amount": {
+                    "type": "object",
+                    "properties": {
+                        "value": {"type": "number"},
+                        "currency": {"$ref": "#/definitions/currency"},
+                    },
+                },
+            },
+        },
+        "order.json": {
+            "$schema": DRAFT4,
+            "title": "Order",
+            "type": "object",
+            "properties": {
+                "total": {"$ref": "file:///common/money.json#/definitions/amount"},
+                "lines": {"type": "array", "items": {"$ref": "line.json"}},
+            },
+        },
+        "line.json": {
+            "$schema": DRAFT4,
+            "type": "object",
+            "properties": {
+                "price": {"$ref": "https://example.com/money.json#/definitions/amount"},
+                "sku": {"type": "string"},
+            },
+        },
+    }
+    for name, document in documents.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(document))
+    return tmp_path
+
+
+def test_loader_builds_a_namespace_per_file(schema_dir):
+    loader = SchemaLoader(str(schema_dir))
+    namespaces = loader.build_classes()
+
+    assert sorted(namespaces) == ["common/money.json", "line.json", "order.json"]
+    money = namespaces["common/money.json"]
+    assert {"Currency", "Amount"} <= set(money)
+    assert "Line" in namespaces["line.json"]
+    assert "Order" in namespaces["order.json"]
+
+    order = namespaces["order.json"].Order(
+        total={"value": 3, "currency": "EUR"},
+        lines=[{"sku": "x", "price": {"value": 3, "currency": "USD"}}],
+    )
+    assert isinstance(order.total, money.Amount)
+    assert isinstance(order.lines[0], namespaces["line.json"].Line)
+    assert isinstance(order.lines[0].price, money.Amount)
+    with pytest.raises(pjo.ValidationError):
+        order.total.currency = "GBP"
+
+
+def test_shared_schemas_are_built_once(schema_dir):
+    loader = SchemaLoader(str(schema_dir))
+    ns = loader.build_classes(merge=True)
+
+    assert {"Order", "Line", "Amount", "Currency"} <= set(ns)
+    amount = "file:///common/money.json#/definitions/amount"
+    assert loader._builder.resolved[amount] is ns.Amount
+    assert not any(
+        uri.startswith("https://example.com/money.json")
+        for uri in loader._builder.resolved
+    ), "classes reached through the id should be keyed by the file URI"
+
+
+def test_loader_accepts_a_list_of_files(schema_dir):
+    loader = SchemaLoader(
+        [str(schema_dir / "order.json"), str(schema_dir / "common" / "money.json")]
+    )
+    namespaces = loader.build_classes()
+
+    assert sorted(namespaces) == ["common/money.json", "order.json"]
+    # Files outside the list are still retrieved when referenced.
+    order = namespaces["order.json"].Order(total={"value": 1, "currency": "EUR"})
+    assert order.total.value == 1
+
+
+def test_duplicate_ids_are_rejected(schema_dir):
+    copy = json.loads((schema_dir / "common" / "money.json").read_text())
+    (schema_dir / "money2.json").write_text(json.dumps(copy))
+
+    with pytest.raises(ValueError):
+        SchemaLoader(str(schema_dir))
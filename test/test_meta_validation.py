@@ -0,0 +1,87 @@
+import jsonschema
+import pytest
+
+import python_jsonschema_objects as pjo
+from python_jsonschema_objects.cache import BuildCache, validated_schemas
+
+
+@pytest.fixture
+def schema():
+    return {
+        "$schema": "http://json-schema.org/draft-04/schema#",
+        "id": "meta",
+        "title": "Meta",
+        "type": "object",
+        "properties": {"name": {"type": "string"}},
+    }
+
+
+@pytest.fixture(autouse=True)
+def clear_validated():
+    validated_schemas.clear()
+    yield
+    validated_schemas.clear()
+
+
+@pytest.fixture
+def spy(mocker):
+    return mocker.spy(pjo.ObjectBuilder, "validate_schema")
+
+
+def test_invalid_schema_is_rejected_by_default(schema):
+    schema["properties"]["name"]["type"] = 5
+    with pytest.raises(jsonschema.ValidationError):
+        pjo.ObjectBuilder(schema)
+
+
+def test_validation_can_be_skipped(schema, spy):
+    schema["properties"]["name"]["minLength"] = "x"
+    builder = pjo.ObjectBuilder(schema, validate_schema=False)
+    assert spy.call_count == 0
+    assert builder._validator is None
+
+    with pytest.raises(jsonschema.ValidationError):
+        builder.validate_schema()
+
+
+def test_validator_is_created_on_first_use(schema):
+    builder = pjo.ObjectBuilder(schema)
+    assert builder._validator is None
+
+    builder.validate({"name": "x"})
+    validator = builder.validator
+    assert validator is builder.validator
+    with pytest.raises(pjo.ValidationError):
+        builder.validate({"name": 1})
+
+
+def test_validation_is_cached_by_digest(schema, spy):
+    pjo.ObjectBuilder(schema, validate_schema="cache")
+    pjo.ObjectBuilder(schema, validate_schema="cache")
+    assert spy.call_count == 1
+
+    schema["title"] = "Changed"
+    pjo.ObjectBuilder(schema, validate_schema="cache")
+    assert spy.call_count == 2
+
+
+def test_failed_validation_is_not_cached(schema, spy):
+    schema["properties"]["name"]["type"] = 5
+    for _ in range(2):
+        with pytest.raises(jsonschema.ValidationError):
+            pjo.ObjectBuilder(schema, validate_schema="cache")
+    assert spy.call_count == 2
+
+
+def test_validation_is_cached_on_disk(tmp_path, schema, spy):
+    cache = BuildCache(str(tmp_path))
+    pjo.ObjectBuilder(schema, cache=cache, validate_schema="cache")
+    validated_schemas.clear()
+
+    pjo.ObjectBuilder(schema, cache=cache, validate_schema="cache")
+    assert spy.call_count == 1
+
+
+def test_bad_option_is_rejected(schema):
+    with pytest.raises(ValueError):
+        pjo.ObjectBuilder(schema, validate_schema="sometimes")
@@ -0,0 +1,110 @@
+import threading
+
+import pytest
+
+import python_jsonschema_objects as pjo
+from python_jsonschema_objects.cache import NamespaceCache
+
+
+def _schema(title, properties=1):
+    return {
+        "$schema": "http://json-schema.org/draft-04/schema#",
+        "id": title,
+        "title": title,
+        "type": "object",
+        "properties": {
+            "p%d" % n: {"type": "string", "maxLength": 3} for n in range(properties)
+        },
+    }
+
+
+def test_get_or_build(mocker):
+    cache = NamespaceCache(maxsize=2)
+    spy = mocker.spy(pjo.ObjectBuilder, "build_classes")
+
+    first = cache.get(_schema("A"))
+    assert cache.get(_schema("A")) is first
+    assert cache.get(_schema("A"), strict=True) is not first
+    assert spy.call_count == 2
+    assert cache.info()[:3] == (1, 2, 0)
+
+    with pytest.raises(pjo.ValidationError):
+        first.A(p0="long")
+
+
+def test_least_recently_used_is_evicted():
+    cache = NamespaceCache(maxsize=2)
+    a = cache.get(_schema("A"))
+    cache.get(_schema("B"))
+    cache.get(_schema("A"))
+    cache.get(_schema("C"))
+
+    assert cache.info().evictions == 1
+    assert cache.get(_schema("A")) is a
+    assert cache.info().currsize == 2
+
+
+def test_weight_budget():
+    cache = NamespaceCache(maxsize=10, max_weight=25, weigher=lambda classes: 10)
+    for title in "ABC":
+        cache.get(_schema(title))
+    assert cache.info().currsize == 2
+    assert cache.weight == 20
+
+    sized = NamespaceCache()
+    sized.get(_schema("Small"))
+    small = sized.weight
+    sized.clear()
+    sized.get(_schema("Large", properties=20))
+    assert sized.weight > small > 0
+
+
+def test_concurrent_requests_build_once(mocker):
+    cache = NamespaceCache()
+    started = threading.Event()
+    release = threading.Event()
+    original = NamespaceCache._build
+
+    def slow_build(self, schema, build_options):
+        started.set()
+        release.wait(5)
+        return original(self, schema, build_options)
+
+    mocker.patch.object(NamespaceCache, "_build", slow_build)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get(_schema("A"))))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    started.wait(5)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(results) == 4
+    assert all(ns is results[0] for ns in results)
+    assert cache.info().misses == 1
+
+
+def test_failed_builds_are_not_cached():
+    cache = NamespaceCache()
+    bad = _schema("Bad")
+    bad["required"] = ["missing"]
+    for _ in range(2):
+        with pytest.raises(pjo.ValidationError):
+            cache.get(bad)
+    assert cache.info().misses == 2
+    assert cache.info().currsize == 0
+
+
+def test_schema_paths(tmp_path):
+    path = tmp_path / "schema.json"
+    path.write_text('{"title": "FromFile", "type": "object", "id": "f"}')
+    cache = NamespaceCache(validate_schema=False)
+
+    ns = cache.get(str(path))
+    assert cache.get(str(path)) is ns
+    path.write_text('{"title": "Changed", "type": "object", "id": "f"}')
+    assert "Changed" in cache.get(str(path))
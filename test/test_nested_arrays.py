@@ -75,3 +75,43 @@ def test_array_wrapper(complex_schema):
     ns = builder.build_classes()
     m = ns.Mission(**instance)
     m.validate()
+
+
+@pytest.fixture
+def matrix_schema():
+    return {
+        "$schema": "http://json-schema.org/draft-04/schema#",
+        "title": "Doc",
+        "type": "object",
+        "properties": {"m": {"$ref": "#/definitions/matrix"}},
+        "definitions": {
+            "matrix": {
+                "type": "array",
+                "items": {"type": "array", "items": {"type": "integer"}, "minItems": 2},
+            }
+        },
+    }
+
+
+def test_item_arrays_are_not_in_the_namespace(matrix_schema):
+    ns = pjo.ObjectBuilder(matrix_schema).build_classes()
+
+    assert sorted(ns) == ["Doc", "Matrix"]
+    assert ns.Doc(m=[[1, 2], [3, 4]]).m[1][0] == 3
+    with pytest.raises(pjo.ValidationError):
+        ns.Doc(m=[["x", 1]]).validate()
+
+
+def test_item_array_constraints_are_enforced(matrix_schema):
+    ns = pjo.ObjectBuilder(matrix_schema).build_classes()
+
+    ns.Doc(m=[[1, 2], [3, 4, 5]]).validate()
+    with pytest.raises(pjo.ValidationError):
+        ns.Doc(m=[[1], [2, 3]]).validate()
+
+    inline = dict(
+        matrix_schema, properties={"m": matrix_schema["definitions"]["matrix"]}
+    )
+    ns = pjo.ObjectBuilder(inline).build_classes()
+    with pytest.raises(pjo.ValidationError):
+        ns.Doc(m=[[1], [2, 3]]).validate()
@@ -0,0 +1,152 @@
+import http.server
+import json
+import threading
+import time
+import urllib.request
+
+import pytest
+import referencing.exceptions
+import referencing.jsonschema
+
+import python_jsonschema_objects as pjo
+
+DRAFT4 = "http://json-schema.org/draft-04/schema#"
+
+
+class SchemaServer(http.server.ThreadingHTTPServer):
+    """Serves `documents` slowly, counting requests and peak concurrency."""
+
+    def __init__(self, documents):
+        super().__init__(("127.0.0.1", 0), SchemaHandler)
+        self.documents = documents
+        self.requests = []
+        self.active = self.peak = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:{0}/".format(self.server_address[1])
+
+
+class SchemaHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        time.sleep(0.05)
+        with server.lock:
+            server.active -= 1
+
+        document = server.documents.get(self.path.lstrip("/"))
+        if document is None:
+            self.send_error(404)
+            return
+        body = json.dumps(document).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    documents = {
+        "types/%d.json"
+        % i: {
+            "$schema": DRAFT4,
+            "type": "object",
+            "properties": {
+                "value": {"type": "integer"},
+                "unit": {"$ref": "../units.json#/definitions/unit"},
+            },
+        }
+        for i in range(6)
+    }
+    documents["units.json"] = {
+        "$schema": DRAFT4,
+        "definitions": {"unit": {"type": "string", "enum": ["m", "s"]}},
+    }
+    server = SchemaServer(documents)
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def retrieve(uri):
+    with urllib.request.urlopen(uri) as response:
+        return referencing.jsonschema.DRAFT4.create_resource(json.load(response))
+
+
+def _schema(server):
+    return {
+        "$schema": DRAFT4,
+        "title": "Measurements",
+        "type": "object",
+        "properties": {
+            "m%d" % i: {"$ref": server.url + "types/%d.json" % i} for i in range(6)
+        },
+    }
+
+
+def test_prefetch_retrieves_documents_in_parallel(server):
+    builder = pjo.ObjectBuilder(_schema(server), resolver=retrieve)
+
+    retrieved = builder.prefetch(max_workers=6)
+
+    assert sorted(retrieved) == sorted(
+        [server.url + "types/%d.json" % i for i in range(6)]
+        + [server.url + "units.json"]
+    )
+    assert server.peak > 1
+    assert len(server.requests) == 7
+
+    ns = builder.build_classes()
+    assert len(server.requests) == 7
+    measurements = ns.Measurements(m3={"value": 2, "unit": "s"})
+    assert measurements.m3.value == 2
+    with pytest.raises(pjo.ValidationError):
+        measurements.m3.unit = "kg"
+
+
+def test_prefetch_follows_properties_named_like_data_keywords(server):
+    schema = {
+        "$schema": DRAFT4,
+        "title": "Keywords",
+        "type": "object",
+        "properties": {
+            name: {"$ref": server.url + "types/%d.json" % i}
+            for i, name in enumerate(["default", "enum", "const", "examples"])
+        },
+    }
+    builder = pjo.ObjectBuilder(schema, resolver=retrieve)
+
+    assert len(builder.prefetch()) == 5
+    builder.build_classes()
+    assert len(server.requests) == 5
+
+
+def test_prefetch_skips_registered_documents(server):
+    builder = pjo.ObjectBuilder(_schema(server), resolver=retrieve)
+    builder.prefetch()
+
+    assert builder.prefetch() == []
+    assert len(server.requests) == 7
+
+
+def test_prefetch_reports_unretrievable_documents(server):
+    schema = _schema(server)
+    schema["properties"]["missing"] = {"$ref": server.url + "missing.json"}
+    builder = pjo.ObjectBuilder(schema, resolver=retrieve)
+
+    with pytest.raises(referencing.exceptions.Unretrievable):
+        builder.prefetch()
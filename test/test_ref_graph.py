@@ -0,0 +1,109 @@
+import pytest
+
+import python_jsonschema_objects as pjo
+from python_jsonschema_objects.graph import RefGraph
+
+
+@pytest.fixture
+def schema():
+    return {
+        "$schema": "http://json-schema.org/draft-04/schema#",
+        "id": "graph",
+        "title": "Service",
+        "type": "object",
+        "properties": {"order": {"$ref": "#/definitions/order"}},
+        "definitions": {
+            "order": {
+                "type": "object",
+                "properties": {
+                    "customer": {"$ref": "#/definitions/customer"},
+                    "lines": {"type": "array", "items": {"$ref": "#/definitions/line"}},
+                },
+            },
+            "customer": {
+                "type": "object",
+                "properties": {
+                    "orders": {
+                        "type": "array",
+                        "items": {"$ref": "#/definitions/order"},
+                    }
+                },
+            },
+            "line": {
+                "type": "object",
+                "properties": {
+                    "sku": {"type": "string"},
+                    "parent": {"$ref": "#/definitions/line"},
+                },
+            },
+            "invoice": {
+                "type": "object",
+                "properties": {
+                    "address": {
+                        "type": "object",
+                        "properties": {"city": {"type": "string"}},
+                    }
+                },
+            },
+        },
+    }
+
+
+def test_ref_graph_after_build(schema):
+    builder = pjo.ObjectBuilder(schema)
+    builder.build_classes()
+    graph = builder.ref_graph()
+
+    assert "#/definitions/customer" in graph.successors("#/definitions/order")
+    assert "#/definitions/order" in graph.predecessors("#/definitions/customer")
+    assert "#/definitions/invoice/address_<anonymous>" in graph.successors(
+        "#/definitions/invoice"
+    )
+    assert "#/definitions/invoice" not in graph.reachable(["service"])
+
+    cycles = {frozenset(c) for c in graph.cycles()}
+    assert frozenset(["#/definitions/line"]) in cycles
+    assert any({"#/definitions/order", "#/definitions/customer"} <= c for c in cycles)
+
+
+def test_build_only_reachable_classes(schema):
+    builder = pjo.ObjectBuilder(schema)
+    ns = builder.build_classes(roots=["order"])
+
+    assert {"Customer", "Line", "Order"} <= set(ns)
+    assert "Invoice" not in ns and "Service" not in ns
+    order = ns.Order(lines=[{"sku": "a"}], customer={"orders": []})
+    assert order.lines[0].sku == "a"
+    assert builder.get_class("#/definitions/invoice") is None
+
+    ns = builder.build_classes(roots=["#/definitions/invoice", "service"])
+    assert "Invoice" in ns and "Service" in ns and "Line" in ns
+
+
+def test_unknown_root(schema):
+    with pytest.raises(ValueError):
+        pjo.ObjectBuilder(schema).build_classes(roots=["nonexistent"])
+
+
+def test_ref_graph_requires_a_build(schema):
+    with pytest.raises(RuntimeError):
+        pjo.ObjectBuilder(schema).ref_graph()
+
+
+def test_strongly_connected_components_are_ordered():
+    graph = RefGraph({"a": {"b"}, "b": {"c", "a"}, "c": {"d"}, "d": set()}, ["e"])
+
+    components = graph.strongly_connected_components()
+    assert sorted(map(sorted, components)) == [["a", "b"], ["c"], ["d"], ["e"]]
+    position = {uri: i for i, c in enumerate(components) for uri in c}
+    assert position["d"] < position["c"] < position["a"]
+    assert graph.cycles() == [frozenset(["a", "b"])]
+    assert graph.subgraph(["a", "c"]).edges == []
+    assert graph.subgraph(["a", "b"]).edges == [("a", "b"), ("b", "a")]
+
+
+def test_long_chains_do_not_recurse():
+    chain = {str(n): {str(n + 1)} for n in range(5000)}
+    graph = RefGraph(chain)
+    assert len(graph.strongly_connected_components()) == 5001
+    assert len(graph.reachable(["0"])) == 5001
@@ -0,0 +1,108 @@
+import gc
+import logging
+import weakref
+
+import pytest
+
+import python_jsonschema_objects as pjo
+
+
+@pytest.fixture(autouse=True)
+def quiet_logging():
+    # Captured debug records, which other test modules turn on, keep the
+    # classes they mention alive.
+    logger = logging.getLogger("python_jsonschema_objects")
+    level = logger.level
+    logger.setLevel(logging.WARNING)
+    yield
+    logger.setLevel(level)
+
+
+def _schema(version):
+    return {
+        "$schema": "http://json-schema.org/draft-04/schema#",
+        "id": "version%d" % version,
+        "title": "Root",
+        "type": "object",
+        "properties": {
+            "node": {"$ref": "#/definitions/node"},
+            "tags": {"type": "array", "items": {"type": "string"}},
+        },
+        "definitions": {
+            "node": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string", "enum": ["v%d" % version]},
+                    "child": {"$ref": "#/definitions/node"},
+                },
+            },
+            "other": {
+                "title": "Other",
+                "type": "object",
+                "properties": {"value": {"type": "integer"}},
+            },
+        },
+    }
+
+
+def test_released_builder_cannot_be_used():
+    builder = pjo.ObjectBuilder(_schema(0))
+    ns = builder.build_classes()
+    builder.release()
+
+    assert ns.Root(node={"name": "v0", "child": {"name": "v0"}}).node.child.name == "v0"
+    with pytest.raises(RuntimeError):
+        builder.get_class("#/definitions/node")
+    with pytest.raises(RuntimeError):
+        builder.build_classes()
+    with pytest.raises(RuntimeError):
+        builder.validate({})
+
+
+def test_lazy_builds_cannot_be_released():
+    builder = pjo.ObjectBuilder(_schema(0))
+    builder.build_classes(lazy=True)
+
+    with pytest.raises(RuntimeError):
+        builder.release()
+
+
+def test_released_classes_only_keep_what_they_refer_to():
+    builder = pjo.ObjectBuilder(_schema(0))
+    ns = builder.build_classes()
+    ns.Node(name="v0", child={"name": "v0"})
+    builder.release()
+
+    node = ns.Node
+    other = weakref.ref(ns.Other)
+    del ns
+    gc.collect()
+
+    # Node refers to itself through a TypeRef, which no longer holds on to
+    # every class the build made.
+    assert other() is None
+    assert node(child={"name": "v0"}).child.name == "v0"
+
+
+def test_memory_is_flat_when_cycling_schema_versions():
+    def build(version):
+        builder = pjo.ObjectBuilder(_schema(version), validate_schema=False)
+        ns = builder.build_classes()
+        builder.release()
+        return ns.Root(node={"name": "v%d" % version})
+
+    for version in range(100):
+        build(version)
+    gc.collect()
+    objects = len(gc.get_objects())
+    subclasses = len(pjo.classbuilder.ProtocolBase.__subclasses__())
+
+    for version in range(100, 1100):
+        build(version)
+        if version % 50 == 0:
+            gc.collect()
+    gc.collect()
+
+    # Each version creates a few hundred objects, none of which survive.
+    assert len(pjo.classbuilder.ProtocolBase.__subclasses__()) == subclasses
+    assert len(gc.get_objects()) - objects < 100
@@ -0,0 +1,77 @@
+import copy
+import json
+
+import pytest
+
+import python_jsonschema_objects as pjo
+
+
+@pytest.fixture
+def schema():
+    return {
+        "$schema": "http://json-schema.org/draft-04/schema#",
+        "id": "view",
+        "title": "View",
+        "type": "object",
+        "properties": {
+            "child": {"$ref": "#/definitions/child"},
+            "inline": {"type": "object", "properties": {"x": {"type": "string"}}},
+            "choice": {"anyOf": [{"type": "string"}, {"type": "integer"}]},
+        },
+        "definitions": {
+            "base": {"type": "object", "properties": {"id": {"type": "string"}}},
+            "child": {
+                "allOf": [
+                    {"$ref": "#/definitions/base"},
+                    {"properties": {"name": {"type": "string"}}},
+                ]
+            },
+        },
+    }
+
+
+def test_schema_view_is_read_only_and_shared(schema):
+    builder = pjo.ObjectBuilder(schema)
+
+    view = builder.schema
+    assert view is builder.schema
+    assert view == schema
+    assert json.loads(json.dumps(view)) == schema
+
+    with pytest.raises(TypeError):
+        view["title"] = "Other"
+    with pytest.raises(TypeError):
+        view["properties"]["child"].pop("$ref")
+    with pytest.raises(TypeError):
+        view["definitions"]["child"]["allOf"].append({})
+
+    mutable = copy.deepcopy(view)
+    mutable["title"] = "Other"
+    assert type(mutable) is dict
+    assert builder.schema["title"] == "View"
+
+
+def test_builds_leave_schema_untouched(schema):
+    original = copy.deepcopy(schema)
+    builder = pjo.ObjectBuilder(schema)
+
+    first = builder.build_classes(any_of="use-first")
+    second = builder.build_classes(any_of="use-first")
+
+    assert schema == original
+    assert builder.schema == original
+    assert sorted(first) == sorted(second)
+    assert second.Child(id="a", name="b").name == "b"
+
+
+def test_caller_schema_is_not_shared(schema):
+    builder = pjo.ObjectBuilder(schema)
+    schema["properties"]["child"] = {"type": "string"}
+
+    ns = builder.build_classes(any_of="use-first")
+    assert ns.View(child={"id": "a"}).child.id == "a"
+
+
+def test_resolver_is_reused(schema):
+    builder = pjo.ObjectBuilder(schema)
+    assert builder.resolver is builder.resolver
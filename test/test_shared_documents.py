@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+import python_jsonschema_objects as pjo
+
+DRAFT4 = "http://json-schema.org/draft-04/schema#"
+
+
+@pytest.fixture
+def schema_path(tmp_path):
+    documents = {
+        "common.json": {
+            "$schema": DRAFT4,
+            "definitions": {
+                "money": {
+                    "type": "object",
+                    "properties": {
+                        "amount": {"type": "number"},
+                        "currency": {"$ref": "#/definitions/currency"},
+                    },
+                },
+                "currency": {"type": "string", "enum": ["EUR", "USD"]},
+            },
+        },
+        "invoice.json": {
+            "$schema": DRAFT4,
+            "type": "object",
+            "properties": {"total": {"$ref": "common.json#/definitions/money"}},
+        },
+        "payment.json": {
+            "$schema": DRAFT4,
+            "type": "object",
+            "properties": {
+                "paid": {"$ref": "file:///common.json#/definitions/money"},
+                "invoice": {"$ref": "file:///root.json#/definitions/invoice"},
+            },
+        },
+        "root.json": {
+            "$schema": DRAFT4,
+            "title": "Root",
+            "type": "object",
+            "properties": {
+                "invoice": {"$ref": "#/definitions/invoice"},
+                "payment": {"$ref": "file:///payment.json"},
+            },
+            "definitions": {"invoice": {"$ref": "file:///invoice.json"}},
+        },
+    }
+    for name, document in documents.items():
+        (tmp_path / name).write_text(json.dumps(document))
+    return str(tmp_path / "root.json")
+
+
+def test_external_documents_are_built_once(schema_path):
+    builder = pjo.ObjectBuilder(schema_path)
+    ns = builder.build_classes()
+
+    money = builder.get_class("file:///common.json#/definitions/money")
+    assert money is not None
+    assert (
+        builder.get_class("file:///invoice.json").__propinfo__["total"]["type"] is money
+    )
+    assert (
+        builder.get_class("file:///payment.json").__propinfo__["paid"]["type"] is money
+    )
+    assert not any(uri.startswith("file:///root.json") for uri in builder._resolved)
+
+    root = ns.Root(
+        invoice={"total": {"amount": 1, "currency": "EUR"}},
+        payment={"paid": {"amount": 1, "currency": "USD"}},
+    )
+    assert isinstance(root.invoice.total, money)
+    assert isinstance(root.payment.paid, type(root.invoice.total))
+    with pytest.raises(pjo.ValidationError):
+        root.payment.paid.currency = "GBP"
+
+
+def test_relative_references_are_absolute(schema_path):
+    builder = pjo.ObjectBuilder(schema_path)
+    builder.build_classes()
+
+    assert "file:///common.json#/definitions/currency" in builder._resolved
+    assert "common.json#/definitions/money" not in builder._resolved
+
+
+def test_sub_schemas_of_other_documents_stay_out_of_the_namespace(tmp_path):
+    (tmp_path / "common.json").write_text(
+        json.dumps(
+            {
+                "$schema": DRAFT4,
+                "definitions": {
+                    "address": {
+                        "type": "object",
+                        "properties": {"city": {"type": "string", "maxLength": 3}},
+                    }
+                },
+            }
+        )
+    )
+    (tmp_path / "root.json").write_text(
+        json.dumps(
+            {
+                "$schema": DRAFT4,
+                "title": "Root",
+                "type": "object",
+                "properties": {"home": {"$ref": "#/definitions/home"}},
+                "definitions": {
+                    "city": {"type": "integer"},
+                    "home": {
+                        "type": "object",
+                        "properties": {
+                            "addr": {"$ref": "file:///common.json#/definitions/address"}
+                        },
+                    },
+                },
+            }
+        )
+    )
+    ns = pjo.ObjectBuilder(str(tmp_path / "root.json")).build_classes()
+
+    ns.City(5).validate()
+    assert sorted(ns) == ["Address", "City", "Home", "Root"]
+    with pytest.raises(pjo.ValidationError):
+        ns.Home(addr={"city": "Paris"}).validate()
@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+import python_jsonschema_objects as pjo
+
+
+@pytest.fixture
+def schema():
+    # "slow" comes first, so the warm-up thread starts with it.
+    definitions = {"slow": {"title": "Slow", "type": "object"}}
+    for i in range(20):
+        definitions["def%d" % i] = {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string"},
+                "next": {"$ref": "#/definitions/def%d" % ((i + 1) % 20)},
+            },
+        }
+    return {
+        "$schema": "http://json-schema.org/draft-04/schema#",
+        "title": "Root",
+        "type": "object",
+        "properties": {"first": {"$ref": "#/definitions/def0"}},
+        "definitions": definitions,
+    }
+
+
+def test_warm_up_builds_every_class(schema):
+    builder = pjo.ObjectBuilder(schema)
+    future = builder.warm_up()
+
+    ns = future.result(timeout=10)
+    assert sorted(ns) == sorted(["Root", "Slow"] + ["Def%d" % i for i in range(20)])
+    assert pjo.util.Namespace.getattr(ns, "_loaders") == {}
+    assert builder.get_class("#/definitions/def3") is ns.Def3
+    assert ns.Def0(next={"name": "x"}).next.name == "x"
+
+
+def test_classes_are_available_while_warming_up(schema, monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+    construct_entry = pjo.ObjectBuilder._construct_entry
+
+    def construct_slowly(self, uri, contents):
+        if uri == "#/definitions/slow":
+            started.set()
+            assert release.wait(10)
+        return construct_entry(self, uri, contents)
+
+    monkeypatch.setattr(pjo.ObjectBuilder, "_construct_entry", construct_slowly)
+    builder = pjo.ObjectBuilder(schema)
+    future = builder.warm_up(standardize_names=False)
+    assert started.wait(10)
+
+    # The background thread is stuck on "slow"; other classes still build.
+    def7 = builder.get_class("#/definitions/def7")
+    assert def7(name="x").name == "x"
+    assert not future.done()
+
+    release.set()
+    ns = future.result(timeout=10)
+    assert ns.def7 is def7
+
+
+def test_warm_up_reports_build_errors(schema):
+    schema["definitions"]["broken"] = {"type": "object", "allOf": "nope"}
+    builder = pjo.ObjectBuilder(schema, validate_schema=False)
+
+    with pytest.raises(TypeError):
+        builder.warm_up().result(timeout=10)